@@ -10,6 +10,8 @@ used in Galactic StarFighter, in order for the parser to be able to
 identify ships by their components and abilities and print them neatly
 onto the screen.
 """
+# Project Modules
+from data.icons import ICONS
 
 component_types = ["primaries", "secondaries", "systems", "engines", "shields"]
 """
@@ -356,3 +358,48 @@ railguns = (
 majors = ["primary", "primary2", "secondary", "secondary2", "systems"]
 middle = ["engine", "shields"]
 minors = ["reactor", "magazine", "thrusters", "sensors", "capacitor", "armor"]
+
+"""
+Lookup tables generated from the tuples above
+
+The tuples keep the order of the components, but membership tests on
+them are linear scans. The frozensets and the ABILITIES index are
+built once at import and allow constant time lookups.
+"""
+PRIMARIES = frozenset(primaries)
+SECONDARIES = frozenset(secondaries)
+ENGINES = frozenset(engines)
+SYSTEMS = frozenset(systems)
+SHIELDS = frozenset(shields)
+COPILOTS = frozenset(copilots)
+COMPONENTS = frozenset(components)
+DEATHS = frozenset(("Player Death", "Game End"))
+
+CATEGORIES = {
+    "primaries": PRIMARIES,
+    "secondaries": SECONDARIES,
+    "engines": ENGINES,
+    "systems": SYSTEMS,
+    "shields": SHIELDS,
+    "copilots": COPILOTS,
+}
+
+
+def build_ability_index() -> dict:
+    """
+    Build the ability index from the category tuples
+    :return: dict {ability: (category, frozenset of ships, icon name)}
+        with category a key of CATEGORIES, the ships that support the
+        ability and the name of the icon file or None if the ability
+        has no icon
+    """
+    icons = {name.lower(): icon for name, icon in ICONS.items()}
+    index = dict()
+    for category, members in CATEGORIES.items():
+        for ability in members:
+            ships_set = frozenset(ship for ship in ships if ability in ships_abilities[ship])
+            index[ability] = (category, ships_set, icons.get(ability.lower()))
+    return index
+
+
+ABILITIES = build_ability_index()
@@ -0,0 +1,51 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+from parsing.archive import is_supported
+from parsing.export import BatchExporter, FORMATS, LEVELS, write_rows
+from parsing.parser import Parser
+import argparse
+import os
+
+"""
+Export the statistics of a folder of CombatLogs without the GUI.
+Available arguments:
+folder: CombatLogs folder to export
+-o: file to write the statistics to
+-f: output format (csv, jsonl or npz), by default from the extension
+-l: levels of statistics to include (file, match and/or spawn)
+-w: amount of worker processes
+"""
+
+DESCRIPTION = "GSF Parser Statistics Export"
+
+DEFAULT_OUTPUT = "statistics.csv"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("folder", type=str, help="CombatLogs folder to export")
+    parser.add_argument("-o", type=str, help="File to write the statistics to", default=DEFAULT_OUTPUT)
+    parser.add_argument("-f", type=str, choices=FORMATS, help="Output format, default from the extension")
+    parser.add_argument("-l", type=str, nargs="+", choices=LEVELS, help="Levels to include", default=LEVELS)
+    parser.add_argument("-w", type=int, help="Amount of worker processes, default from the settings")
+    args = parser.parse_args()
+
+    folder = os.path.abspath(args.folder)
+    files = sorted(
+        os.path.join(folder, f) for f in os.listdir(folder)
+        if Parser.parse_filename(f) is not None and is_supported(f))
+    exporter = BatchExporter(files, args.l, args.w)
+    print("[Export] Exporting {} files with {} workers".format(len(files), min(exporter.workers, len(files))))
+    rows = exporter.run(lambda done: print("\r[Export] {}/{} files".format(done, len(files)), end=""))
+    print()
+    write_rows(rows, args.o, args.f)
+    print("[Export] Wrote {} rows to {}".format(len(rows), args.o))
+    stats = exporter.statistics()
+    print("[Export] {:.2f}s elapsed, {:.2f}s in files, {:.1f} files/s".format(
+        stats["elapsed"], stats["cpu"], stats["files_per_second"]))
+    print("[Export] Per file: p50 {:.3f}s, p90 {:.3f}s, max {:.3f}s".format(
+        stats["p50"], stats["p90"], stats["max"]))
@@ -19,7 +19,8 @@ import variables
 from parsing import matchstats, spawnstats
 from data import abilities
 from parsing.parser import Parser
-from toplevels.splash import SplashScreen
+from parsing.fileanalyzer import FileAnalyzer
+from parsing.filescanner import FileScanner
 from parsing.filehandler import FileHandler
 from parsing.screen import ScreenParser
 from widgets.general import Calendar, DateKeyDict
@@ -29,12 +30,14 @@ from widgets.general import Calendar, DateKeyDict
 class FileFrame(ttk.Frame):
     """Frame containing widgets for file, match and spawn selection"""
 
+    SCAN_INTERVAL = 100  # Milliseconds between FileScanner polls
+
     # __init__ creates all widgets
     def __init__(self, root_frame, main_window):
         """Create all widgets and make the links between them"""
         ttk.Frame.__init__(self, root_frame, width=200, height=420)
         self.main_window = main_window
-        self._splash: SplashScreen = None
+        self._scanner: FileScanner = None
 
         self._calendar = Calendar(self, callback=self._select_date, highlight="#4286f4")
         self._tree = ttk.Treeview(self, show=("tree", "headings"), height=6)
@@ -43,6 +46,7 @@ class FileFrame(ttk.Frame):
 
         self._files: List[str] = list()
         self._dates: Dict[datetime: List[str]] = DateKeyDict()
+        self._match_count: Dict[datetime: int] = DateKeyDict()
 
         self.setup_tree()
 
@@ -72,22 +76,38 @@ class FileFrame(ttk.Frame):
             folder = filedialog.askdirectory()
             variables.settings.write_settings({"parsing": {"path": folder}})
             return self.update_files()
-        files = [f for f in os.listdir(folder) if Parser.get_gsf_in_file(f)]
-        self.create_splash(len(files))
-        match_count: Dict[datetime: int] = DateKeyDict()
-        for file in files:
-            date = Parser.parse_filename(file)
-            if date is None:  # Failed to parse
+        if self._scanner is not None:
+            self._scanner.cancel()
+        files = [f for f in os.listdir(folder) if Parser.parse_filename(f) is not None]
+        self._match_count.clear()
+        self._scanner = FileScanner(files)
+        self._scanner.start()
+        self._poll_scanner(self._scanner)
+
+    def _poll_scanner(self, scanner: FileScanner):
+        """Insert the results of the FileScanner as they come in"""
+        if scanner is not self._scanner:  # Replaced by a newer scan
+            return
+        changed = DateKeyDict()
+        for file, entry in scanner.poll():
+            if entry is None or entry["gsf"] is False:
                 continue
-            if date not in match_count:
-                match_count[date] = 0
-            match_count[date] += Parser.count_matches(file)
+            date = entry["date"]
+            if date not in self._match_count:
+                self._match_count[date] = 0
+            self._match_count[date] += entry["matches"]
+            changed[date] = self._match_count[date]
             if date not in self._dates:
                 self._dates[date] = list()
             self._dates[date].append(file)
-            self._splash.increment()
-        self._calendar.update_heatmap(match_count)
-        self.destroy_splash()
+        if len(changed) != 0:
+            self._calendar.update_heatmap(changed)
+        if scanner.done:
+            self._refresh_button.configure(text="Refresh")
+            self._scanner = None
+            return
+        self._refresh_button.configure(text="Refresh ({}/{})".format(scanner.scanned, len(scanner.files)))
+        self.after(self.SCAN_INTERVAL, self._poll_scanner, scanner)
 
     def _select_date(self, date: datetime):
         """Callback for Calendar widget selection command"""
@@ -98,8 +118,9 @@ class FileFrame(ttk.Frame):
         self._files: List[str] = list(sorted(self._dates[date]))
         print("Inserting files into Treeview: ", self._files)
         for f, file in enumerate(self._files):
-            name = Parser.get_player_name_raw(file)
-            cube, matches, spawns = Parser.split_combatlog_file(file)
+            analyzer = FileAnalyzer.open(file)
+            name = analyzer.player_name
+            cube, matches, spawns = analyzer.file_cube, analyzer.match_timings, analyzer.spawn_timings
             for m, match in enumerate(sorted(matches[::2])):
                 match = datetime.strftime(match, "%H:%M, {}".format(name))
                 match_iid = "{},{}".format(f, m)
@@ -129,19 +150,6 @@ class FileFrame(ttk.Frame):
             f, m = map(int, elements)
             self.parse_match(self._files[f], m)
 
-    def create_splash(self, maximum: int):
-        """Update the maximum value of the splash screen"""
-        if self.main_window.splash is not None:
-            self._splash = self.main_window.splash
-            self._splash.update_max(maximum)
-        else:
-            self._splash = SplashScreen(self.main_window, maximum, title="Loading Files")
-
-    def destroy_splash(self):
-        """Destroy the self-created SplashScreen or keep the BootSplash"""
-        if self.main_window.splash is None:
-            self._splash.destroy()
-
     def update_widgets(self, abilities_dict, statistics_string, shipsdict, enemies, enemydamaged,
                        enemydamaget, uncounted):
         """
@@ -229,14 +237,12 @@ class FileFrame(ttk.Frame):
         print("[FileFrame] Parsing file '{}', match {}".format(file, match_i))
         self.main_window.middle_frame.statistics_numbers_var.set("")
         self.main_window.ship_frame.ship_label_var.set("No match or spawn selected yet.")
-        lines = Parser.read_file(file)
-        player_list = Parser.get_player_id_list(lines)
-        file_cube, match_timings, _ = Parser.split_combatlog(lines, player_list)
-        player_name = Parser.get_player_name(lines)
+        analyzer = FileAnalyzer.open(file)
+        file_cube, match_timings, player_name = analyzer.file_cube, analyzer.match_timings, analyzer.player_name
         match = file_cube[match_i]
         results = matchstats.match_statistics(file, match, match_timings[::2][match_i])
         self.update_widgets(*results)
-        match_list = Parser.build_spawn_from_match(match)
+        match_list = Parser.build_spawn_from_match(analyzer.get_match(match_i))
         self.main_window.middle_frame.time_view.insert_spawn(match_list, player_name)
         match_timing = datetime.combine(Parser.parse_filename(file).date(), match_timings[::2][match_i].time())
         self.main_window.middle_frame.scoreboard.update_match(match_timing)
@@ -250,18 +256,18 @@ class FileFrame(ttk.Frame):
         print("[FileFrame] Parsing '{}', match {}, spawn {}".format(file, match_i, spawn_i))
         self.main_window.middle_frame.statistics_numbers_var.set("")
         self.main_window.ship_frame.ship_label_var.set("No match or spawn selected yet.")
-        lines = Parser.read_file(file)
-        player_list = Parser.get_player_id_list(lines)
-        player_name = Parser.get_player_name(lines)
-        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player_list)
+        analyzer = FileAnalyzer.open(file)
+        player_name = analyzer.player_name
+        file_cube, match_timings, spawn_timings = analyzer.file_cube, analyzer.match_timings, analyzer.spawn_timings
         match = file_cube[match_i]
         spawn = match[spawn_i]
         results = list(spawnstats.spawn_statistics(
             file, spawn, spawn_timings[match_i][spawn_i]))
-        results[1] = Parser.parse_player_reaction_time(spawn, player_name)
-        orig = len(results[1])
+        # The reaction time and screen events are added to a copy of the spawn
+        events = Parser.parse_player_reaction_time(analyzer.get_spawn(match_i, spawn_i), player_name)
+        orig = len(events)
         results[1] = ScreenParser.build_spawn_events(
-            file, match_timings[::2][match_i], spawn_timings[match_i][spawn_i], spawn, player_name)
+            file, match_timings[::2][match_i], spawn_timings[match_i][spawn_i], events, player_name)
         print("[FileFrame] ScreenParser built {} events. Total: {}".format(len(results[1]) - orig, len(results[1])))
         self.update_widgets_spawn(*results)
         arguments = (file, match_timings[::2][match_i], spawn_timings[match_i][spawn_i])
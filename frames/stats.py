@@ -84,7 +84,8 @@ class StatsFrame(ttk.Frame):
         # Create widgets for statistics frame
         self.statistics_label_var = tk.StringVar()
         string = "Character name:\nDamage dealt to\nDamage dealt:\nDamage taken:\nDamage ratio:\nSelfdamage:\n" \
-                 "Healing received:\nHit count:\nCritical count:\nCritical Percentage:\nDeaths:\nDuration:\nDPS:"
+                 "Healing received:\nHit count:\nCritical count:\nCritical Percentage:\nDeaths:\nDuration:\nDPS:\n" \
+                 "Reaction p50/p90/p99:"
         self.statistics_label_var.set(string)
         self.statistics_label = ttk.Label(self.stats_frame, textvariable=self.statistics_label_var, justify=tk.LEFT,
                                           wraplength=145)
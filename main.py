@@ -5,6 +5,7 @@ License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
 # Standard Library
+from multiprocessing import freeze_support
 from os.path import dirname, join, basename, exists
 import sys
 import shutil
@@ -83,5 +84,6 @@ def setup_tkinter():
 
 
 if __name__ == '__main__':
+    freeze_support()  # Required for the FolderEngine in frozen builds
     setup_tkinter()
     create_window()
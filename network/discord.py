@@ -19,6 +19,7 @@ import tkinter as tk
 from data.ships import ship_tiers
 from network.connection import Connection
 from parsing import Parser, FileHandler
+from parsing.fileanalyzer import FileAnalyzer
 from toplevels.splash import DiscordSplash
 from utils.directories import get_temp_directory
 from variables import settings
@@ -348,8 +349,8 @@ class DiscordClient(Connection):
         :param window: MainWindow instance of this GSF Parser
         """
         date = Parser.parse_filename(file_name)
-        lines = Parser.read_file(file_name)
-        player_name = Parser.get_player_name(lines)
+        analyzer = FileAnalyzer(file_name)
+        player_name = analyzer.player_name
         server = window.characters_frame.characters.get_server_for_character(player_name)
         basename = os.path.basename(file_name)
         # Actually send the file data to the server
@@ -359,8 +360,7 @@ class DiscordClient(Connection):
         if basename not in self.db:
             self.db[basename] = {"match": False, "char": False}
         match_s, char_s = self.db[basename]["match"], self.db[basename]["char"]
-        player_id_list = Parser.get_player_id_list(lines)
-        file_cube, matches, spawns = Parser.split_combatlog(lines, player_id_list)
+        file_cube, matches, spawns = analyzer.file_cube, analyzer.match_timings, analyzer.spawn_timings
         character = window.characters_frame.characters[(server, player_name)]
         character_enabled = character["Discord"]
         if character_enabled is True:
@@ -372,8 +372,9 @@ class DiscordClient(Connection):
             match = file_cube[index]
             id_fmt = Parser.get_id_format(match[0])
             start, end = map(lambda time: datetime.combine(date.date(), time.time()), (start, end))
-            results = Parser.parse_match(match, player_id_list)
-            abls, dmg_d, dmg_t, _, _, _, _, _, enemies, _, _, ships, _ = results
+            stats = analyzer.parse_match(index)
+            abls, dmg_d, dmg_t = stats.abilities, stats.dmg_d, stats.dmg_t
+            enemies, ships = stats.enemies, stats.ships
             if Parser.is_tutorial(match):
                 continue
             if self.db[basename]["match"] is False:
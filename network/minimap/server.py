@@ -10,6 +10,7 @@ from queue import Queue
 from select import select
 from ast import literal_eval
 from network.connection import Connection
+from utils import instruments
 
 
 SUPPORTED_COMMANDS = ["location", "health", "logout", "login"]
@@ -78,8 +79,10 @@ class MiniMapServer(threading.Thread):
             assert isinstance(tup, tuple)
             assert len(tup) == 2
             # Send location update to other clients
-            for other in self.client_sockets:
-                other.send(message)
+            instruments.count("minimap.messages")
+            with instruments.timing("minimap.broadcast"):
+                for other in self.client_sockets:
+                    other.send(message)
         # Done
         return True
 
@@ -113,6 +116,7 @@ class MiniMapServer(threading.Thread):
         # Save connection
         conn.send("login")  # Confirmation
         self.client_sockets.append(conn)
+        instruments.gauge("minimap.clients", len(self.client_sockets))
         self.client_names[conn] = elems[1]
         print("[MiniMapServer] Client Login {}".format(elems[1]))
         # Login succeed
@@ -128,6 +132,7 @@ class MiniMapServer(threading.Thread):
     def logout_client(self, client):
         """Logout a Client from the Server"""
         self.client_sockets.remove(client)
+        instruments.gauge("minimap.clients", len(self.client_sockets))
         name = self.client_names[client]
         for client_alt in self.client_sockets:
             client_alt.send("logout_{}".format(name))
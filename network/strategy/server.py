@@ -14,6 +14,7 @@ from select import select
 from network.strategy.clienthandler import StrategyClientHandler
 from utils.admin import check_privileges
 from utils.directories import get_temp_directory
+from utils import instruments
 
 
 class StrategyServer(threading.Thread):
@@ -83,6 +84,7 @@ class StrategyServer(threading.Thread):
                 if address[0] not in self.banned:
                     # The ClientHandler is created and then added to the list of active ClientHandlers
                     self.client_handlers.append(StrategyClientHandler(connection, address, self.server_queue))
+                    instruments.gauge("strategy.clients", len(self.client_handlers))
                 else:
                     # If the IP is banned, then a message is sent
                     connection.send(b"ban")
@@ -111,6 +113,7 @@ class StrategyServer(threading.Thread):
         # Last but not least close the listening socket to release the bind on the address
         self.socket.close()
 
+    @instruments.timed("strategy.command")
     def do_action_for_server_queue(self):
         """
         Function called by the Server loop if the server_queue is not
@@ -192,6 +195,7 @@ class StrategyServer(threading.Thread):
             name = message[1].name
             if name in self.client_names:
                 self.client_names.remove(name)
+            instruments.gauge("strategy.clients", len(self.client_handlers))
 
         elif message[0] == "kick":
             command, player = message[0].split("_")
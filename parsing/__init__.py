@@ -3,22 +3,56 @@ Author: RedFantom
 Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
 License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
+
+The classes and functions of the submodules are imported only when they
+are first requested, so that the modules for the parsing of CombatLogs
+can be used without the dependencies of the real-time parsing and the
+screen parsing, which require a display.
 """
-from parsing.characters import CharacterDatabase
-from parsing.filehandler import FileHandler
-from parsing.filestats import file_statistics
-from parsing.folderstats import folder_statistics
-from parsing.gsf import GSFInterface
-from parsing.gui import GUIParser, get_player_guiname
-from parsing.imageops import get_brightest_pixel, get_similarity, get_similarity_pixels
-from parsing.logstalker import LogStalker
-from parsing.matchstats import match_statistics
-from parsing.parser import Parser
-from parsing.realtime import RealTimeParser
-from parsing.ships import Ship, Component
-from parsing.shipstats import ShipStats
-from parsing.spawnstats import spawn_statistics
-from parsing.strategies import Strategy, StrategyDatabase, Phase
-from parsing.delay import DelayParser
-from parsing.vision import *
-del opencv
+from importlib import import_module
+
+_VISION = (
+    "colors", "timer_boxes", "MIN_MATCHES", "get_pointer_middle", "get_distance_from_center",
+    "get_tracking_degrees", "get_tracking_penalty", "get_timer_status", "get_ship_health_hull",
+    "get_ship_health_shields", "get_minimap_location", "image_to_opencv", "get_map", "get_score",
+)
+
+_MODULES = {
+    "CharacterDatabase": "characters",
+    "EventTable": "eventtable",
+    "FileHandler": "filehandler",
+    "file_statistics": "filestats",
+    "folder_statistics": "folderstats",
+    "GSFInterface": "gsf",
+    "GUIParser": "gui",
+    "get_player_guiname": "gui",
+    "get_brightest_pixel": "imageops",
+    "get_similarity": "imageops",
+    "get_similarity_pixels": "imageops",
+    "LogStalker": "logstalker",
+    "match_statistics": "matchstats",
+    "Parser": "parser",
+    "RealTimeParser": "realtime",
+    "Ship": "ships",
+    "Component": "ships",
+    "ShipStats": "shipstats",
+    "spawn_statistics": "spawnstats",
+    "Strategy": "strategies",
+    "StrategyDatabase": "strategies",
+    "Phase": "strategies",
+    "DelayParser": "delay",
+}
+_MODULES.update({name: "vision" for name in _VISION})
+
+
+def __getattr__(name: str):
+    """Import the submodule of a class or function when requested"""
+    if name not in _MODULES:
+        raise AttributeError("module 'parsing' has no attribute '{}'".format(name))
+    value = getattr(import_module("parsing." + _MODULES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
@@ -0,0 +1,199 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from typing import Any, Dict, Iterable, List
+# Project Modules
+from data import abilities
+from parsing.shipdetect import get_ships_for_abilities
+
+
+class SpawnStats(object):
+    """
+    Mergeable statistics of one or more spawns
+
+    The statistics of a spawn are accumulated one event at a time with
+    add_event, after which close determines the ship that was used.
+    The statistics of spawns are merged into those of a match, the
+    statistics of matches into those of a file and so on, with merge
+    or the + operator. Merging is associative, and an empty SpawnStats
+    is its identity, so the statistics of a folder may be reduced from
+    partial results in any grouping, for example of worker processes,
+    cache entries and the spawns of a live match.
+
+    The results are the same as those of the long-standing spawn parser:
+    - Amounts and ability usage are summed
+    - The enemies list contains the enemies of each spawn, so an enemy
+      encountered in multiple spawns is included multiple times
+    - The enemy damage dictionaries contain the value of the last spawn
+      an enemy was encountered in
+    - Each spawn with a single possible ship counts for that ship, the
+      others are uncounted
+    """
+
+    __slots__ = (
+        "abilities", "dmg_d", "dmg_t", "dmg_s", "healing", "hitcount", "critcount", "enemies",
+        "enemy_dmg_d", "enemy_dmg_t", "ships", "uncounted", "spawns", "duration", "candidates",
+    )
+
+    SUMS = ("dmg_d", "dmg_t", "dmg_s", "healing", "hitcount", "critcount", "uncounted", "spawns", "duration")
+
+    def __init__(self):
+        self.abilities: Dict[str, int] = dict()
+        self.dmg_d, self.dmg_t, self.dmg_s, self.healing = 0, 0, 0, 0
+        self.hitcount, self.critcount = 0, 0
+        self.enemies: List[str] = list()
+        self.enemy_dmg_d: Dict[str, int] = dict()
+        self.enemy_dmg_t: Dict[str, int] = dict()
+        self.ships: Dict[str, int] = {ship: 0 for ship in abilities.ships}
+        self.uncounted = 0
+        self.spawns = 0
+        self.duration = 0.0
+        # Ships possible for the statistics of a single closed spawn
+        self.candidates: List[str] = None
+
+    @classmethod
+    def from_events(cls, events: Iterable[dict], player_list: List[str]) -> "SpawnStats":
+        """
+        Return the closed statistics of the events of a spawn
+        :raises ValueError: If no ship is possible for the spawn
+        """
+        stats = cls()
+        for event in events:
+            stats.add_event(event, player_list)
+        stats.close()
+        return stats
+
+    def add_event(self, event: dict, player_list: List[str]):
+        """
+        Add an event of the spawn that is being accumulated
+        :param event: line dictionary or Event
+        :param player_list: ID numbers of the player
+        """
+        source, target = event["source"], event["target"]
+        ability, effect, amount = event["ability"], event["effect"], event["damage"]
+        # If source is empty, then rename source to ability
+        if source == "":
+            source = ability
+        # Count ability usage. Note that self-targeted Damage abilities are skipped
+        if source in player_list and "AbilityActivate" in effect and not (source == target and "Damage" in effect):
+            self.abilities[ability] = self.abilities.get(ability, 0) + 1
+        # Process enemy ID
+        for id in (source, target):
+            if id in player_list or id in self.enemies:
+                continue
+            self.enemies.append(id)
+        if "Damage" in effect:
+            # Self damage
+            if source == target:
+                self.dmg_s += amount
+            # Damage dealt
+            elif source in player_list:
+                self.dmg_d += amount
+                self.hitcount += 1
+                self.critcount += event["crit"]
+                self.enemy_dmg_t[target] = self.enemy_dmg_t.get(target, 0) + amount
+                # Enemy damage dealt is keyed by source if the target did not deal damage yet
+                if target not in self.enemy_dmg_d:
+                    self.enemy_dmg_d[source] = 0
+            # Damage taken
+            else:
+                self.dmg_t += amount
+                self.enemy_dmg_d[source] = self.enemy_dmg_d.get(source, 0) + amount
+                if source not in self.enemy_dmg_t:
+                    self.enemy_dmg_t[source] = 0
+        # Healing given is not supported currently, see #25
+        elif "Healing" in effect and target in player_list:
+            self.healing += amount
+
+    def close(self, candidates: List[str] = None):
+        """
+        Close the statistics of a spawn by determining the ship used
+        :param candidates: Ships possible for the spawn, determined from
+            the abilities if not given
+        :raises ValueError: If no ship is possible for the spawn
+        """
+        if candidates is None:
+            candidates = get_ships_for_abilities(self.abilities)
+        self.candidates = candidates
+        self.spawns += 1
+        if len(candidates) == 1:
+            self.ships[candidates[0]] += 1
+        else:
+            self.uncounted += 1
+
+    @property
+    def crit_luck(self) -> float:
+        return self.critcount / self.hitcount if self.hitcount != 0 else 0
+
+    @property
+    def killsassists(self) -> int:
+        """Amount of enemies that were dealt damage"""
+        return sum(self.enemy_dmg_t[enemy] > 0 for enemy in self.enemies if enemy in self.enemy_dmg_t)
+
+    @property
+    def ship(self) -> (str, None):
+        """The ship used most often, None if no ship was counted"""
+        ship, count = max(self.ships.items(), key=lambda item: item[1])
+        return ship if count != 0 else None
+
+    def merge(self, other: "SpawnStats") -> "SpawnStats":
+        """Merge the statistics of later spawns into these statistics"""
+        for ability, amount in other.abilities.items():
+            self.abilities[ability] = self.abilities.get(ability, 0) + amount
+        for key in self.SUMS:
+            setattr(self, key, getattr(self, key) + getattr(other, key))
+        self.enemies.extend(other.enemies)
+        self.enemy_dmg_d.update(other.enemy_dmg_d)
+        self.enemy_dmg_t.update(other.enemy_dmg_t)
+        for ship, amount in other.ships.items():
+            self.ships[ship] = self.ships.get(ship, 0) + amount
+        if self.spawns == 1:
+            self.candidates = self.candidates if self.candidates is not None else other.candidates
+        else:
+            self.candidates = None
+        return self
+
+    def copy(self) -> "SpawnStats":
+        return SpawnStats().merge(self)
+
+    def __add__(self, other: "SpawnStats") -> "SpawnStats":
+        return self.copy().merge(other)
+
+    def __iadd__(self, other: "SpawnStats") -> "SpawnStats":
+        return self.merge(other)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, SpawnStats) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return "SpawnStats(spawns={}, dmg_d={}, dmg_t={})".format(self.spawns, self.dmg_d, self.dmg_t)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for key in self.__slots__:
+            setattr(self, key, state[key])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON serializable copy of the statistics"""
+        return {
+            "abilities": dict(self.abilities), "dmg_d": self.dmg_d, "dmg_t": self.dmg_t, "dmg_s": self.dmg_s,
+            "healing": self.healing, "hitcount": self.hitcount, "critcount": self.critcount,
+            "enemies": list(self.enemies), "enemy_dmg_d": dict(self.enemy_dmg_d),
+            "enemy_dmg_t": dict(self.enemy_dmg_t), "ships": dict(self.ships), "uncounted": self.uncounted,
+            "spawns": self.spawns, "duration": self.duration,
+            "candidates": list(self.candidates) if self.candidates is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, dictionary: Dict[str, Any]) -> "SpawnStats":
+        stats = cls()
+        state = stats.to_dict()
+        state.update(dictionary)
+        stats.__setstate__(state)
+        return stats
@@ -0,0 +1,92 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+
+
+Transparent reading of compressed CombatLogs
+
+Archived CombatLogs may be compressed with gzip (.gz), xz (.xz) or
+Zstandard (.zst), for example combat_2017-12-31_20_00_00_000000.txt.gz.
+The archives are decompressed while they are read, so they can be
+analyzed without decompressing them on disk first. Reading a compressed
+CombatLog transfers only a fraction of the bytes of the plain file,
+which on slow disks and network shares saves more time than the
+decompression costs. Zstandard requires the optional zstandard package, without
+it .zst files are not recognized as CombatLogs.
+
+Byte offsets in compressed CombatLogs, as in the LogIndex, are offsets
+in the decompressed data.
+"""
+# Standard Library
+import gzip
+import io
+import lzma
+import os
+from typing import BinaryIO, Callable, Dict
+# Packages
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def open_zstd(path: str) -> BinaryIO:
+    """Open a Zstandard compressed file for streaming decompression"""
+    reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return io.BufferedReader(reader)
+
+
+OPENERS: Dict[str, Callable[[str], BinaryIO]] = {
+    ".gz": lambda path: gzip.open(path, "rb"),
+    ".xz": lambda path: lzma.open(path, "rb"),
+}
+if zstandard is not None:
+    OPENERS[".zst"] = open_zstd
+
+
+def get_compression(path: str) -> (str, None):
+    """
+    Return the compression extension of a file, None if it is plain or
+    compressed in a format that cannot be read
+    """
+    extension = os.path.splitext(path)[1].lower()
+    return extension if extension in OPENERS else None
+
+
+def is_compressed(path: str) -> bool:
+    return get_compression(path) is not None
+
+
+def strip_extension(path: str) -> str:
+    """Return the name of a file without its compression extension"""
+    extension = get_compression(path)
+    return path[:-len(extension)] if extension is not None else path
+
+
+def is_supported(path: str) -> bool:
+    """Return whether a file is a plain or readable compressed text file"""
+    return strip_extension(path).endswith(".txt")
+
+
+def open_log(path: str, start: int = 0) -> BinaryIO:
+    """
+    Open a CombatLog for reading bytes, decompressing it while reading
+    if it is compressed
+    :param start: Byte offset to start reading at. In a compressed
+        file, the data up to the offset is decompressed and skipped.
+    """
+    extension = get_compression(path)
+    fi = open(path, "rb") if extension is None else OPENERS[extension](path)
+    if start == 0:
+        return fi
+    if fi.seekable():
+        fi.seek(start)
+        return fi
+    while start > 0:
+        skipped = len(fi.read(min(start, io.DEFAULT_BUFFER_SIZE * 64)))
+        if skipped == 0:
+            break
+        start -= skipped
+    return fi
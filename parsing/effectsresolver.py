@@ -0,0 +1,83 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from typing import List
+# Project Modules
+from parsing.event import Event
+from parsing.parser import Parser
+from parsing.timebase import DAY, ROLLOVER, get_milliseconds
+
+
+class EffectsResolver(object):
+    """
+    Resolves the effects of the events of a spawn in one forward pass
+
+    Parser.line_to_event_dictionary looks up the index of every line
+    in the list of lines and then scans forward for its effects, which
+    is quadratic in the length of a spawn. The EffectsResolver instead
+    keeps a window of the ability events that are still eligible for
+    effects, and adds every new line to the effects of the events in
+    that window. Events leave the window once a line is beyond the
+    duration of their ability, as in Parser.get_effects_ability.
+
+    Lines may be appended one at a time, as by the RealTimeParser, in
+    which case the effects dictionaries of earlier events are updated
+    when later lines are appended.
+    """
+
+    def __init__(self):
+        self.lines: List[dict] = list()
+        self._window: List[tuple] = list()
+
+    @classmethod
+    def resolve(cls, lines: list, active_id: (list, str)) -> list:
+        """
+        Return the event dictionaries for all lines, as returned by
+        Parser.line_to_event_dictionary. Custom lines, such as those
+        created by Parser.build_spawn_from_match, are returned as-is.
+        """
+        resolver = cls()
+        return [resolver.append(line, active_id, resolve=line.get("custom", False) is False) for line in lines]
+
+    def append(self, line: (dict, str), active_id: (list, str), resolve: bool = True) -> (dict, None):
+        """
+        Append a line to the lines of the spawn
+        :param line: line dictionary or line string
+        :param active_id: argument for Parser.compare_ids
+        :param resolve: Whether to build the event dictionary of line,
+            otherwise the line is only considered as an effect
+        :return: event dictionary or None if the event has no effects
+            to show, the line itself if not resolved
+        """
+        line = line if isinstance(line, (dict, Event)) else Parser.line_to_dictionary(line)
+        now = get_milliseconds(line)
+        index = len(self.lines)
+        self.lines.append(line)
+        result = line
+        if resolve is True and "color" not in line:
+            eligibility = Parser.get_effects_eligible(line, self.lines, active_id, index)
+            if eligibility is False:
+                result = None
+            else:
+                effects = dict() if eligibility is True else None
+                result = Parser.build_event_dictionary(line, active_id, effects)
+                if effects is not None:
+                    self._window.append((line, effects, now))
+        self._window = [(event, effects, start) for event, effects, start in self._window
+                        if Parser.add_ability_effect(effects, event, line, self.elapsed(start, now)) is True]
+        return result
+
+    @staticmethod
+    def elapsed(start: int, end: int) -> int:
+        """timebase.elapsed, inlined for the window loop"""
+        delta = end - start
+        return delta + DAY if delta < -ROLLOVER else delta
+
+    def clear(self):
+        """Remove all lines, for example when a new spawn starts"""
+        self.lines.clear()
+        self._window.clear()
@@ -0,0 +1,139 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from typing import Dict, List, Tuple
+# Packages
+import numpy as np
+# Project Modules
+from parsing.eventtable import EventTable
+from parsing.symbols import symbols
+
+
+class EntityRegistry(object):
+    """
+    Registry of the participants of a match with a damage matrix
+
+    Every ID that occurs as actor or target in the events of a match is
+    assigned a dense index, in order of first appearance. The actor of
+    an event is its source, or its ability if the source is empty, just
+    as in the statistics of Parser.parse_spawn.
+
+    The matrix is an (n, n, 4) array with for every actor and target
+    the sums of the CHANNELS over all events of the match:
+    - damage: Sum of the damage of Damage events
+    - heal: Sum of the amounts of Healing events
+    - hits: Amount of Damage events
+    - crits: Amount of critical Damage events
+
+    The statistics of the match and the damage per enemy are slices of
+    the matrix. The matrix grows quadratically with the amount of IDs,
+    so a registry should only be built for a single match and not for
+    a whole file.
+    """
+
+    CHANNELS = ("damage", "heal", "hits", "crits")
+    DAMAGE, HEAL, HITS, CRITS = range(len(CHANNELS))
+
+    def __init__(self, ids: List[str], is_player: np.ndarray, matrix: np.ndarray):
+        """
+        :param ids: IDs of the entities by index
+        :param is_player: Boolean array, True for player IDs
+        :param matrix: (n, n, 4) matrix of actor, target and channel
+        """
+        self.ids = ids
+        self.index: Dict[str, int] = {id: index for index, id in enumerate(ids)}
+        self.is_player = is_player
+        self.matrix = matrix
+
+    @classmethod
+    def from_table(cls, table: EventTable) -> "EntityRegistry":
+        """Build the registry of all events in an EventTable"""
+        codes = np.column_stack((table.actor, table.target)).ravel()
+        unique, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        # Renumber the entities in order of first appearance
+        order = np.argsort(first, kind="stable")
+        rank = np.empty(len(unique), dtype=np.int64)
+        rank[order] = np.arange(len(unique))
+        inverse = rank[inverse.ravel()]
+        n = len(unique)
+        cells = inverse[0::2] * n + inverse[1::2]
+        is_damage = (table.category & EventTable.CATEGORY_DAMAGE) != 0
+        is_healing = ((table.category & EventTable.CATEGORY_HEALING) != 0) & ~is_damage
+        channels = (
+            np.where(is_damage, table.damage, 0),
+            np.where(is_healing, table.damage, 0),
+            is_damage,
+            is_damage & table.crit,
+        )
+        matrix = np.stack(
+            [np.bincount(cells, weights=values, minlength=n * n) for values in channels], axis=-1)
+        matrix = matrix.astype(np.int64).reshape(n, n, len(cls.CHANNELS))
+        unique = unique[order]
+        is_player = np.isin(unique, table.players)
+        return cls([symbols.lookup(code) for code in unique], is_player, matrix)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.index
+
+    @property
+    def players(self) -> np.ndarray:
+        """Indices of the player IDs"""
+        return np.flatnonzero(self.is_player)
+
+    @property
+    def enemies(self) -> np.ndarray:
+        """Indices of the IDs that are not player IDs"""
+        return np.flatnonzero(~self.is_player)
+
+    @property
+    def enemy_ids(self) -> List[str]:
+        """IDs that are not player IDs in order of first appearance"""
+        return [self.ids[index] for index in self.enemies]
+
+    def dealt(self, channel: int = DAMAGE) -> np.ndarray:
+        """Amount of a channel dealt by the player to each entity"""
+        return self.matrix[self.is_player, :, channel].sum(axis=0)
+
+    def taken(self, channel: int = DAMAGE) -> np.ndarray:
+        """Amount of a channel dealt by each entity to the player"""
+        return self.matrix[:, self.is_player, channel].sum(axis=1)
+
+    def get_enemy_damage(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Return the damage dealt by each enemy to the player and the
+        damage taken by each enemy from the player, like enemy_dmg_d
+        and enemy_dmg_t of SpawnStats, but summed over the match
+        """
+        enemies = self.enemies
+        dealt, taken = self.taken()[enemies].tolist(), self.dealt()[enemies].tolist()
+        ids = self.enemy_ids
+        return dict(zip(ids, dealt)), dict(zip(ids, taken))
+
+    @property
+    def killsassists(self) -> int:
+        """Amount of enemies that were dealt damage"""
+        return int(np.count_nonzero(self.dealt()[self.enemies] > 0))
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Return the sums of the match with the meaning of the equally
+        named attributes of SpawnStats
+        """
+        damage, hits, crits = (self.matrix[:, :, channel] for channel in (self.DAMAGE, self.HITS, self.CRITS))
+        diagonal = np.diagonal(damage)
+        dealt = damage[self.is_player].sum() - diagonal[self.is_player].sum()
+        return {
+            "dmg_d": int(dealt),
+            "dmg_t": int(damage.sum() - diagonal.sum() - dealt),
+            "dmg_s": int(diagonal.sum()),
+            "healing": int(self.matrix[:, self.is_player, self.HEAL].sum()),
+            "hitcount": int(hits[self.is_player].sum() - np.diagonal(hits)[self.is_player].sum()),
+            "critcount": int(crits[self.is_player].sum() - np.diagonal(crits)[self.is_player].sum()),
+        }
@@ -0,0 +1,179 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from sys import intern
+from typing import Any, Dict, Iterator, List
+# Project Modules
+from parsing.timebase import milliseconds
+
+
+class Event(object):
+    """
+    Compact record of a single CombatLog event
+
+    Replaces the dictionaries created by Parser.line_to_dictionary for
+    whole files. The fields are stored in slots, strings that repeat
+    throughout a CombatLog are interned and the original line text is
+    not stored, but reconstructed from the fields when requested.
+
+    The dictionary interface is supported so that code written for
+    the line dictionaries keeps working. Keys that are not fields, for
+    example the "effects", "type" and "color" keys set by
+    Parser.line_to_event_dictionary, are stored in a separate
+    dictionary that is only created when required.
+
+    Events compare by identity, not by value.
+    """
+
+    FIELDS = ("time", "source", "target", "ability", "effect", "amount", "effect_id", "self", "damage", "crit")
+    INTERNED = frozenset(("source", "target", "ability", "effect", "amount", "effect_id"))
+
+    __slots__ = FIELDS + ("category", "_extra", "_ms")
+
+    _KEYS = frozenset(FIELDS + ("category",))
+
+    def __init__(self, line_dict: dict = None):
+        """
+        :param line_dict: Line dictionary to copy the keys and values
+            of. The "line" key is ignored, as the line text is
+            reconstructed from the fields.
+        """
+        self._extra: Dict[str, Any] = None
+        self._ms: int = None
+        if line_dict is None:
+            return
+        for key, value in line_dict.items():
+            if key != "line":
+                self[key] = value
+
+    @classmethod
+    def from_dict(cls, line_dict: dict) -> "Event":
+        """Build an Event from a line dictionary"""
+        return cls(line_dict)
+
+    @property
+    def ms(self) -> int:
+        """Time of the event in milliseconds since midnight"""
+        if self._ms is None:
+            self._ms = milliseconds(self.time)
+        return self._ms
+
+    @property
+    def line(self) -> str:
+        """
+        Reconstruct the CombatLog line text from the fields. The text
+        does not include the IDs of the ability and effect or the
+        damage type, so code that searches for names should test the
+        fields instead, as Parser.has_name does.
+        """
+        if self._extra is not None and "line" in self._extra:
+            return self._extra["line"]
+        elements = [self.time.strftime("%H:%M:%S.%f")[:-3], self.source, self.target]
+        if not hasattr(self, "ability"):
+            return " ".join("[{}]".format(element) for element in elements)
+        effect = self.effect if self.effect_id is None else "{} {{{}}}".format(self.effect, self.effect_id)
+        elements += [self.ability, effect]
+        return "{} ({})".format(" ".join("[{}]".format(element) for element in elements), self.amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a line dictionary with the contents of this Event"""
+        return dict(self.items())
+
+    def copy(self) -> Dict[str, Any]:
+        """Return a line dictionary copy like dict.copy()"""
+        return self.to_dict()
+
+    def keys(self) -> Iterator[str]:
+        """Return the keys available like a line dictionary"""
+        yield "line"
+        for key in self.FIELDS + ("category",):
+            if key in self:
+                yield key
+        if self._extra is not None:
+            yield from (key for key in self._extra if key != "line")
+
+    def items(self) -> Iterator[tuple]:
+        return ((key, self[key]) for key in self.keys())
+
+    def values(self) -> Iterator[Any]:
+        return (self[key] for key in self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, dictionary: dict):
+        for key, value in dictionary.items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if key == "line":
+            return self.line
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._KEYS:
+            if key in self.INTERNED and isinstance(value, str):
+                value = intern(value)
+            elif key == "time":
+                self._ms = None
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = dict()
+        self._extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._KEYS:
+            return hasattr(self, key)
+        return key == "line" or (self._extra is not None and key in self._extra)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.keys())
+
+    def __copy__(self) -> "Event":
+        """Return an Event with the same fields and its own extra keys"""
+        event = Event.__new__(Event)
+        for key in self.__slots__:
+            if hasattr(self, key):
+                setattr(event, key, getattr(self, key))
+        event._extra = dict(self._extra) if self._extra is not None else None
+        return event
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.__slots__ if key != "_ms" and hasattr(self, key)}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self._extra, self._ms = None, None
+        for key, value in state.items():
+            if key in self.INTERNED and isinstance(value, str):
+                value = intern(value)
+            setattr(self, key, value)
+
+    def __repr__(self) -> str:
+        return "Event({})".format(self.line)
+
+
+def copy_events(events: list) -> List[Event]:
+    """
+    Return copies of a list of Events, for code that changes the Events
+    or the list, while the original Events are shared, for example by
+    the FileAnalyzer in the memory cache
+    """
+    return [event.__copy__() if isinstance(event, Event) else dict(event) for event in events]
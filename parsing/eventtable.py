@@ -0,0 +1,317 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from array import array
+from typing import Dict, List, Tuple
+# Packages
+import numpy as np
+# Project Modules
+from parsing.accumulator import SpawnStats
+from parsing.shipdetect import get_ships_for_abilities
+from parsing.symbols import symbols
+from parsing.timebase import milliseconds
+
+
+class EventTable(object):
+    """
+    Columnar representation of the GSF matches in a CombatLog
+
+    Every event that is part of a match is stored as a row in a set of
+    NumPy arrays. Strings (IDs, ability and effect names) are stored as
+    codes of the process-wide symbol table, times as
+    milliseconds since midnight. The rows are in the same order as the
+    events in the file cube built by Parser.split_combatlog, and the
+    spawns and matches are stored as index ranges:
+
+    - spawns: (n_spawns, 2) array of [start, stop) row ranges
+    - matches: (n_matches, 2) array of [start, stop) spawn ranges
+
+    The parse_spawn, parse_match and parse_file functions provide the
+    same results as the Parser functions, but are calculated with
+    masked sums and np.bincount over the columns of the table instead
+    of with loops over event dictionaries.
+    """
+
+    COLUMNS = ("time", "source", "target", "ability", "effect", "damage", "crit", "category")
+    DTYPES = {
+        "time": np.int64,
+        "source": np.int32,
+        "target": np.int32,
+        "ability": np.int32,
+        "effect": np.int32,
+        "damage": np.int64,
+        "crit": np.bool_,
+        "category": np.uint8,
+    }
+
+    # Category flags determined from the effect of an event
+    CATEGORY_DAMAGE = 1
+    CATEGORY_HEALING = 2
+    CATEGORY_ACTIVATE = 4
+
+    def __init__(self, columns: Dict[str, np.ndarray], spawns: np.ndarray, matches: np.ndarray,
+                 player_list: List[str], match_timings: list = None, spawn_timings: list = None):
+        """
+        :param columns: Dictionary of column arrays, see COLUMNS
+        :param spawns: Row ranges of the spawns
+        :param matches: Spawn ranges of the matches
+        :param player_list: List of player IDs
+        :param match_timings: match_timings as in split_combatlog
+        :param spawn_timings: spawn_timings as in split_combatlog
+        """
+        for column in self.COLUMNS:
+            setattr(self, column, columns[column])
+        self.spawns = spawns
+        self.matches = matches
+        self.player_list = player_list
+        self.match_timings = match_timings if match_timings is not None else list()
+        self.spawn_timings = spawn_timings if spawn_timings is not None else list()
+        # All codes in the columns are smaller than the modulus
+        self.modulus = len(symbols)
+        self.players = np.array(sorted(symbols.code_set(player_list)), dtype=np.int32)
+        # Derived columns that are shared by all statistics
+        self.actor = np.where(self.source == symbols.intern(""), self.ability, self.source)
+        self.actor_is_player = np.isin(self.actor, self.players)
+        self.target_is_player = np.isin(self.target, self.players)
+        self.spawn_index = np.repeat(
+            np.arange(len(self.spawns), dtype=np.int64), self.spawns[:, 1] - self.spawns[:, 0])
+
+    @classmethod
+    def from_lines(cls, lines: list, player_list: List[str]) -> "EventTable":
+        """
+        Build an EventTable from a list of line dictionaries or Events,
+        splitting it into matches and spawns in the same manner as
+        Parser.split_combatlog.
+        """
+        from parsing.parser import Parser
+        columns = {column: array("q") for column in cls.COLUMNS}
+        spawns, matches = list(), list()
+        spawn_timings, spawn_timings_temp, match_timings = list(), list(), list()
+        is_match, current_id, spawn_start, match_start, time = False, None, 0, 0, None
+        players, intern = symbols.code_set(player_list), symbols.intern
+
+        for line in lines:
+            if Parser.is_ignorable(line):
+                continue
+            time, source, target = line["time"], line["source"], line["target"]
+            row = len(columns["time"])
+            if "@" in source or "@" in target:
+                if is_match is False:
+                    continue
+                spawns.append((spawn_start, row))
+                matches.append((match_start, len(spawns)))
+                is_match, current_id = False, None
+                match_timings.append(time)
+                spawn_timings.append(spawn_timings_temp.copy())
+                spawn_timings_temp.clear()
+                continue
+            if is_match is False:
+                is_match, spawn_start, match_start = True, row, len(spawns)
+                match_timings.append(time)
+                spawn_timings_temp.append(time)
+            source, target = intern(source), intern(target)
+            if source != current_id and target != current_id:
+                if current_id is not None:
+                    spawns.append((spawn_start, row))
+                    spawn_start = row
+                    spawn_timings_temp.append(time)
+                if source in players:
+                    current_id = source
+                elif target in players:
+                    current_id = target
+            columns["time"].append(milliseconds(time))
+            columns["source"].append(source)
+            columns["target"].append(target)
+            columns["ability"].append(intern(line["ability"]))
+            columns["effect"].append(intern(line["effect"]))
+            columns["damage"].append(line["damage"])
+            columns["crit"].append(line["crit"])
+        # Handle EOF before match ended
+        row = len(columns["time"])
+        if is_match is True and row != spawn_start:
+            spawns.append((spawn_start, row))
+            matches.append((match_start, len(spawns)))
+            match_timings.append(time)
+            spawn_timings.append(spawn_timings_temp)
+        columns = {column: np.array(values, dtype=cls.DTYPES[column]) for column, values in columns.items()}
+        columns["category"] = cls.build_categories(columns["effect"])
+        return cls(
+            columns, np.array(spawns, dtype=np.int64).reshape(-1, 2), np.array(matches, dtype=np.int64).reshape(-1, 2),
+            player_list, match_timings, spawn_timings)
+
+    @classmethod
+    def from_cube(cls, file_cube: list, match_timings: list, spawn_timings: list,
+                  player_list: List[str]) -> "EventTable":
+        """
+        Build an EventTable from a file cube that was already split,
+        along with the timings as returned by Parser.split_combatlog
+        """
+        columns = {column: array("q") for column in cls.COLUMNS}
+        spawns, matches, intern = list(), list(), symbols.intern
+        for match in file_cube:
+            start = len(spawns)
+            for spawn in match:
+                row = len(columns["time"])
+                for line in spawn:
+                    columns["time"].append(milliseconds(line["time"]))
+                    columns["source"].append(intern(line["source"]))
+                    columns["target"].append(intern(line["target"]))
+                    columns["ability"].append(intern(line["ability"]))
+                    columns["effect"].append(intern(line["effect"]))
+                    columns["damage"].append(line["damage"])
+                    columns["crit"].append(line["crit"])
+                spawns.append((row, len(columns["time"])))
+            matches.append((start, len(spawns)))
+        columns = {column: np.array(values, dtype=cls.DTYPES[column]) for column, values in columns.items()}
+        columns["category"] = cls.build_categories(columns["effect"])
+        return cls(
+            columns, np.array(spawns, dtype=np.int64).reshape(-1, 2), np.array(matches, dtype=np.int64).reshape(-1, 2),
+            player_list, match_timings, spawn_timings)
+
+    @classmethod
+    def build_categories(cls, effects: np.ndarray) -> np.ndarray:
+        """Return an array of category flags for an array of effect codes"""
+        codes, inverse = np.unique(effects, return_inverse=True)
+        categories = np.zeros(len(codes), dtype=np.uint8)
+        for index, effect in enumerate(map(symbols.lookup, codes)):
+            if "Damage" in effect:
+                categories[index] |= cls.CATEGORY_DAMAGE
+            if "Healing" in effect:
+                categories[index] |= cls.CATEGORY_HEALING
+            if "AbilityActivate" in effect:
+                categories[index] |= cls.CATEGORY_ACTIVATE
+        return categories[inverse.ravel()]
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def view(self, spawn_start: int, spawn_stop: int, match_timings: list, spawn_timings: list) -> "EventTable":
+        """Return an EventTable for a range of spawns sharing the arrays"""
+        start, stop = self.spawns[spawn_start, 0], self.spawns[spawn_stop - 1, 1]
+        columns = {column: getattr(self, column)[start:stop] for column in self.COLUMNS}
+        spawns = self.spawns[spawn_start:spawn_stop] - start
+        matches = np.array([[0, len(spawns)]], dtype=np.int64)
+        return EventTable(columns, spawns, matches, self.player_list, match_timings, spawn_timings)
+
+    def match(self, index: int) -> "EventTable":
+        """Return an EventTable for a single match"""
+        start, stop = self.matches[index]
+        return self.view(start, stop, self.match_timings[2 * index:2 * index + 2], self.spawn_timings[index:index + 1])
+
+    def spawn(self, match: int, index: int) -> "EventTable":
+        """Return an EventTable for a single spawn of a match"""
+        spawn = self.matches[match, 0] + index
+        return self.view(spawn, spawn + 1, list(), [[self.spawn_timings[match][index]]])
+
+    def parse_spawn(self) -> SpawnStats:
+        """
+        Calculate the statistics of this table as a single spawn with
+        the same interface as Parser.parse_spawn
+        """
+        stats, spawn_abilities = self._statistics()
+        stats.close(get_ships_for_abilities(code for codes in spawn_abilities for code in codes))
+        return stats
+
+    def parse_match(self) -> SpawnStats:
+        """
+        Calculate the statistics for all spawns in this table with the
+        same interface as Parser.parse_match and Parser.parse_file
+        """
+        stats, spawn_abilities = self._statistics()
+        for codes in spawn_abilities:
+            spawn = SpawnStats()
+            spawn.close(get_ships_for_abilities(codes))
+            stats.merge(spawn)
+        return stats
+
+    parse_file = parse_match
+
+    def _statistics(self) -> Tuple[SpawnStats, list]:
+        """
+        Calculate the statistics for all spawns in this table, without
+        the ships, and the ability codes used in each spawn
+
+        Each spawn is treated as if parsed separately by parse_spawn,
+        and the results are merged like in parse_match. This means that
+        the enemies list contains the enemies of each spawn and that the
+        enemy damage dictionaries contain the values of the last spawn
+        an enemy was encountered in.
+        """
+        actor, target, ability, damage = self.actor, self.target, self.ability, self.damage
+        is_damage = (self.category & self.CATEGORY_DAMAGE) != 0
+        is_healing = ((self.category & self.CATEGORY_HEALING) != 0) & ~is_damage
+        is_self = actor == target
+        activated = self.actor_is_player & ((self.category & self.CATEGORY_ACTIVATE) != 0) & ~(is_self & is_damage)
+        dealt = is_damage & ~is_self & self.actor_is_player
+        taken = is_damage & ~is_self & ~self.actor_is_player
+        healed = is_healing & self.target_is_player
+        sums = tuple(int(value) for value in (
+            damage[dealt].sum(), damage[taken].sum(), damage[is_damage & is_self].sum(),
+            damage[healed].sum(), np.count_nonzero(dealt), np.count_nonzero(self.crit & dealt)))
+        # Ability usage, in order of first usage
+        counts = np.bincount(ability[activated], minlength=self.modulus)
+        used, first = np.unique(ability[activated], return_index=True)
+        used = used[np.argsort(first)]
+        abilities_dict = {symbols.lookup(code): int(counts[code]) for code in used}
+        # Ability codes used in each spawn, in order of first usage
+        spawn_abilities = [list() for _ in range(len(self.spawns))]
+        keys, first = np.unique(self._keys(self.spawn_index[activated], ability[activated]), return_index=True)
+        for spawn, code in zip(*self._split_keys(keys[np.argsort(first)])):
+            spawn_abilities[spawn].append(code)
+        # Enemies of each spawn, in order of first appearance
+        ids = np.column_stack((actor, target)).ravel()
+        id_spawns = np.repeat(self.spawn_index, 2)
+        mask = ~np.column_stack((self.actor_is_player, self.target_is_player)).ravel()
+        keys, first = np.unique(self._keys(id_spawns[mask], ids[mask]), return_index=True)
+        enemies = [symbols.lookup(code) for code in self._split_keys(keys[np.argsort(first)])[1]]
+        # Damage dealt to each enemy and the enemies that dealt damage
+        dealt_keys, dealt_sums = self._grouped_sums(self._keys(self.spawn_index[dealt], target[dealt]), damage[dealt])
+        taken_keys, taken_sums = self._grouped_sums(self._keys(self.spawn_index[taken], actor[taken]), damage[taken])
+        missing = np.setdiff1d(taken_keys, dealt_keys)
+        enemy_dmg_t = self._keys_to_dict(
+            np.concatenate((dealt_keys, missing)), np.concatenate((dealt_sums, np.zeros(len(missing), np.int64))))
+        # Player IDs are added to the damage taken dictionary if they
+        # deal damage to a target not yet in that dictionary
+        taken_rows, dealt_rows = np.flatnonzero(taken), np.flatnonzero(dealt)
+        unique, first = np.unique(self._keys(self.spawn_index[taken], actor[taken]), return_index=True)
+        lookup = self._keys(self.spawn_index[dealt], target[dealt])
+        previous = np.zeros(len(lookup), dtype=np.bool_)
+        if len(unique) != 0:
+            position = np.minimum(np.searchsorted(unique, lookup), len(unique) - 1)
+            previous = (unique[position] == lookup) & (taken_rows[first][position] < dealt_rows)
+        zero_keys = np.unique(self._keys(self.spawn_index[dealt][~previous], actor[dealt][~previous]))
+        enemy_dmg_d = self._keys_to_dict(
+            np.concatenate((taken_keys, zero_keys)), np.concatenate((taken_sums, np.zeros(len(zero_keys), np.int64))))
+        stats = SpawnStats()
+        stats.dmg_d, stats.dmg_t, stats.dmg_s, stats.healing, stats.hitcount, stats.critcount = sums
+        stats.abilities, stats.enemies, stats.enemy_dmg_d, stats.enemy_dmg_t = \
+            abilities_dict, enemies, enemy_dmg_d, enemy_dmg_t
+        return stats, spawn_abilities
+
+    def _keys(self, spawns: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Combine spawn indices and string codes into single keys"""
+        return spawns.astype(np.int64) * self.modulus + codes
+
+    def _split_keys(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Split keys created by _keys into spawn indices and codes"""
+        return np.divmod(keys, self.modulus)
+
+    @staticmethod
+    def _grouped_sums(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the unique keys and the sum of the values for each"""
+        unique, inverse = np.unique(keys, return_inverse=True)
+        return unique, np.bincount(inverse.ravel(), weights=values, minlength=len(unique)).astype(np.int64)
+
+    def _keys_to_dict(self, keys: np.ndarray, values: np.ndarray) -> Dict[str, int]:
+        """
+        Build a dictionary of string to value for combined keys. Values
+        of later spawns overwrite those of earlier spawns, just like
+        dict.update in Parser.parse_match.
+        """
+        order = np.argsort(keys, kind="stable")
+        codes = self._split_keys(keys[order])[1]
+        return {symbols.lookup(code): int(value) for code, value in zip(codes, values[order])}
@@ -0,0 +1,229 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import csv
+import json
+import os
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+# Packages
+import numpy as np
+# Project Modules
+from parsing.accumulator import SpawnStats
+from parsing.fileanalyzer import FileAnalyzer
+from parsing.folderengine import get_workers
+from parsing.parser import Parser
+from parsing.timebase import seconds_between
+from utils import instruments
+
+LEVELS = ("file", "match", "spawn")
+COLUMNS = (
+    "file_name", "date", "player", "level", "match", "spawn", "start", "end", "duration",
+    "damage_dealt", "damage_taken", "selfdamage", "healing", "hitcount", "critcount", "crit_luck",
+    "enemies", "killsassists", "deaths", "ships",
+)
+FORMATS = ("csv", "jsonl", "npz")
+
+ROW = Dict[str, Any]
+
+
+def get_row(file_name: str, player: str, level: str, match: int, spawn: int, start, end,
+            stats: SpawnStats, deaths: int, ships: str) -> ROW:
+    """
+    Build an export row
+    :param stats: SpawnStats of the file, match or spawn
+    :param deaths: Amount of deaths in the file, match or spawn
+    :param ships: Ship or ships used in the file, match or spawn
+    """
+    date = Parser.parse_filename(file_name)
+    return {
+        "file_name": os.path.basename(file_name),
+        "date": date.strftime("%Y-%m-%d") if date is not None else "",
+        "player": player or "",
+        "level": level,
+        "match": match,
+        "spawn": spawn,
+        "start": start.strftime("%H:%M:%S.%f")[:-3],
+        "end": end.strftime("%H:%M:%S.%f")[:-3],
+        "duration": seconds_between(start, end),
+        "damage_dealt": stats.dmg_d,
+        "damage_taken": stats.dmg_t,
+        "selfdamage": stats.dmg_s,
+        "healing": stats.healing,
+        "hitcount": stats.hitcount,
+        "critcount": stats.critcount,
+        "crit_luck": float(stats.crit_luck),
+        "enemies": len(stats.enemies),
+        "killsassists": stats.killsassists,
+        "deaths": deaths,
+        "ships": ships,
+    }
+
+
+@instruments.worker
+def export_file(file_name: str, levels: Tuple[str] = LEVELS) -> Tuple[List[ROW], float]:
+    """
+    Build the export rows of a single CombatLog. This function is
+    executed in the worker processes.
+    :param file_name: Path to the CombatLog
+    :param levels: Levels of statistics to include
+    :return: rows, seconds spent on the file
+    """
+    start = perf_counter()
+    try:
+        # The FileCache is not used, so that exporting a large folder
+        # does not replace the entries of the files opened in the GUI
+        analyzer = FileAnalyzer(file_name, cache=False)
+    except (OSError, ValueError) as e:
+        print("[Export] Failed to analyze '{}': {}".format(file_name, e))
+        return list(), perf_counter() - start
+    rows, timings, name = list(), analyzer.match_timings, analyzer.player_name
+    if "file" in levels and len(analyzer.file_cube) != 0:
+        stats = analyzer.parse_file()
+        rows.append(get_row(
+            file_name, name, "file", -1, -1, timings[0], timings[-1], stats, len(analyzer.table.spawns),
+            stats.ship or ""))
+    for m, match in enumerate(analyzer.file_cube):
+        if "match" in levels:
+            stats = analyzer.parse_match(m)
+            rows.append(get_row(
+                file_name, name, "match", m, -1, timings[2 * m], timings[2 * m + 1], stats, len(match) - 1,
+                stats.ship or ""))
+        if "spawn" not in levels:
+            continue
+        for s, spawn in enumerate(match):
+            try:
+                stats = analyzer.parse_spawn(m, s)
+            except ValueError:  # No ships possible for the spawn
+                continue
+            rows.append(get_row(
+                file_name, name, "spawn", m, s, spawn[0]["time"], spawn[-1]["time"], stats, 0,
+                "/".join(stats.candidates)))
+    return rows, perf_counter() - start
+
+
+class BatchExporter(object):
+    """
+    Exports the statistics of a folder of CombatLogs without a GUI
+
+    The files are analyzed in a pool of worker processes, like by the
+    FolderEngine, and the rows of each file are collected in the order
+    of the files. The time spent on every file is kept for the timing
+    statistics.
+    """
+
+    def __init__(self, files: List[str], levels: Tuple[str] = LEVELS, workers: int = None):
+        """
+        :param files: Paths to the CombatLogs to export
+        :param levels: Levels of statistics to include, see LEVELS
+        :param workers: Amount of worker processes, as for FolderEngine
+        """
+        if any(level not in LEVELS for level in levels):
+            raise ValueError("Invalid levels: {}".format(levels))
+        self.files = files
+        self.levels = tuple(levels)
+        self.workers = get_workers(workers)
+        self.timings: List[float] = list()
+        self.elapsed = 0.0
+
+    def run(self, callback: Callable[[int], None] = None) -> List[ROW]:
+        """
+        Export the files
+        :param callback: Called with the amount of exported files each
+            time a file has been exported
+        :return: list of rows with the COLUMNS as keys
+        """
+        start = perf_counter()
+        if min(self.workers, len(self.files)) <= 1:
+            results = self._run_serial(callback)
+        else:
+            try:
+                results = self._run_parallel(callback)
+            except (BrokenProcessPool, OSError) as e:
+                print("[Export] Process pool failed, exporting in serial: {}".format(e))
+                results = self._run_serial(callback)
+        self.elapsed = perf_counter() - start
+        self.timings = [elapsed for _, elapsed in results]
+        return [row for rows, _ in results for row in rows]
+
+    def _run_serial(self, callback: Callable[[int], None]) -> List[tuple]:
+        """Export the files in the current process"""
+        results = list()
+        for file_name in self.files:
+            results.append(export_file(file_name, self.levels))
+            if callback is not None:
+                callback(len(results))
+        return results
+
+    def _run_parallel(self, callback: Callable[[int], None]) -> List[tuple]:
+        """Export the files in a pool of worker processes"""
+        workers = min(self.workers, len(self.files))
+        with ProcessPoolExecutor(workers) as executor:
+            futures = {executor.submit(export_file, f, self.levels): i for i, f in enumerate(self.files)}
+            results = [None] * len(self.files)
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                if callback is not None:
+                    callback(done)
+        return results
+
+    def statistics(self) -> Dict[str, float]:
+        """Return the timing statistics of the last run"""
+        timings = self.timings if len(self.timings) != 0 else [0.0]
+        return {
+            "files": len(self.timings),
+            "workers": min(self.workers, max(len(self.files), 1)),
+            "elapsed": self.elapsed,
+            "cpu": sum(timings),
+            "files_per_second": len(self.timings) / self.elapsed if self.elapsed != 0 else 0.0,
+            "p50": float(np.percentile(timings, 50)),
+            "p90": float(np.percentile(timings, 90)),
+            "max": max(timings),
+        }
+
+
+def write_csv(rows: List[ROW], path: str):
+    """Write the rows to a CSV file"""
+    with open(path, "w", newline="") as fo:
+        writer = csv.DictWriter(fo, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_jsonl(rows: List[ROW], path: str):
+    """Write the rows to a JSON Lines file"""
+    with open(path, "w") as fo:
+        for row in rows:
+            fo.write(json.dumps(row))
+            fo.write("\n")
+
+
+def write_npz(rows: List[ROW], path: str):
+    """
+    Write the rows to a columnar NumPy archive, with a single array
+    for each of the COLUMNS
+    """
+    columns = {column: [row[column] for row in rows] for column in COLUMNS}
+    arrays = {column: np.array(values) if len(values) != 0 else np.array([], dtype=float)
+              for column, values in columns.items()}
+    np.savez_compressed(path, **arrays)
+
+
+def write_rows(rows: List[ROW], path: str, format: str = None):
+    """
+    Write the rows to a file in one of the FORMATS
+    :param format: Format to write, determined from the extension of
+        path if not given
+    """
+    if format is None:
+        format = os.path.splitext(path)[1][1:].lower()
+    writers = {"csv": write_csv, "jsonl": write_jsonl, "npz": write_npz}
+    if format not in writers:
+        raise ValueError("Unsupported export format: {}".format(format))
+    writers[format](rows, path)
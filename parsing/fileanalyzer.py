@@ -0,0 +1,203 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import os
+from typing import Dict, List
+# Project Modules
+from parsing.accumulator import SpawnStats
+from parsing.entities import EntityRegistry
+from parsing.event import copy_events
+from parsing.eventtable import EventTable
+from parsing.filecache import FileCache
+from parsing.memcache import memory_cache
+from parsing.parser import Parser
+from variables import settings
+
+
+class FileAnalyzer(object):
+    """
+    Analyzes a CombatLog in a single sweep over its lines
+
+    Determines the player ID list, the player name, the file cube with
+    the match and spawn timings as provided by Parser.split_combatlog
+    and an EventTable for the calculation of statistics. The file is
+    read once and every line is converted into an Event only once.
+
+    If the FileCache is enabled, the results of the analysis, including
+    the statistics of every spawn, are stored on disk and loaded from
+    there the next time the file is opened, as long as it is unchanged.
+
+    Attributes:
+    - player_list: List of player IDs in the file
+    - player_name: Name of the character of the file, or None
+    - file_cube: List of matches of lists of spawns of Events
+    - match_timings: Start and end times of each match, flattened
+    - spawn_timings: List of spawn start times for each match
+    - table: EventTable with the events of the file cube
+    - entities: EntityRegistry of each match that has been requested
+
+    The FileAnalyzer is shared through the memory cache, so the file
+    cube must not be changed. Use get_match and get_spawn for copies.
+    """
+
+    # Approximate size of an Event in a file cube
+    EVENT_BYTES = 160
+
+    _cache: FileCache = None
+
+    def __init__(self, file_name: str, cache: (FileCache, bool) = None):
+        """
+        :param file_name: Name of or path to the CombatLog
+        :param cache: FileCache to load and store the results, defaults
+            to the shared cache if caching is enabled, False to not
+            use a cache
+        """
+        self.file_name = file_name
+        self.path = os.path.abspath(Parser.get_file_path(file_name))
+        self.player_list: List[str] = list()
+        self.player_name: str = None
+        self.file_cube: list = list()
+        self.match_timings: list = list()
+        self.spawn_timings: list = list()
+        self.statistics: dict = dict()
+        self.entities: Dict[int, EntityRegistry] = dict()
+        cache = FileAnalyzer.get_cache() if cache is None else (None if cache is False else cache)
+        data = cache.load(self.path) if cache is not None else None
+        if data is not None:
+            self.restore(data)
+            return
+        self.analyze()
+        self.table = EventTable.from_cube(self.file_cube, self.match_timings, self.spawn_timings, self.player_list)
+        if cache is not None:
+            self.build_statistics()
+            cache.store(
+                self.path, self.player_list, self.player_name, self.file_cube,
+                self.match_timings, self.spawn_timings, self.statistics)
+
+    @classmethod
+    def get_cache(cls) -> (FileCache, None):
+        """Return the FileCache if it is enabled"""
+        if not settings["parsing"]["cache"]:
+            return None
+        if cls._cache is None:
+            cls._cache = FileCache()
+        return cls._cache
+
+    @classmethod
+    def open(cls, file_name: str) -> "FileAnalyzer":
+        """
+        Return a FileAnalyzer for a file from the shared in-process
+        cache, creating it if the file is not in the cache or has been
+        changed since it was cached
+        """
+        path = os.path.abspath(Parser.get_file_path(file_name))
+        stat = os.stat(path)
+        key = (cls.__name__, path, stat.st_size, stat.st_mtime)
+        return memory_cache.get_or_load(key, lambda: cls(file_name), lambda analyzer: analyzer.nbytes)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated size of the FileAnalyzer in memory in bytes"""
+        columns = sum(getattr(self.table, column).nbytes for column in EventTable.COLUMNS)
+        return columns + len(self.table) * (self.EVENT_BYTES + 5 * 8)
+
+    def analyze(self):
+        """
+        Perform the sweep over the events of the file. The matches are
+        split after the sweep, with the player ID list of the file.
+        """
+        matches, events = list(), list()
+        for event in Parser.stream_events(self.path):
+            source, target = event["source"], event["target"]
+            if "@" in source or "@" in target:
+                # Player name as in Parser.get_player_name
+                if self.player_name is None and source == target and ":" not in source:
+                    self.player_name = source.replace("@", "")
+            elif source == target and source not in self.player_list:
+                # Player IDs as in Parser.get_player_id_list
+                self.player_list.append(source)
+            # Match splitting as in Parser.stream_matches
+            if Parser.is_ignorable(event):
+                continue
+            if Parser.is_gsf_event(event):
+                events.append(event)
+                continue
+            if len(events) == 0:
+                continue
+            matches.append((events, event["time"]))
+            events = list()
+        # Handle EOF before match ended
+        if len(events) != 0:
+            matches.append((events, events[-1]["time"]))
+        for events, end in matches:
+            self.add_match(events, end)
+
+    def restore(self, data: dict):
+        """Restore the results of an analysis loaded from the cache"""
+        for key in ("player_list", "player_name", "file_cube", "match_timings", "spawn_timings", "statistics"):
+            setattr(self, key, data[key])
+        self.table = EventTable.from_cube(self.file_cube, self.match_timings, self.spawn_timings, self.player_list)
+
+    def build_statistics(self):
+        """Calculate the statistics of every spawn for the cache"""
+        for match, spawns in enumerate(self.file_cube):
+            for spawn in range(len(spawns)):
+                try:
+                    self.statistics[(match, spawn)] = self.table.spawn(match, spawn).parse_spawn()
+                except ValueError:  # No ships possible for the spawn
+                    continue
+
+    def add_match(self, events: list, end):
+        """Split the events of a match and add it to the file cube"""
+        match, _, (start, end), spawn_timings = Parser.split_match(events, end, self.player_list)
+        self.file_cube.append(match)
+        self.match_timings.extend((start, end))
+        self.spawn_timings.append(spawn_timings)
+
+    def parse_file(self) -> SpawnStats:
+        """Return the SpawnStats of Parser.parse_file for this file"""
+        return Parser.parse_file(self.table, self.player_list)
+
+    def parse_match(self, index: int) -> SpawnStats:
+        """Return the SpawnStats of Parser.parse_match for a match"""
+        return Parser.parse_match(self.table.match(index), self.player_list)
+
+    def get_match(self, index: int) -> list:
+        """
+        Return a copy of the spawns of a match. The Events of the file
+        cube are shared by all users of the FileAnalyzer, so code that
+        changes the Events or the lists must be given a copy.
+        """
+        return [copy_events(spawn) for spawn in self.file_cube[index]]
+
+    def get_spawn(self, match: int, index: int) -> list:
+        """Return a copy of the Events of a spawn, as get_match"""
+        return copy_events(self.file_cube[match][index])
+
+    def get_entities(self, index: int) -> EntityRegistry:
+        """Return the EntityRegistry of a match, built only once"""
+        if index not in self.entities:
+            self.entities[index] = EntityRegistry.from_table(self.table.match(index))
+        return self.entities[index]
+
+    def parse_spawn(self, match: int, index: int) -> SpawnStats:
+        """Return the SpawnStats of Parser.parse_spawn for a spawn"""
+        if (match, index) in self.statistics:
+            return self.statistics[(match, index)]
+        return Parser.parse_spawn(self.table.spawn(match, index), self.player_list)
+
+    def find_match(self, match_timing) -> (int, None):
+        """Return the index of the match with the given start time"""
+        starts = self.match_timings[::2]
+        return starts.index(match_timing) if match_timing in starts else None
+
+    def find_spawn(self, spawn_timing) -> (tuple, None):
+        """Return the match and spawn index of the spawn with the given start time"""
+        for match, timings in enumerate(self.spawn_timings):
+            if spawn_timing in timings:
+                return match, timings.index(spawn_timing)
+        return None
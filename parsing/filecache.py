@@ -0,0 +1,231 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from datetime import datetime
+from hashlib import sha1
+import json
+import os
+from typing import Any, Dict, List
+# Packages
+import numpy as np
+# Project Modules
+from parsing.accumulator import SpawnStats
+from parsing.event import Event
+from parsing import timebase
+from parsing.timebase import milliseconds
+from utils.directories import get_temp_directory
+from variables import settings
+
+
+class FileCache(object):
+    """
+    On-disk cache of analyzed CombatLogs
+
+    Stores the file cube, the match and spawn timings, the player IDs
+    and name and the statistics of each spawn of a CombatLog, so that
+    the file does not have to be parsed again when it is opened at a
+    later point. Each file is stored in a compressed NumPy archive with
+    the events as integer columns.
+
+    Entries are keyed by (path, size, mtime) of the CombatLog, so an
+    entry is invalidated as soon as the file changes, for example when
+    SWTOR writes new lines to it. The total size of the cache is capped,
+    when it is exceeded the least recently used entries are removed.
+    """
+
+    VERSION = 3
+    EXTENSION = ".npz"
+    COLUMNS = ("time", "source", "target", "ability", "effect", "amount", "effect_id", "damage", "crit")
+
+    def __init__(self, directory: str = None, max_size: int = None):
+        """
+        :param directory: Directory to store the cache files in,
+            defaults to a folder in the temporary directory
+        :param max_size: Maximum size of the cache in bytes, defaults
+            to the cache_size setting in megabytes
+        """
+        if directory is None:
+            directory = os.path.join(get_temp_directory(), "filecache")
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self._max_size = max_size
+
+    @property
+    def max_size(self) -> int:
+        """Maximum size of the cache in bytes"""
+        if self._max_size is not None:
+            return self._max_size
+        return int(settings["parsing"]["cache_size"] * 1024 * 1024)
+
+    def get_cache_path(self, path: str) -> str:
+        """Return the path of the cache file for a CombatLog"""
+        name = sha1(os.path.abspath(path).encode()).hexdigest()
+        return os.path.join(self.directory, name + self.EXTENSION)
+
+    @staticmethod
+    def get_key(path: str) -> tuple:
+        """Return the (path, size, mtime) key of a CombatLog"""
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_size, stat.st_mtime
+
+    def load(self, path: str) -> (Dict[str, Any], None):
+        """
+        Load the cached data for a CombatLog
+        :param path: Path to the CombatLog
+        :return: dictionary with player_list, player_name, file_cube,
+            match_timings, spawn_timings, columns, strings, spawns,
+            matches and statistics keys or None if there is no valid
+            entry in the cache for the file in its current state
+        """
+        cache_path = self.get_cache_path(path)
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with np.load(cache_path) as archive:
+                meta = json.loads(bytes(archive["meta"]).decode())
+                if meta["version"] != self.VERSION or tuple(meta["key"]) != self.get_key(path):
+                    print("[FileCache] Removing outdated cache entry for {}".format(path))
+                    os.remove(cache_path)
+                    return None
+                arrays = {name: archive[name] for name in archive.files if name != "meta"}
+        except (OSError, ValueError, KeyError) as e:
+            print("[FileCache] Failed to load cache entry for {}: {}".format(path, e))
+            return None
+        os.utime(cache_path)  # Mark as recently used
+        data = self.unpack(meta, arrays)
+        print("[FileCache] Loaded {} from cache".format(os.path.basename(path)))
+        return data
+
+    def store(self, path: str, player_list: List[str], player_name: str, file_cube: list,
+              match_timings: list, spawn_timings: list, statistics: dict):
+        """
+        Store the data for a CombatLog in the cache
+        :param path: Path to the CombatLog
+        :param player_list: List of player IDs
+        :param player_name: Name of the player
+        :param file_cube: File cube of Events
+        :param match_timings: match_timings as in split_combatlog
+        :param spawn_timings: spawn_timings as in split_combatlog
+        :param statistics: Dictionary of {(match, spawn): SpawnStats}
+        """
+        strings, codes = list(), dict()
+
+        def code(string: (str, None)) -> int:
+            if string is None:
+                return -1
+            if string not in codes:
+                codes[string] = len(strings)
+                strings.append(string)
+            return codes[string]
+
+        columns = {column: list() for column in self.COLUMNS}
+        spawns, matches = list(), list()
+        for match in file_cube:
+            start = len(spawns)
+            for spawn in match:
+                row = len(columns["time"])
+                for event in spawn:
+                    columns["time"].append(milliseconds(event["time"]))
+                    for column in ("source", "target", "ability", "effect", "amount", "effect_id"):
+                        columns[column].append(code(event[column]))
+                    columns["damage"].append(event["damage"])
+                    columns["crit"].append(event["crit"])
+                spawns.append((row, len(columns["time"])))
+            matches.append((start, len(spawns)))
+        arrays = {column: np.array(values, dtype=np.int64) for column, values in columns.items()}
+        arrays["crit"] = arrays["crit"].astype(np.bool_)
+        arrays["spawns"] = np.array(spawns, dtype=np.int64).reshape(-1, 2)
+        arrays["matches"] = np.array(matches, dtype=np.int64).reshape(-1, 2)
+        arrays["match_timings"] = np.array([milliseconds(time) for time in match_timings], dtype=np.int64)
+        arrays["spawn_timings"] = np.array(
+            [milliseconds(time) for timings in spawn_timings for time in timings], dtype=np.int64)
+        meta = {
+            "version": self.VERSION,
+            "key": self.get_key(path),
+            "player_list": player_list,
+            "player_name": player_name,
+            "strings": strings,
+            "statistics": [[m, s, stats.to_dict()] for (m, s), stats in statistics.items()],
+        }
+        arrays["meta"] = np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)
+        cache_path = self.get_cache_path(path)
+        temp = cache_path + ".tmp"
+        try:
+            with open(temp, "wb") as fo:
+                np.savez_compressed(fo, **arrays)
+            os.replace(temp, cache_path)
+        except OSError as e:
+            print("[FileCache] Failed to store cache entry for {}: {}".format(path, e))
+            return
+        self.evict()
+
+    def unpack(self, meta: dict, arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Rebuild the file cube and timings from the cached arrays"""
+        strings, times = meta["strings"], dict()
+
+        def to_datetime(value: int) -> datetime:
+            if value not in times:
+                times[value] = timebase.to_datetime(value)
+            return times[value]
+
+        columns = {column: arrays[column].tolist() for column in self.COLUMNS}
+        file_cube, spawn_timings = list(), list()
+        flat_timings = [to_datetime(value) for value in arrays["spawn_timings"].tolist()]
+        spawns = arrays["spawns"].tolist()
+        for start, stop in arrays["matches"].tolist():
+            match = list()
+            for first, last in spawns[start:stop]:
+                spawn = list()
+                for row in range(first, last):
+                    source, target = strings[columns["source"][row]], strings[columns["target"][row]]
+                    effect_id = columns["effect_id"][row]
+                    spawn.append(Event({
+                        "time": to_datetime(columns["time"][row]),
+                        "source": source,
+                        "target": target,
+                        "ability": strings[columns["ability"][row]],
+                        "effect": strings[columns["effect"][row]],
+                        "amount": strings[columns["amount"][row]],
+                        "effect_id": strings[effect_id] if effect_id != -1 else None,
+                        "self": source == target,
+                        "damage": columns["damage"][row],
+                        "crit": columns["crit"][row],
+                    }))
+                match.append(spawn)
+            file_cube.append(match)
+            spawn_timings.append(flat_timings[start:stop])
+        return {
+            "player_list": meta["player_list"],
+            "player_name": meta["player_name"],
+            "file_cube": file_cube,
+            "match_timings": [to_datetime(value) for value in arrays["match_timings"].tolist()],
+            "spawn_timings": spawn_timings,
+            "statistics": {(m, s): SpawnStats.from_dict(stats) for m, s, stats in meta["statistics"]},
+        }
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits"""
+        entries = list()
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.EXTENSION):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_size:
+                break
+            print("[FileCache] Evicting {}".format(name))
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        for name in os.listdir(self.directory):
+            if name.endswith(self.EXTENSION):
+                os.remove(os.path.join(self.directory, name))
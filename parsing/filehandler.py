@@ -11,10 +11,13 @@ from datetime import datetime
 from pynput.mouse import Button
 # Project Modules
 from utils.colors import *
+from parsing.event import Event
+from parsing.memcache import memory_cache
 from parsing.parser import Parser
 from parsing.vision import *
 from data import abilities
 from parsing.shipstats import ShipStats
+from parsing.timebase import timeline_value
 
 
 class FileHandler(object):
@@ -23,6 +26,9 @@ class FileHandler(object):
     information on the contents of the database, please consult the
     realtime.py docstring.
     """
+    # Approximate ratio of unpickled size to pickled size
+    PICKLE_FACTOR = 4
+
     feature_strings = {
         "health": "Ship Health",
         "power_mgmt": "Power Management",
@@ -186,10 +192,23 @@ class FileHandler(object):
 
     @staticmethod
     def get_data_dictionary(name="realtime.db"):
-        """Read the real-time results data dictionary from"""
+        """
+        Read the real-time results data dictionary from the temporary
+        directory. The dictionary is kept in the shared memory cache
+        until the file is changed, and must thus not be modified.
+        """
         file_name = os.path.join(get_temp_directory(), name)
         if not os.path.exists(file_name):
             return {}
+        stat = os.stat(file_name)
+        return memory_cache.get_or_load(
+            ("FileHandler", file_name, stat.st_size, stat.st_mtime),
+            lambda: FileHandler.load_data_dictionary(file_name),
+            lambda _: stat.st_size * FileHandler.PICKLE_FACTOR)
+
+    @staticmethod
+    def load_data_dictionary(file_name: str) -> dict:
+        """Unpickle the real-time results data dictionary"""
         with open(file_name, "rb") as fi:
             data = pickle.load(fi)
         return data
@@ -269,11 +288,8 @@ class FileHandler(object):
             if line["self"] is True or line["target"] not in player_list:
                 continue
             # Determine the category of this ability
-            if ability in abilities.primaries:
-                category = "primaries"
-            elif ability in abilities.secondaries:
-                category = "secondaries"
-            else:  # Ability is not a weapon
+            category = abilities.ABILITIES.get(ability, (None,))[0]
+            if category not in ("primaries", "secondaries"):  # Ability is not a weapon
                 continue
             # Generate the arguments for the marker creation
             start = FileHandler.datetime_to_float(line["time"])
@@ -460,22 +476,16 @@ class FileHandler(object):
         results = {key: [] for key in categories}
         # Activation markers
         for line in spawn_list:
-            if not isinstance(line, dict):
+            if not isinstance(line, (dict, Event)):
                 line = Parser.line_to_dictionary(line)
             ability = line["ability"]
             if (line["source"] != line["target"] or line["source"] not in player_id_list or
                     "AbilityActivate" not in line["effect"]):
                 continue
-            if ability in abilities.copilots:
-                category = "copilot"
-            elif ability in abilities.shields:
-                category = "shields"
-            elif ability in abilities.systems:
-                category = "systems"
-            elif ability in abilities.engines:
-                category = "engines"
-            else:
+            category = abilities.ABILITIES.get(ability, (None,))[0]
+            if category not in ("copilots", "shields", "systems", "engines"):
                 continue
+            category = "copilot" if category == "copilots" else category
             start = FileHandler.datetime_to_float(line["time"])
             args = ("abilities", start, start + 1/60)
             kwargs = {"background": FileHandler.colors[category]}
@@ -517,8 +527,7 @@ class FileHandler(object):
         """Convert a datetime object to a float value"""
         if not isinstance(date_time_obj, datetime):
             raise TypeError("date_time_obj not of datetime type but {}".format(repr(date_time_obj)))
-        return float(
-            "{}.{}{}".format(date_time_obj.minute, (int((date_time_obj.second / 60) * 100)), date_time_obj.microsecond))
+        return timeline_value(date_time_obj.minute, date_time_obj.second, date_time_obj.microsecond)
 
     @staticmethod
     def screen_dict_keys_generator(screen_dict):
@@ -0,0 +1,166 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from queue import Empty, Queue
+from threading import Event, Thread
+from typing import Any, Dict, List, Tuple
+# Project Modules
+from parsing.folderengine import get_workers
+from parsing.gsfindex import GSFIndex
+from parsing.logindex import LogIndex
+from parsing.parser import Parser
+from utils import instruments
+
+RESULT = Tuple[str, Dict[str, Any]]
+
+
+@instruments.worker
+def scan_file(file_name: str) -> RESULT:
+    """
+    Determine whether a file contains GSF matches and how many. This
+    function is executed in the worker processes.
+    :return: file_name, GSFIndex entry or None if the file could not
+        be read
+    """
+    try:
+        return file_name, GSFIndex.scan_file(GSFIndex.get_path(file_name))
+    except (OSError, ValueError) as e:
+        print("[FileScanner] Failed to scan '{}': {}".format(file_name, e))
+        return file_name, None
+
+
+class FileScanner(Thread):
+    """
+    Scans the files of the CombatLogs folder in the background
+
+    The files are checked for GSF matches in a pool of worker processes,
+    newest files first. The results are put into a Queue as they come
+    in, so that the UI can insert them with poll() from a Tkinter after
+    callback without ever waiting for the scan to complete.
+
+    Files that are in the GSFIndex in their current state are not read
+    again, their entries are available from the first poll().
+
+    The indices of removed files are pruned only after a scan that was
+    not cancelled, and those of the LogIndex only after the first such
+    scan of the session, instead of on every refresh.
+    """
+
+    _log_index_pruned = False
+
+    def __init__(self, files: List[str], workers: int = None, index: GSFIndex = None):
+        """
+        :param files: List of CombatLog file names to scan
+        :param workers: Amount of worker processes, as for FolderEngine
+        :param index: GSFIndex to take entries from and store new
+            entries in, defaults to the shared index if caching is
+            enabled
+        """
+        Thread.__init__(self, daemon=True)
+        self.files = FileScanner.sort_files(files)
+        self.workers = get_workers(workers)
+        self.index = index if index is not None else GSFIndex.get_shared()
+        self.scanned = 0
+        self._queue = Queue()
+        self._cancel = Event()
+
+    @staticmethod
+    def sort_files(files: List[str]) -> List[str]:
+        """Sort the files newest first, by the date in their name"""
+        return sorted(files, key=lambda f: Parser.parse_filename(f) or datetime.min, reverse=True)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        """Whether the scan is over and all results were polled"""
+        return not self.is_alive() and self._queue.empty()
+
+    def cancel(self):
+        """Stop scanning files as soon as possible"""
+        self._cancel.set()
+
+    def poll(self) -> List[RESULT]:
+        """Return the results that came in since the last poll"""
+        results = list()
+        while True:
+            try:
+                results.append(self._queue.get_nowait())
+            except Empty:
+                break
+        self.scanned += len(results)
+        return results
+
+    def run(self):
+        """Scan the files, in serial if there is no use for a pool"""
+        files = list()
+        for file_name in self.files:
+            try:
+                entry = self.index.get(GSFIndex.get_path(file_name)) if self.index is not None else None
+            except OSError:  # File removed, reported by scan_file
+                entry = None
+            if entry is None:
+                files.append(file_name)
+                continue
+            self._queue.put((file_name, entry))
+        print("[FileScanner] {} files indexed, {} files to scan".format(len(self.files) - len(files), len(files)))
+        if min(self.workers, len(files)) <= 1:
+            self._run_serial(files)
+        else:
+            try:
+                self._run_parallel(files)
+            except (BrokenProcessPool, OSError) as e:
+                print("[FileScanner] Process pool failed, scanning in serial: {}".format(e))
+                self._run_serial(files)
+        if self.cancelled or self.index is None:
+            return
+        self.index.prune()
+        self.index.save()
+        if FileScanner._log_index_pruned is False:
+            LogIndex.prune()
+            FileScanner._log_index_pruned = True
+
+    def _put(self, result: RESULT):
+        """Store a result in the index and pass it on to the UI"""
+        file_name, entry = result
+        if entry is not None and self.index is not None:
+            self.index.put(GSFIndex.get_path(file_name), entry)
+        self._queue.put(result)
+
+    def _run_serial(self, files: List[str]):
+        """Scan the files in this thread"""
+        for file_name in files:
+            if self.cancelled:
+                return
+            self._put(scan_file(file_name))
+
+    def _run_parallel(self, files: List[str]):
+        """Scan the files in a pool of worker processes"""
+        workers = min(self.workers, len(files))
+        print("[FileScanner] Scanning {} files with {} workers".format(len(files), workers))
+        pending = set(files)
+        try:
+            with ProcessPoolExecutor(workers) as executor:
+                # Futures are started in order of submission, newest files first
+                futures = [executor.submit(scan_file, file_name) for file_name in files]
+                for future in as_completed(futures):
+                    if self.cancelled:
+                        for other in futures:
+                            other.cancel()
+                        return
+                    result = future.result()
+                    pending.discard(result[0])
+                    self._put(result)
+        except (BrokenProcessPool, OSError):
+            # Only the files without results remain to be scanned
+            files[:] = [file_name for file_name in files if file_name in pending]
+            raise
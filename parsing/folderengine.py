@@ -0,0 +1,224 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import os
+from threading import Event
+from typing import Callable, List, Tuple
+# Project Modules
+from parsing.accumulator import SpawnStats
+from parsing.eventtable import EventTable
+from parsing.folderindex import FolderIndex
+from parsing.parser import Parser
+from parsing.splitter import get_chunks
+from parsing.timebase import seconds_between
+from utils import instruments
+from variables import settings
+
+
+def get_workers(workers: int = None) -> int:
+    """
+    Return the amount of worker processes to use
+    :param workers: Amount of worker processes, defaults to the
+        workers setting, zero for the amount of processors
+    """
+    if workers is None:
+        workers = settings["parsing"]["workers"]
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+@instruments.worker
+def parse_folder_file(file_name: str, offset: int = 0, stop: int = None, player_list: List[str] = None) -> SpawnStats:
+    """
+    Return the statistics of a single file. This function is executed
+    in the worker processes and the statistics are merged into those
+    of the whole folder.
+    :param offset: Byte offset of the chunk of the file to parse
+    :param stop: Byte offset of the end of the chunk, see get_chunks
+    :param player_list: Player ID list of the whole file. If not given,
+        a whole file is read in a single sweep with Parser.read_matches
+        and a chunk reads the list with Parser.read_player_id_list.
+    """
+    whole = offset == 0 and (stop is None or stop >= os.path.getsize(Parser.get_file_path(file_name)))
+    if player_list is None and whole:
+        matches = Parser.read_matches(file_name)
+    else:
+        matches = Parser.stream_matches(file_name, start=offset, end=stop, player_list=player_list)
+    stats = SpawnStats()
+    for match, player_ids, (start, end), spawn_timings in matches:
+        table = EventTable.from_cube([match], [start, end], [spawn_timings], player_ids)
+        match_stats = Parser.parse_match(table, player_ids)
+        match_stats.duration = seconds_between(start, end)
+        stats.merge(match_stats)
+    return stats
+
+
+class FolderEngine(object):
+    """
+    Calculates the statistics of a folder of CombatLogs in parallel
+
+    The files are distributed over a pool of worker processes, which
+    each return the results of a single file. The results are merged in
+    the parent process in the order of the files, so the results are
+    equal to those of a serial parse.
+
+    The results of every file are stored in a FolderIndex, so that only
+    new and modified files have to be parsed the next time.
+
+    Files of more than CHUNK_SIZE bytes are divided into chunks at match
+    boundaries, which are parsed by multiple workers. The statistics
+    of the chunks are merged in order, so the results are equal to
+    those of parsing the file as a whole.
+
+    The engine may be cancelled from a callback, after which the files
+    that have not been started yet are not parsed anymore.
+    """
+
+    CHUNK_SIZE = 8 * 1024 ** 2
+
+    _index: FolderIndex = None
+
+    def __init__(self, files: List[str], workers: int = None, index: (FolderIndex, bool) = None):
+        """
+        :param files: List of CombatLog file names to parse
+        :param workers: Amount of worker processes, defaults to the
+            workers setting, zero for the amount of processors
+        :param index: FolderIndex with the results of parsed files,
+            defaults to the shared index if caching is enabled, False
+            to not use an index
+        """
+        self.files = files
+        self.workers = get_workers(workers)
+        self.index = FolderEngine.get_index() if index is None else (None if index is False else index)
+        self._cancel = Event()
+
+    @classmethod
+    def get_index(cls) -> (FolderIndex, None):
+        """Return the shared FolderIndex if caching is enabled"""
+        if not settings["parsing"]["cache"]:
+            return None
+        if cls._index is None:
+            cls._index = FolderIndex()
+            cls._index.load()
+        return cls._index
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Stop parsing files as soon as possible"""
+        self._cancel.set()
+
+    def run(self, callback: Callable[[int], None] = None) -> (SpawnStats, None):
+        """
+        Parse the files and return the merged results. Only the files
+        that are not in the index in their current state are parsed.
+        :param callback: Called with the amount of parsed files each
+            time a file has been parsed, in the parent process
+        :return: merged SpawnStats of the files, None if cancelled
+        """
+        paths = [os.path.abspath(Parser.get_file_path(file_name)) for file_name in self.files]
+        file_results = [self.index.get(path) if self.index is not None else None for path in paths]
+        pending = [i for i, other in enumerate(file_results) if other is None]
+        files = [paths[i] for i in pending]
+        indexed = len(paths) - len(pending)
+        print("[FolderEngine] {} files indexed, {} files to parse".format(indexed, len(pending)))
+        if callback is not None:
+            progress = callback
+            callback = lambda done: progress(indexed + done)
+            callback(0)
+        tasks = self.get_tasks(files) if self.workers > 1 else list()
+        if min(self.workers, len(tasks)) <= 1:
+            parsed = self._run_serial(files, callback)
+        else:
+            try:
+                parsed = self._run_parallel(files, tasks, callback)
+            except (BrokenProcessPool, OSError) as e:
+                print("[FolderEngine] Process pool failed, parsing in serial: {}".format(e))
+                parsed = self._run_serial(files, callback)
+        if parsed is None:
+            print("[FolderEngine] Cancelled")
+            return None
+        for i, other in zip(pending, parsed):
+            file_results[i] = other
+            if self.index is not None:
+                self.index.put(paths[i], other)
+        if self.index is not None:
+            self.index.prune()
+            self.index.save()
+        results = SpawnStats()
+        for other in file_results:
+            results.merge(other)
+        return results
+
+    def _run_serial(self, files: List[str], callback: Callable[[int], None]) -> (List[SpawnStats], None):
+        """Parse the files in the current process"""
+        file_results = list()
+        for file_name in files:
+            if self.cancelled:
+                return None
+            file_results.append(parse_folder_file(file_name, player_list=self.get_player_list(file_name)))
+            if callback is not None:
+                callback(len(file_results))
+        return file_results
+
+    def get_player_list(self, file_name: str) -> (List[str], None):
+        """
+        Return the player ID list of a file of more than CHUNK_SIZE
+        bytes, so that its matches are streamed instead of being kept
+        in memory, or None to read a smaller file in a single sweep
+        """
+        if os.path.getsize(Parser.get_file_path(file_name)) <= self.CHUNK_SIZE:
+            return None
+        return Parser.read_player_id_list(file_name)
+
+    def get_tasks(self, files: List[str]) -> List[Tuple[int, int, int]]:
+        """
+        Return the chunks of the files to parse, dividing large files
+        into up to one chunk per worker
+        :return: list of (file index, start, end) tuples in file order
+        """
+        tasks = list()
+        for i, path in enumerate(files):
+            chunks = min(self.workers, os.path.getsize(path) // self.CHUNK_SIZE)
+            tasks.extend((i, start, end) for start, end in get_chunks(path, chunks))
+        return tasks
+
+    def _run_parallel(self, files: List[str], tasks: List[Tuple[int, int, int]],
+                      callback: Callable[[int], None]) -> (List[SpawnStats], None):
+        """Parse the chunks of the files in a pool of worker processes"""
+        workers = min(self.workers, len(tasks))
+        print("[FolderEngine] Parsing {} files in {} chunks with {} workers".format(len(files), len(tasks), workers))
+        remaining = Counter(i for i, _, _ in tasks)
+        # The player ID list of a chunked file is read once for all of its chunks
+        player_lists = {i: Parser.read_player_id_list(files[i]) for i, count in remaining.items() if count > 1}
+        with ProcessPoolExecutor(workers) as executor:
+            futures = {executor.submit(parse_folder_file, files[i], start, end, player_lists.get(i)): t
+                       for t, (i, start, end) in enumerate(tasks)}
+            chunk_results, done = [None] * len(tasks), 0
+            for future in as_completed(futures):
+                if self.cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    return None
+                t = futures[future]
+                chunk_results[t] = future.result()
+                remaining[tasks[t][0]] -= 1
+                if remaining[tasks[t][0]] == 0:
+                    done += 1
+                    if callback is not None:
+                        callback(done)
+        # Results are merged in the order of the files and chunks
+        file_results = [SpawnStats() for _ in files]
+        for (i, _, _), stats in zip(tasks, chunk_results):
+            file_results[i].merge(stats)
+        return file_results
@@ -0,0 +1,121 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import os
+import _pickle as pickle
+from threading import Lock
+from typing import Dict
+# Project Modules
+from utils.directories import get_temp_directory
+
+
+class FolderIndex(object):
+    """
+    Persistent index of the folder statistics of every CombatLog
+
+    Stores the SpawnStats of FolderEngine for each file, keyed by the
+    absolute path of the file together with its size and modification
+    time. CombatLogs of earlier days never change, so the folder
+    statistics only require the parsing of new and modified files,
+    the results of the other files are taken from the index.
+
+    The VERSION must be increased whenever the results of a file are
+    calculated differently, so that the index is rebuilt.
+    """
+
+    VERSION = 4
+    FILE_NAME = "folderindex.db"
+
+    def __init__(self, path: str = None):
+        """
+        :param path: Path to the file the index is saved to, defaults
+            to a file in the temporary directory
+        """
+        if path is None:
+            path = os.path.join(get_temp_directory(), self.FILE_NAME)
+        self.path = path
+        self.entries: Dict[str, tuple] = dict()
+        self._dirty = False
+        self._lock = Lock()
+
+    @staticmethod
+    def get_key(path: str) -> tuple:
+        """Return the (size, mtime) key of a CombatLog"""
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime
+
+    def get(self, path: str):
+        """
+        Return the stored results for a file
+        :param path: Absolute path to the CombatLog
+        :return: SpawnStats or None if the file was not indexed or
+            was modified since it was indexed
+        """
+        entry = self.entries.get(path)
+        if entry is None or entry[0] != self.get_key(path):
+            return None
+        return entry[1]
+
+    def put(self, path: str, results):
+        """Store the results for a file in its current state"""
+        with self._lock:
+            self.entries[path] = (self.get_key(path), results)
+            self._dirty = True
+
+    def prune(self):
+        """Remove the entries for files that no longer exist"""
+        with self._lock:
+            for path in list(self.entries.keys()):
+                if not os.path.exists(path):
+                    del self.entries[path]
+                    self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def load(self) -> bool:
+        """
+        Load the index from its file
+        :return: True if the index was loaded
+        """
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as fi:
+                data = pickle.load(fi)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print("[{}] Failed to load index: {}".format(type(self).__name__, e))
+            return False
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            print("[{}] Index version mismatch, ignoring file".format(type(self).__name__))
+            return False
+        with self._lock:
+            self.entries.update(data["entries"])
+        return True
+
+    def save(self):
+        """
+        Save the index if it was changed since it was loaded. The lock
+        is held while writing, so that saves from different threads do
+        not write to the temporary file at the same time.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": self.VERSION, "entries": self.entries}
+            temp = "{}.tmp".format(self.path)
+            try:
+                with open(temp, "wb") as fo:
+                    pickle.dump(data, fo)
+                os.replace(temp, self.path)
+            except OSError as e:
+                print("[{}] Failed to save index: {}".format(type(self).__name__, e))
+                return
+            self._dirty = False
@@ -4,43 +4,48 @@ Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
 License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
+from parsing.folderengine import FolderEngine
 from parsing.parser import Parser
 
 
-def folder_statistics():
+def folder_statistics(engine: FolderEngine = None, callback=None):
     """
     Parses all files in the Current Working Directory by getting al .txt
     files in the folder and then returns the results in formats that can be
     used by the file_frame to set all the required strings to show the
     results to the user.
+    :param engine: FolderEngine to parse the files with, allows
+        cancellation. Returns None if the engine is cancelled.
+    :param callback: Progress callback as for FolderEngine.run
     """
-    (abilities_dict, dmg_d, dmg_t, dmg_s, healing, hitcount, critcount,
-     crit_luck, enemies, enemy_dmg_d, enemy_dmg_t, ships, uncounted,
-     deaths, time) = \
-        Parser.parse_folder()
+    stats = Parser.parse_folder(callback=callback) if engine is None else engine.run(callback)
+    if stats is None:
+        return None
+    dmg_d, dmg_t, time = stats.dmg_d, stats.dmg_t, stats.duration
 
     stat_string = "{name}\n{enemies} enemies\n{dmg_d}\n{dmg_t}\n{dmg_r:.1f} : 1.0\n" \
                   "{dmg_s}\n{healing}\n{hitcount}\n{critcount}\n{crit_luck:.2f}\n" \
-                  "{deaths}\n{minutes}:{seconds:.0f}\n{dps:.1f}"
+                  "{deaths}\n{minutes}:{seconds:.0f}\n{dps:.1f}\n{reaction}"
 
     minutes, seconds = divmod(time, 60)
 
     stat_string = stat_string.format(
         name="-",
-        enemies=len([enemy for enemy in enemies if enemy in enemy_dmg_t and enemy_dmg_t[enemy] > 0]),
+        enemies=stats.killsassists,
         dmg_d=dmg_d,
         dmg_t=dmg_t,
         dmg_r=dmg_d / dmg_t if dmg_t != 0 else 0,
-        dmg_s=dmg_s,
-        healing=healing,
-        hitcount=hitcount,
-        critcount=critcount,
-        crit_luck=critcount / hitcount if hitcount != 0 else 0,
-        deaths=deaths,
+        dmg_s=stats.dmg_s,
+        healing=stats.healing,
+        hitcount=stats.hitcount,
+        critcount=stats.critcount,
+        crit_luck=stats.crit_luck,
+        deaths=stats.spawns,
         minutes=minutes,
         seconds=seconds,
         dps=dmg_d / time,
+        reaction="-",
     )
 
-    return (abilities_dict, stat_string, ships, enemies, enemy_dmg_d,
-            enemy_dmg_t, uncounted)
+    return (stats.abilities, stat_string, stats.ships, stats.enemies, stats.enemy_dmg_d,
+            stats.enemy_dmg_t, stats.uncounted)
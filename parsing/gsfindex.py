@@ -0,0 +1,87 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import os
+from typing import Any, Dict
+# Project Modules
+from parsing.folderindex import FolderIndex
+from parsing.parser import Parser
+from variables import settings
+
+
+class GSFIndex(FolderIndex):
+    """
+    Persistent index of the GSF contents of every CombatLog
+
+    Stores for each file whether it contains GSF matches, along with
+    the amount of matches, the date of the file and the player name.
+    The entries only require a scan over the bytes of the file, the
+    match and spawn timings are taken from the LogIndex of a file when
+    it is opened. As in the FolderIndex, the entries
+    are keyed by the absolute path of the file together with its size
+    and modification time, so only new and modified files have to be
+    read to build the file list.
+
+    Entries are dictionaries with the keys:
+    - gsf: Whether the file contains GSF matches
+    - matches: Amount of GSF matches in the file
+    - date: Date of the file as by Parser.parse_filename
+    - player: Player name as by Parser.get_player_name_raw
+    """
+
+    VERSION = 2
+    FILE_NAME = "gsfindex.db"
+
+    _shared: "GSFIndex" = None
+
+    @classmethod
+    def get_shared(cls) -> ("GSFIndex", None):
+        """Return the shared GSFIndex if caching is enabled"""
+        if not settings["parsing"]["cache"]:
+            return None
+        if cls._shared is None:
+            cls._shared = cls()
+            cls._shared.load()
+        return cls._shared
+
+    @classmethod
+    def get_file_entry(cls, file_name: str) -> Dict[str, Any]:
+        """
+        Return the entry for a file from the shared index, or by
+        reading the file if caching is disabled
+        """
+        index = cls.get_shared()
+        if index is None:
+            return cls.scan_file(cls.get_path(file_name))
+        return index.get_entry(file_name)
+
+    @staticmethod
+    def get_path(file_name: str) -> str:
+        """Return the absolute path to a file in the CombatLogs folder"""
+        return os.path.abspath(os.path.join(settings["parsing"]["path"], file_name))
+
+    def get_entry(self, file_name: str) -> Dict[str, Any]:
+        """
+        Return the entry for a file, reading the file only if it is not
+        in the index in its current state
+        :param file_name: Name of or path to the CombatLog
+        """
+        path = GSFIndex.get_path(file_name)
+        entry = self.get(path)
+        if entry is None:
+            entry = GSFIndex.scan_file(path)
+            self.put(path, entry)
+        return entry
+
+    @staticmethod
+    def scan_file(path: str) -> Dict[str, Any]:
+        """Build the entry for a file by reading it"""
+        entry = {"gsf": Parser.read_gsf_in_file(path), "matches": 0, "date": Parser.parse_filename(path), "player": None}
+        if entry["gsf"] is False:
+            return entry
+        entry.update({"matches": Parser.read_match_count(path), "player": Parser.get_player_name_raw(path)})
+        return entry
@@ -0,0 +1,230 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from hashlib import sha1
+import mmap
+import os
+import _pickle as pickle
+from typing import Iterator, List, Tuple
+# Project Modules
+from parsing.archive import is_compressed, open_log
+from parsing.event import Event
+from parsing.parser import Parser
+from utils.directories import get_temp_directory
+
+
+class LogIndex(object):
+    """
+    Index of the byte offsets of the matches and spawns in a CombatLog
+
+    The index is built in a single sweep over a memory-mapped file, or
+    over the decompressed data of a compressed CombatLog, and stores
+    for every match and spawn the byte range of its lines and its start
+    and end time. The index is saved in the temporary
+    directory and reused for as long as the CombatLog is unchanged, so
+    that a single match or spawn can be read by decoding only its own
+    lines instead of the whole file. The indices of CombatLogs that
+    have been removed are deleted by prune.
+
+    The spawns are determined exactly as by Parser.stream_matches, so
+    read_spawn returns the same Events as are in the file cube.
+
+    Attributes:
+    - player_list: Player ID list of the whole file
+    - matches: (start, end) byte ranges of the matches
+    - spawns: (start, end) byte ranges of the spawns of each match
+    - match_timings: Start and end times of each match, flattened
+    - spawn_timings: List of spawn start times for each match
+    """
+
+    VERSION = 2
+    EXTENSION = ".idx"
+
+    def __init__(self, path: str):
+        """
+        :param path: Path to the CombatLog
+        """
+        self.path = path
+        self.key = LogIndex.get_key(path)
+        self.player_list: List[str] = list()
+        self.matches: List[Tuple[int, int]] = list()
+        self.spawns: List[List[Tuple[int, int]]] = list()
+        self.match_timings: list = list()
+        self.spawn_timings: list = list()
+
+    @classmethod
+    def open(cls, file_name: str, directory: str = None) -> "LogIndex":
+        """
+        Return the LogIndex of a CombatLog, loading it from the
+        temporary directory if it is still valid or building and
+        saving it if it is not
+        :param file_name: Name of or path to the CombatLog
+        :param directory: Directory to store the indices in
+        """
+        path = os.path.abspath(Parser.get_file_path(file_name))
+        if directory is None:
+            directory = os.path.join(get_temp_directory(), "logindex")
+        index_path = os.path.join(directory, sha1(path.encode()).hexdigest() + cls.EXTENSION)
+        index = cls.load(index_path, path)
+        if index is not None:
+            return index
+        index = cls(path)
+        index.build()
+        index.save(index_path)
+        return index
+
+    @classmethod
+    def prune(cls, directory: str = None):
+        """
+        Remove the indices of CombatLogs that no longer exist
+        :param directory: Directory the indices are stored in
+        """
+        if directory is None:
+            directory = os.path.join(get_temp_directory(), "logindex")
+        if not os.path.exists(directory):
+            return
+        for file_name in os.listdir(directory):
+            if not file_name.endswith(cls.EXTENSION):
+                continue
+            index_path = os.path.join(directory, file_name)
+            try:
+                with open(index_path, "rb") as fi:
+                    path = pickle.load(fi).get("path")
+            except (OSError, EOFError, AttributeError, pickle.UnpicklingError):
+                path = None
+            if path is not None and os.path.exists(path):
+                continue
+            try:
+                os.remove(index_path)
+            except OSError as e:
+                print("[LogIndex] Failed to remove {}: {}".format(index_path, e))
+
+    @staticmethod
+    def get_key(path: str) -> tuple:
+        """Return the (size, mtime) key of a CombatLog"""
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime
+
+    @classmethod
+    def load(cls, index_path: str, path: str) -> ("LogIndex", None):
+        """Load an index from a file if it is valid for the CombatLog"""
+        if not os.path.exists(index_path):
+            return None
+        try:
+            with open(index_path, "rb") as fi:
+                data = pickle.load(fi)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print("[LogIndex] Failed to load index for {}: {}".format(path, e))
+            return None
+        if data.get("version") != cls.VERSION or data.get("key") != cls.get_key(path):
+            return None
+        index = cls(path)
+        for attr in ("player_list", "matches", "spawns", "match_timings", "spawn_timings"):
+            setattr(index, attr, data[attr])
+        return index
+
+    def save(self, index_path: str):
+        """Save the index to a file"""
+        data = {"version": self.VERSION, "key": self.key, "path": self.path}
+        for attr in ("player_list", "matches", "spawns", "match_timings", "spawn_timings"):
+            data[attr] = getattr(self, attr)
+        temp = "{}.tmp".format(index_path)
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with open(temp, "wb") as fo:
+                pickle.dump(data, fo)
+            os.replace(temp, index_path)
+        except OSError as e:
+            print("[LogIndex] Failed to save index for {}: {}".format(self.path, e))
+
+    def build(self):
+        """Determine the byte ranges with a sweep over the file"""
+        self.player_list = Parser.read_player_id_list(self.path)
+        events, offsets = list(), dict()
+        for event, start, end in self.iterate(0, None):
+            # Match splitting as in Parser.stream_matches
+            if Parser.is_ignorable(event):
+                continue
+            if Parser.is_gsf_event(event):
+                events.append(event)
+                offsets[id(event)] = (start, end)
+                continue
+            if len(events) == 0:
+                continue
+            self.add_match(events, offsets, event["time"])
+            events, offsets = list(), dict()
+        # Handle EOF before match ended
+        if len(events) != 0:
+            self.add_match(events, offsets, events[-1]["time"])
+
+    def add_match(self, events: list, offsets: dict, end):
+        """Add the byte ranges and timings of a match to the index"""
+        match, _, (start, end), spawn_timings = Parser.split_match(events, end, self.player_list)
+        spawns = [(offsets[id(spawn[0])][0], offsets[id(spawn[-1])][1]) for spawn in match]
+        self.matches.append((spawns[0][0], spawns[-1][1]))
+        self.spawns.append(spawns)
+        self.match_timings.extend((start, end))
+        self.spawn_timings.append(spawn_timings)
+
+    def iterate(self, start: int, end: int = None) -> Iterator[Tuple[Event, int, int]]:
+        """
+        Generator of the Events in a byte range of the CombatLog, with
+        the same lines skipped as by Parser.stream_events
+        :param end: Byte offset to stop at, at the end of the file if None
+        :return: generator of (event, start, end) tuples
+        """
+        if is_compressed(self.path):
+            yield from self.iterate_compressed(start, end)
+            return
+        end = self.key[0] if end is None else end
+        if end <= start:
+            return
+        with open(self.path, "rb") as fi, mmap.mmap(fi.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            while start < end:
+                stop = data.find(b"\n", start, end)
+                stop = end if stop == -1 else stop + 1
+                try:
+                    line = data[start:stop].decode().strip()
+                except UnicodeDecodeError:
+                    line = None
+                if line is not None and "Invulnerable" not in line:
+                    yield Event(Parser.line_to_dictionary(line)), start, stop
+                start = stop
+
+    def iterate_compressed(self, start: int, end: int = None) -> Iterator[Tuple[Event, int, int]]:
+        """
+        Generator of the Events in a byte range of a compressed
+        CombatLog, see iterate. The offsets are those of the
+        decompressed data, which cannot be memory-mapped.
+        """
+        with open_log(self.path, start) as fi:
+            for line in fi:
+                if end is not None and start >= end:
+                    break
+                stop = start + len(line)
+                try:
+                    line = line.decode().strip()
+                except UnicodeDecodeError:
+                    line = None
+                if line is not None and "Invulnerable" not in line:
+                    yield Event(Parser.line_to_dictionary(line)), start, stop
+                start = stop
+
+    def read_range(self, start: int, end: int) -> List[Event]:
+        """Return the Events of the spawn or match lines in a byte range"""
+        return [event for event, _, _ in self.iterate(start, end) if not Parser.is_ignorable(event)]
+
+    def read_spawn(self, match: int, spawn: int) -> List[Event]:
+        """Return the Events of a single spawn"""
+        return self.read_range(*self.spawns[match][spawn])
+
+    def read_match(self, match: int) -> List[List[Event]]:
+        """Return the Events of a single match as a list of spawns"""
+        return [self.read_range(start, end) for start, end in self.spawns[match]]
+
+    def __len__(self) -> int:
+        return len(self.matches)
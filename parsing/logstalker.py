@@ -7,6 +7,7 @@ Copyright (C) 2016-2018 RedFantom
 from datetime import datetime
 import os
 from parsing.parser import Parser
+from utils import instruments
 import variables
 
 
@@ -79,6 +80,7 @@ class LogStalker(object):
         print("[LogStalker] Last line is not a match event")
         self._read_so_far = len(lines)
 
+    @instruments.timed("logstalker.get_new_lines")
     def get_new_lines(self):
         """Read the new lines in the file and return them as a list"""
         self.update_file()
@@ -87,6 +89,7 @@ class LogStalker(object):
         self._read_so_far += len(dictionaries)
         if None in dictionaries:
             raise ValueError()
+        instruments.count("logstalker.lines", len(dictionaries))
         return dictionaries
 
     @staticmethod
@@ -102,10 +105,12 @@ class LogStalker(object):
             try:
                 line = line.decode()
             except UnicodeDecodeError:
+                instruments.count("logstalker.undecodable")
                 continue
             try:
                 line = Parser.line_to_dictionary(line)
             except Exception as e:
+                instruments.count("logstalker.errors")
                 print("[LogStalker] '{}' encountered while parsing '{}'".format(e, line))
                 variables.raven.captureException()
                 continue
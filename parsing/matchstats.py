@@ -4,43 +4,53 @@ Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
 License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
+from parsing.entities import EntityRegistry
+from parsing.eventtable import EventTable
+from parsing.fileanalyzer import FileAnalyzer
 from parsing.parser import Parser
+from parsing.reactiontime import ReactionTimes
+from parsing.timebase import seconds_between
 
 
-def match_statistics(file_name, match, match_timing, sharing_db=None):
+def match_statistics(file_name, match, match_timing):
     """Return a formatted string with all the statistics for a match"""
-    lines = Parser.read_file(file_name, sharing_db)
-    name = Parser.get_player_name(lines)
-    id_list = Parser.get_player_id_list(lines)
-
-    (abilities_dict, dmg_d, dmg_t, dmg_s, healing, hitcount, critcount,
-     crit_luck, enemies, enemy_dmg_d, enemy_dmg_t, ships, uncounted) = \
-        Parser.parse_match(match, id_list)
-    # Calculate other statistics
-    killsassists = sum(True if enemy_dmg_t[enemy] > 0 else False for enemy in enemies if enemy in enemy_dmg_t)
+    analyzer = FileAnalyzer.open(file_name)
+    name, id_list = analyzer.player_name, analyzer.player_list
+    index = analyzer.find_match(match_timing)
+    if index is not None and analyzer.file_cube[index] is match:
+        stats, entities = analyzer.parse_match(index), analyzer.get_entities(index)
+    else:
+        table = EventTable.from_cube([match], list(), list(), id_list)
+        stats, entities = Parser.parse_match(table, id_list), EntityRegistry.from_table(table)
+    # Sums and enemy damage are slices of the damage matrix
+    totals = entities.get_statistics()
+    enemy_dmg_d, enemy_dmg_t = entities.get_enemy_damage()
+    dmg_d, dmg_t, hitcount, critcount = totals["dmg_d"], totals["dmg_t"], totals["hitcount"], totals["critcount"]
 
     start = match_timing
     finish = Parser.line_to_dictionary(match[-1][-1])["time"]
-    delta = finish - start
-    minutes, seconds = divmod(delta.total_seconds(), 60)
+    duration = seconds_between(start, finish)
+    minutes, seconds = divmod(duration, 60)
 
     stat_string = "{name}\n{enemies} enemies\n{dmg_d}\n{dmg_t}\n{dmg_r:.1f} : 1.0\n" \
                   "{dmg_s}\n{healing}\n{hitcount}\n{critcount}\n{crit_luck:.2f}\n" \
-                  "{deaths}\n{minutes}:{seconds:.0f}\n{dps:.1f}"
+                  "{deaths}\n{minutes}:{seconds:.0f}\n{dps:.1f}\n{reaction}"
     stat_string = stat_string.format(
         name=name,
-        enemies=killsassists,
+        enemies=entities.killsassists,
         dmg_d=dmg_d,
         dmg_t=dmg_t,
         dmg_r=dmg_d / dmg_t if dmg_t != 0 else 0,
-        dmg_s=dmg_s,
-        healing=healing,
+        dmg_s=totals["dmg_s"],
+        healing=totals["healing"],
         hitcount=hitcount,
         critcount=critcount,
         crit_luck=critcount / hitcount if hitcount != 0 else 0,
         deaths=len(match) - 1,
         minutes=minutes,
         seconds=seconds,
-        dps=dmg_d / delta.total_seconds() if delta.total_seconds() != 0 else 0
+        dps=dmg_d / duration if duration != 0 else 0,
+        reaction=ReactionTimes.format_percentiles(ReactionTimes.for_match(match, name)[1]),
     )
-    return abilities_dict, stat_string, ships, enemies, enemy_dmg_d, enemy_dmg_t, uncounted
+    return (stats.abilities, stat_string, stats.ships, entities.enemy_ids, enemy_dmg_d,
+            enemy_dmg_t, stats.uncounted)
@@ -0,0 +1,127 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Dict, Hashable
+# Project Modules
+from variables import settings
+
+
+class MemoryCache(object):
+    """
+    In-process least recently used cache with a budget in bytes
+
+    Instead of limiting the amount of entries, every entry has a size
+    in bytes and the least recently used entries are evicted when the
+    total size of all entries exceeds the budget. Entries that are
+    larger than the whole budget are not stored at all.
+
+    The amount of hits, misses and evictions are counted so that the
+    budget can be tuned.
+    """
+
+    def __init__(self, budget: int = None):
+        """
+        :param budget: Budget in bytes, defaults to the
+            memory_cache_size setting in megabytes
+        """
+        self._budget = budget
+        self._entries: Dict[Hashable, tuple] = OrderedDict()
+        self._lock = RLock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def budget(self) -> int:
+        """Budget of the cache in bytes"""
+        if self._budget is not None:
+            return self._budget
+        return int(settings["parsing"]["memory_cache_size"] * 1024 * 1024)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for a key, counting a hit or miss"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any, size: int):
+        """
+        Store a value in the cache
+        :param key: Key to store the value under
+        :param value: Value to store
+        :param size: Estimated size of the value in bytes
+        """
+        with self._lock:
+            self.discard(key)
+            if size > self.budget:
+                return
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.budget:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], sizeof: Callable[[Any], int]) -> Any:
+        """
+        Return the value for a key, loading and storing it if required
+        :param key: Key of the value
+        :param loader: Callable that returns the value
+        :param sizeof: Callable that returns the size of a value
+        """
+        marker = object()
+        value = self.get(key, marker)
+        if value is not marker:
+            return value
+        # The lock is not held while loading, so loading multiple
+        # values simultaneously from different threads is possible
+        value = loader()
+        self.put(key, value, sizeof(value))
+        return value
+
+    def discard(self, key: Hashable):
+        """Remove an entry from the cache if it exists"""
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = self.evictions = 0
+
+    def statistics(self) -> Dict[str, Any]:
+        """Return a dictionary with the counters of the cache"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size": self.size,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / requests if requests != 0 else 0.0,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Cache shared by the results frames and statistics functions
+memory_cache = MemoryCache()
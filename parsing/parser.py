@@ -8,6 +8,14 @@ import os
 from typing import *
 from datetime import datetime, timedelta
 from data import abilities, effects, durations
+from parsing import tokenizer
+from parsing.accumulator import SpawnStats
+from parsing.archive import open_log, strip_extension
+from parsing.event import Event
+from parsing.eventtable import EventTable
+from parsing.shipdetect import ShipDetector
+from parsing.timebase import elapsed, get_milliseconds
+from utils import instruments
 from variables import settings, colors
 
 
@@ -36,11 +44,16 @@ class Parser(object):
     LINE_EFFECT = "effect"
 
     IGNORABLE = ("SetLevel", "Infection")
+    # Fields of an event that contain names, see Parser.has_name
+    NAME_FIELDS = ("source", "target", "ability", "effect")
 
     # Date format
     TIME_FORMAT = "%H:%M:%S.%f"
     DATE_FORMAT = ""
 
+    # Line tokenizer engine: "fast" or "legacy"
+    TOKENIZER = settings["parsing"]["tokenizer"]
+
     @staticmethod
     def line_to_dictionary(line: str, enemies: dict=None) -> Dict[str, Any]:
         """
@@ -49,7 +62,23 @@ class Parser(object):
         :param enemies: Dictionary with enemies, optional
         :return: dictionary for line, or None if failed
         """
-        if isinstance(line, dict):
+        if isinstance(line, (dict, Event)):
+            return line
+        if Parser.TOKENIZER == "fast":
+            log = tokenizer.tokenize_line(line, enemies)
+            if log is not None:
+                return log
+        return Parser.line_to_dictionary_legacy(line, enemies)
+
+    @staticmethod
+    def line_to_dictionary_legacy(line: str, enemies: dict=None) -> Dict[str, Any]:
+        """
+        Turn a line into a dictionary by splitting it into elements
+
+        Reference implementation for the fast tokenizer, which falls
+        back to this function for lines it does not support.
+        """
+        if isinstance(line, (dict, Event)):
             return line
 
         # Split the line into elements
@@ -80,7 +109,7 @@ class Parser(object):
             "target": log["target"],
             "effect_id": effect_id
         })
-        if log["target"] == log["source"] and log["ability"] in abilities.secondaries:
+        if log["target"] == log["source"] and log["ability"] in abilities.SECONDARIES:
             log["target"] = "Launch Projectile"
         if log["ability"].strip() == "":
             log["ability"] = "Railgun Charge"
@@ -98,7 +127,7 @@ class Parser(object):
         return log
 
     @staticmethod
-    def line_to_event_dictionary(line, active_id, lines):
+    def line_to_event_dictionary(line, active_id, lines, index: int = None):
         """
         Turn a line into a dictionary that makes it suitable for all
         sorts of operations, including adding an effect to the event and
@@ -116,24 +145,34 @@ class Parser(object):
             "color": color for this type of event,
             "active_id": id that was activate when this ability was fired
         }
+        For all the lines of a spawn, use EffectsResolver instead.
+        :param index: Index of line in lines, determined if not given
         """
         # Get the base dictionary
-        if isinstance(line, dict) and "color" in line:
+        if isinstance(line, (dict, Event)) and "color" in line:
             return line
-        line_dict = line if isinstance(line, dict) else Parser.line_to_dictionary(line)
+        line_dict = line if isinstance(line, (dict, Event)) else Parser.line_to_dictionary(line)
+        effects = Parser.get_effects_ability(line_dict, lines, active_id, index)
+        if effects is False:
+            return None
+        return Parser.build_event_dictionary(line_dict, active_id, effects)
+
+    @staticmethod
+    def build_event_dictionary(line_dict: dict, active_id: (list, str), effects: (dict, None)) -> dict:
+        """
+        Add the type, color, effects and active_id items to a line
+        dictionary, see line_to_event_dictionary
+        """
         # Determine line type
-        if "Damage" in line["effect"] or "Heal" in line["effect"]:
+        if "Damage" in line_dict["effect"] or "Heal" in line_dict["effect"]:
             line_type = Parser.LINE_NUMBER
-        elif "AbilityActivate" in line["effect"]:
+        elif "AbilityActivate" in line_dict["effect"]:
             line_type = Parser.LINE_ABILITY
         else:
             line_type = Parser.LINE_EFFECT
         # Get the right text color
         color = Parser.get_event_color(line_dict, active_id)
         # Create the dictionary with additional items
-        effects = Parser.get_effects_ability(line_dict, lines, active_id)
-        if effects is False:
-            return None
         additional = {
             "effects": effects,
             "type": line_type,
@@ -149,7 +188,7 @@ class Parser(object):
         """Get the abilities dict for a list of lines"""
         abilities = {}
         for line in lines:
-            if not isinstance(line, dict):
+            if not isinstance(line, (dict, Event)):
                 line = Parser.line_to_dictionary(line)
             if not Parser.compare_ids(line["source"], player_list):
                 continue
@@ -160,65 +199,85 @@ class Parser(object):
         return abilities
 
     @staticmethod
-    def get_effects_ability(line_dict, lines, active_id):
+    def get_effects_ability(line_dict, lines, active_id, index: int = None):
         """
         Parse the lines after an event to determine what events are effects of the event specified
         :param line_dict: line dictionary
         :param lines: lines
         :param active_id: argument for Parser.compare_ids
+        :param index: Index of line_dict in lines, determined if not given
         :return: dict with events or None or False if not eligible for having effects
         """
-        eligibility = Parser.get_effects_eligible(line_dict, lines, active_id)
+        index = lines.index(line_dict) if index is None else index
+        eligibility = Parser.get_effects_eligible(line_dict, lines, active_id, index)
         if eligibility is False or eligibility is None:
             return eligibility
-        ability = line_dict["ability"]
         ability_effects = {}
-        effects_list = effects.ability_to_effects[ability]
-        ability_duration = durations.durations[ability]
-        for event in lines[lines.index(line_dict):]:
-            if (event["time"] - line_dict["time"]).total_seconds() > ability_duration[1] + 5:
+        for event in lines[index:]:
+            if Parser.add_ability_effect(ability_effects, line_dict, event) is False:
                 break
-            try:
-                effect = event["effect"].split(":")[1].split("{")[0].strip()
-            except IndexError:
-                effect = event["effect"]
-            if "RemoveEffect" in event["effect"] and effect in ability_effects:
-                time_diff = (event["time"] - ability_effects[effect]["start"]["time"]).total_seconds()
-                ability_effects[effect]["duration"] = time_diff
-            if effect not in effects_list or line_dict["source"] != event["source"]:
-                continue
-            if event["ability"] != ability:
-                continue
-            if effect not in ability_effects:
-                ability_effects[effect] = {
-                    "name": effect,
-                    "start": event,
-                    "allied": durations.durations[ability][0] if effect != "Missile Lock Immunity" else True,
-                    "count": 1,
-                    "duration": 0,
-                    "damage": int(event["amount"].replace("*", "")) if isinstance(event["amount"], str) and event[
-                        "amount"] != "" else "",
-                    "dot": (event["time"] - line_dict["time"]).total_seconds() if ability_duration[2] is True else None
-                }
-            else:
-                ability_effects[effect]["count"] += 1
-                if effect == "Damage":
-                    ability_effects[effect]["damage"] += int(event["amount"].replace("*", ""))
-                    if ability_effects[effect]["dot"] is not None:
-                        ability_effects[effect]["dot"] = (event["time"] - line_dict["time"]).total_seconds()
         return ability_effects
 
     @staticmethod
-    def get_effects_eligible(line_dict, lines, active_id):
+    def add_ability_effect(ability_effects: dict, line_dict: dict, event: dict, time_diff: int = None) -> bool:
+        """
+        Add an event to the effects of an eligible ability event
+        :param ability_effects: effects dictionary of the ability event
+        :param line_dict: line dictionary of the ability event
+        :param event: line dictionary of an event at or after line_dict
+        :param time_diff: milliseconds between line_dict and event,
+            determined if not given
+        :return: False if the event is beyond the duration of the
+            ability, so no later events can be effects either
+        """
+        ability = line_dict["ability"]
+        ability_duration = durations.durations[ability]
+        if time_diff is None:
+            time_diff = elapsed(get_milliseconds(line_dict), get_milliseconds(event))
+        if time_diff > (ability_duration[1] + 5) * 1000:
+            return False
+        try:
+            effect = event["effect"].split(":")[1].split("{")[0].strip()
+        except IndexError:
+            effect = event["effect"]
+        if "RemoveEffect" in event["effect"] and effect in ability_effects:
+            start = get_milliseconds(ability_effects[effect]["start"])
+            ability_effects[effect]["duration"] = elapsed(start, get_milliseconds(event)) / 1000
+        if effect not in effects.ability_to_effects[ability] or line_dict["source"] != event["source"]:
+            return True
+        if event["ability"] != ability:
+            return True
+        if effect not in ability_effects:
+            ability_effects[effect] = {
+                "name": effect,
+                "start": event,
+                "allied": durations.durations[ability][0] if effect != "Missile Lock Immunity" else True,
+                "count": 1,
+                "duration": 0,
+                "damage": int(event["amount"].replace("*", "")) if isinstance(event["amount"], str) and event[
+                    "amount"] != "" else "",
+                "dot": time_diff / 1000 if ability_duration[2] is True else None
+            }
+        else:
+            ability_effects[effect]["count"] += 1
+            if effect == "Damage":
+                ability_effects[effect]["damage"] += int(event["amount"].replace("*", ""))
+                if ability_effects[effect]["dot"] is not None:
+                    ability_effects[effect]["dot"] = time_diff / 1000
+        return True
+
+    @staticmethod
+    def get_effects_eligible(line_dict, lines, active_id, index: int = None):
         """
         Determine whether or not this event is eligible for having
         events. Only abilities that are applied to more than a single
         target or that are applied for a certain time are eligible by
         default. A special exclusion is set up for the activation of
         secondary weapons (launching projectiles)
+        :param index: Index of line_dict in lines, determined if not given
         """
         # Exclusion for launching projectiles, only hits have effects
-        if line_dict["ability"] in abilities.secondaries and "AbilityActivate" in line_dict["effect"]:
+        if line_dict["ability"] in abilities.SECONDARIES and "AbilityActivate" in line_dict["effect"]:
             return False
         # Exclusion for any event that is not in the durations dictionary (and thus either is not applied to multiple
         # targets or does apply an effect over time or is not included for some other reason)
@@ -226,7 +285,7 @@ class Parser(object):
         if ability not in effects.ability_to_effects or ability not in durations.durations:
             return None
         # The previous line is used in determining whether
-        index = lines.index(line_dict)
+        index = lines.index(line_dict) if index is None else index
         if index == 0:
             return None
         # The requirements for being eligible are quite strict
@@ -234,12 +293,12 @@ class Parser(object):
             # The source of the previous event must be equal
             source_is_equal = prev_line["source"] == line_dict["source"]
             ability_is_equal = prev_line["ability"] == line_dict["ability"]
-            ability_is_special = any(special in line_dict["line"] for special in durations.special_cases)
-            time_diff = (line_dict["time"] - prev_line["time"]).total_seconds()
+            ability_is_special = Parser.has_name(line_dict, durations.special_cases)
             source_is_player = Parser.compare_ids(prev_line["source"], active_id)
             if source_is_equal and ability_is_equal and not ability_is_special:
                 return False
-            if ability_is_special and source_is_player and time_diff < 15 and ability_is_equal:
+            if ability_is_special and source_is_player and ability_is_equal and \
+                    elapsed(get_milliseconds(prev_line), get_milliseconds(line_dict)) < 15000:
                 return False
         return True
 
@@ -265,6 +324,20 @@ class Parser(object):
         """
         if "category" in line_dict and line_dict["category"] is not None:
             return line_dict["category"]
+        ctg = Parser.determine_event_category(line_dict, active_id)
+        line_dict["category"] = ctg
+        return ctg
+
+    @staticmethod
+    def determine_event_category(line_dict: dict, active_id: (list, str)):
+        """
+        Determine the category of an event like get_event_category,
+        without storing it in the line dictionary, for events that are
+        shared, as the Events of a FileAnalyzer
+        :param line_dict: line dictionary
+        :param active_id: active ID for the log or list of IDs
+        :return: str category
+        """
         if "custom" in line_dict and line_dict["custom"] is True:
             return "death"
         elif "icon" in line_dict:
@@ -273,6 +346,8 @@ class Parser(object):
             return "other"
         # Ability string, stripped and formatted to be compatible with the data structures
         ability = line_dict['ability'].split(' {', 1)[0].strip()
+        # Category of the ability in the ability index, None if not a component
+        category = abilities.ABILITIES.get(ability, (None,))[0]
         # If the ability is empty, this is a Gunship scope activation
         if ability == "":
             ctg = "other"
@@ -285,13 +360,13 @@ class Parser(object):
                     ctg = "selfdmg"
                 # Damage taken
                 else:
-                    if ability in abilities.secondaries:
+                    if category == "secondaries":
                         ctg = "dmgt_sec"
                     else:
                         ctg = "dmgt_pri"
             # Damage dealt
             else:
-                if ability in abilities.secondaries:
+                if category == "secondaries":
                     ctg = "dmgd_sec"
                 else:
                     ctg = "dmgd_pri"
@@ -305,13 +380,13 @@ class Parser(object):
                 ctg = "healing"
         # AbilityActivate
         elif "AbilityActivate" in line_dict['effect']:
-            if line_dict["ability"] in abilities.engines:
+            if category == "engines":
                 ctg = "engine"
-            elif line_dict["ability"] in abilities.shields:
+            elif category == "shields":
                 ctg = "shield"
-            elif line_dict["ability"] in abilities.systems:
+            elif category == "systems":
                 ctg = "system"
-            elif line_dict["ability"] in ("Player Death", "Game End"):
+            elif ability in abilities.DEATHS:
                 ctg = "death"
             else:
                 ctg = "other"
@@ -320,7 +395,6 @@ class Parser(object):
         else:
             print("[Parser] Failed to determine category of: {}".format(line_dict))
             ctg = "other"
-        line_dict["category"] = ctg
         return ctg
 
     @staticmethod
@@ -369,17 +443,44 @@ class Parser(object):
     @staticmethod
     def get_player_id_list(lines):
         """Get a list of player ID numbers for a certain list of lines"""
-        if not isinstance(lines[0], dict):
+        if not isinstance(lines[0], (dict, Event)):
             lines = [Parser.line_to_dictionary(line) for line in lines]
         player_list = []
         for line in lines:
-            if "custom" in line or "@" in line["line"]:
+            if "custom" in line or "@" in line["source"] or "@" in line["target"]:
                 continue
             dictionary = Parser.line_to_dictionary(line)
             if dictionary["source"] == dictionary["target"] and dictionary["source"] not in player_list:
                 player_list.append(dictionary["source"])
         return player_list
 
+    @staticmethod
+    def read_player_id_list(file_name: str) -> List[str]:
+        """
+        Get the player ID list of a CombatLog, equal to that of
+        Parser.get_player_id_list for the lines of Parser.read_file,
+        from the line text without converting the lines into Events
+        """
+        def strip(element: str) -> str:
+            # As remove_brackets in line_to_dictionary_legacy
+            return element.replace("[", "").replace("(", "").replace(")", "").strip()
+
+        player_list = list()
+        for line in Parser.stream_lines(file_name):
+            if "Invulnerable" in line:
+                continue
+            elements = line.split("]")
+            if len(elements) < 3:
+                continue
+            source = strip(elements[1])
+            if "@" in source or source != strip(elements[2]) or source in player_list:
+                continue
+            # The target of secondary weapons is renamed to Launch Projectile
+            if len(elements) == 6 and strip(elements[3]).split("{", 1)[0].strip() in abilities.SECONDARIES:
+                continue
+            player_list.append(source)
+        return player_list
+
     @staticmethod
     def get_player_name(lines: list):
         """Get the character name for a set of lines"""
@@ -396,8 +497,8 @@ class Parser(object):
         """Return the player name from the raw lines"""
         if not os.path.exists(file):
             file = os.path.join(settings["parsing"]["path"], file)
-        with open(file) as fi:
-            line = fi.readline()
+        with open_log(file) as fi:
+            line = fi.readline().decode()
         lines = [Parser.line_to_dictionary(line)]
         return Parser.get_player_name(lines)
 
@@ -436,22 +537,28 @@ class Parser(object):
         Get a list containing the possible ships for a certain
         abilities dictionary
         """
-        ships_list = abilities.ships
-        proper_list = ships_list.copy()
-        for ability in abilities_dict.keys():
-            if ability not in abilities.components or ability in abilities.excluded_abilities:
-                continue
-            temp_list = proper_list.copy()
-            for ship in temp_list:
-                if ability not in abilities.ships_abilities[ship]:
-                    proper_list.remove(ship)
-        return proper_list
+        detector = ShipDetector(components_only=True)
+        detector.update(abilities_dict.keys())
+        return detector.candidates
 
     @staticmethod
     def get_gsf_in_file(file_name):
-        """Get a boolean of whether there are GSF matches in a file"""
+        """
+        Get a boolean of whether there are GSF matches in a file, from
+        the GSFIndex if the file is indexed in its current state
+        """
+        from parsing.gsfindex import GSFIndex
+        index = GSFIndex.get_shared()
+        entry = index.get(GSFIndex.get_path(file_name)) if index is not None else None
+        if entry is not None:
+            return entry["gsf"]
+        return Parser.read_gsf_in_file(file_name)
+
+    @staticmethod
+    def read_gsf_in_file(file_name):
+        """Get a boolean of whether there are GSF matches in a file by reading it"""
         path = os.path.join(settings["parsing"]["path"], file_name)
-        with open(path, "rb") as fi:
+        with open_log(path) as fi:
             for line in fi:
                 if b"@" not in line:
                     return True
@@ -459,14 +566,15 @@ class Parser(object):
 
     @staticmethod
     def parse_filename(file_name):
-        """Get datetime object for a filename"""
-        file_name = os.path.basename(file_name)
+        """Get datetime object for a filename, which may be compressed"""
+        file_name = strip_extension(os.path.basename(file_name))
         try:
             return datetime.strptime(file_name[:-10], "combat_%Y-%m-%d_%H_%M_%S_")
         except ValueError:
             return None
 
     @staticmethod
+    @instruments.timed("parser.split_combatlog")
     def split_combatlog(lines: list, player_list: list):
         """
         Split a CombatLog containing GSF matches into a file cube (with
@@ -489,10 +597,10 @@ class Parser(object):
         # Loop over all the lines in the file and split
         for line in lines:
             # See print at checking argument
-            if not isinstance(line, dict):
+            if not isinstance(line, (dict, Event)):
                 line = Parser.line_to_dictionary(line)
             # Skip over SetLevel and Infection abilities, see issue #47
-            if "SetLevel" in line["line"] or "Infection" in line["line"]:
+            if Parser.is_ignorable(line):
                 continue
             # Get the required data from the line
             time, source, target = line["time"], line["source"], line["target"]
@@ -550,310 +658,242 @@ class Parser(object):
         return file_cube, match_timings, spawn_timings
 
     @staticmethod
-    def read_file(file_name: str, sharing_db: dict=None) -> List[Dict[str, Any]]:
+    @instruments.timed("parser.read_file")
+    def read_file(file_name: str, sharing_db: dict=None) -> List[Event]:
         """
         Read a file with the given filename in a safe and error handled
         manner. All attempts at reading GSF CombatLogs should use this
-        function.
+        function. Returns compact Event records instead of line
+        dictionaries to limit memory usage for large files.
         """
-        lines = Parser.read_file_raw(file_name)
-        enemies = sharing_db[file_name]["enemies"] if sharing_db is not None and file_name in sharing_db else None
-        return [Parser.line_to_dictionary(line, enemies) for line in lines if "Invulnerable" not in line]
+        lines = list(Parser.stream_events(file_name, sharing_db))
+        instruments.count("parser.lines", len(lines))
+        return lines
+
+    @staticmethod
+    def read_event_table(file_name: str, sharing_db: dict=None) -> EventTable:
+        """
+        Read a file into an EventTable, which supports vectorised
+        calculation of statistics with parse_spawn, parse_match and
+        parse_file
+        """
+        lines = Parser.read_file(file_name, sharing_db)
+        return EventTable.from_lines(lines, Parser.get_player_id_list(lines))
 
     @staticmethod
     def read_file_raw(file_name) -> List[str]:
         """Safely read the contents of a CombatLog"""
-        # If the file does not exist in CWD, then attempt to find it in
-        # the CombatLogs folder
+        return list(Parser.stream_lines(file_name))
+
+    @staticmethod
+    def get_file_path(file_name: str) -> str:
+        """
+        Return the path to a CombatLog. If the file does not exist in
+        CWD, then attempt to find it in the CombatLogs folder.
+        """
         if not os.path.exists(file_name):
             file_name = os.path.join(settings["parsing"]["path"], os.path.basename(file_name))
         if not os.path.exists(file_name):
             raise FileNotFoundError("File '{}' not found in absolute path, cwd or CombatLogs folder".format(file_name))
+        return file_name
+
+    @staticmethod
+    def stream_lines(file_name, start: int = 0, end: int = None) -> Iterator[str]:
+        """
+        Generator of the decoded lines of a CombatLog. Lines are read
+        one at a time instead of reading the whole file into memory.
+        Compressed CombatLogs are decompressed while reading.
+        :param start: Byte offset of the first line to read
+        :param end: Byte offset at which to stop reading, at the end
+            of the file if None. Lines that start before end are read.
+        """
         # Attempt to read the file as bytes
-        with open(file_name, "rb") as fi:
-            lines = fi.readlines()
-        lines_decoded = []
-        # Convert each line into str (utf-8) separately
-        for index, line in enumerate(lines):
-            try:
-                line = line.decode().strip()
-            except UnicodeDecodeError:  # Mostly occurs on Unix systems
+        with open_log(Parser.get_file_path(file_name), start) as fi:
+            # Convert each line into str (utf-8) separately
+            for line in fi:
+                if end is not None:
+                    if start >= end:
+                        break
+                    start += len(line)
+                try:
+                    yield line.decode().strip()
+                except UnicodeDecodeError:  # Mostly occurs on Unix systems
+                    continue
+
+    @staticmethod
+    def stream_events(file_name: str, sharing_db: dict=None, start: int = 0, end: int = None) -> Iterator[Event]:
+        """Generator of the Events of the lines of a CombatLog, see stream_lines"""
+        enemies = sharing_db[file_name]["enemies"] if sharing_db is not None and file_name in sharing_db else None
+        for line in Parser.stream_lines(file_name, start, end):
+            if "Invulnerable" in line:
                 continue
-            lines_decoded.append(line)
-        return lines_decoded
+            yield Event(Parser.line_to_dictionary(line, enemies))
+
+    @staticmethod
+    def stream_matches(file_name: str, sharing_db: dict=None, start: int = 0, end: int = None,
+                       player_list: List[str] = None) -> Iterator[tuple]:
+        """
+        Generator of the GSF matches in a CombatLog
+
+        Each match is yielded as soon as the line that ends it is read,
+        so only the events of the current match are kept in memory. The
+        matches are split with the player ID list of the whole file, as
+        by split_combatlog, because a player ID may only be recognized
+        in another match than the one it occurs in.
+
+        :param start: Byte offset to start reading at, see stream_lines
+        :param end: Byte offset to stop reading at, see stream_lines
+        :param player_list: Player ID list of the whole file, read with
+            read_player_id_list if not given, also for a byte range
+        :return: generator of (match, player_list, match_timing,
+            spawn_timings) tuples, with match a list of spawns like in
+            the file cube of split_combatlog, match_timing a (start,
+            end) tuple and spawn_timings a list of spawn start times
+        """
+        if player_list is None:
+            player_list = Parser.read_player_id_list(file_name)
+        events = list()
+        for event in Parser.stream_events(file_name, sharing_db, start, end):
+            if Parser.is_ignorable(event):
+                continue
+            if Parser.is_gsf_event(event):
+                events.append(event)
+                continue
+            if len(events) == 0:
+                continue
+            yield Parser.split_match(events, event["time"], player_list)
+            events = list()
+        # Handle EOF before match ended
+        if len(events) != 0:
+            yield Parser.split_match(events, events[-1]["time"], player_list)
+
+    @staticmethod
+    def read_matches(file_name: str, sharing_db: dict = None) -> List[tuple]:
+        """
+        Return the GSF matches in a CombatLog like stream_matches, but
+        determine the player ID list in the same sweep over the file
+        instead of reading the file twice. The events of all matches
+        are kept in memory until the sweep is done, so stream_matches
+        is more suitable for large files.
+        """
+        player_list, matches, events = list(), list(), list()
+        for event in Parser.stream_events(file_name, sharing_db):
+            source, target = event["source"], event["target"]
+            # Player IDs as in Parser.get_player_id_list
+            if "@" not in source and "@" not in target and source == target and source not in player_list:
+                player_list.append(source)
+            if Parser.is_ignorable(event):
+                continue
+            if Parser.is_gsf_event(event):
+                events.append(event)
+                continue
+            if len(events) == 0:
+                continue
+            matches.append((events, event["time"]))
+            events = list()
+        # Handle EOF before match ended
+        if len(events) != 0:
+            matches.append((events, events[-1]["time"]))
+        return [Parser.split_match(events, end, player_list) for events, end in matches]
+
+    @staticmethod
+    def split_match(events: list, end: datetime, player_list: List[str]) -> tuple:
+        """
+        Split the events of a single match into spawns
+        :param events: All events of the match, without the line that
+            ends the match
+        :param end: Time the match ended
+        :param player_list: Player ID list of the whole file
+        :return: match, player_list, match_timing, spawn_timings
+        """
+        file_cube, match_timings, spawn_timings = Parser.split_combatlog(events, player_list)
+        return file_cube[0], player_list, (match_timings[0], end), spawn_timings[0]
 
     @staticmethod
     def count_matches(file_name) -> int:
-        """Count the amount of matches in a crude but faster manner"""
-        lines = Parser.read_file_raw(file_name)
+        """
+        Count the amount of matches, from the GSFIndex if the file is
+        indexed in its current state
+        """
+        from parsing.gsfindex import GSFIndex
+        index = GSFIndex.get_shared()
+        entry = index.get(GSFIndex.get_path(file_name)) if index is not None else None
+        if entry is not None:
+            return entry["matches"]
+        return Parser.read_match_count(file_name)
+
+    @staticmethod
+    def read_match_count(file_name) -> int:
+        """
+        Count the amount of matches in a crude but faster manner, by
+        reading the lines as bytes without parsing them
+        """
+        path = os.path.join(settings["parsing"]["path"], file_name)
         match, n = False, 0
-        for line in lines:
-            if match is True and "@" in line:
-                match = False
-                n += 1
-            elif "@" not in line:
-                match = True
+        with open_log(path) as fi:
+            for line in fi:
+                if match is True and b"@" in line:
+                    match = False
+                    n += 1
+                elif b"@" not in line:
+                    match = True
         return n
 
     @staticmethod
+    @instruments.timed("parser.parse_spawn")
     def parse_spawn(spawn: list, player_list: list):
         """
         Parse a spawn list of lines and return various statistics for
         this spawn with the same interface as parse.parse_spawn()
         """
-        if not isinstance(spawn[0], dict):
+        if isinstance(spawn, EventTable):
+            return spawn.parse_spawn()
+        if not isinstance(spawn[0], (dict, Event)):
             print("[Parser] Unoptimized results of spawn")
-        # Data variables
-        abilities_dict = {}
-        dmg_d, dmg_t, dmg_s, healing = 0, 0, 0, 0
-        enemies = []
-        enemy_dmg_d, enemy_dmg_t = {}, {}
-        hitcount, critcount = 0, 0
-        # Parse the spawn
-        for event in spawn:
-            # See arg check
-            if not isinstance(event, dict):
-                event = Parser.line_to_dictionary(event)
-            # Get the data into locals
-            time, source, target = event["time"], event["source"], event["target"]
-            ability, effect, amount = event["ability"], event["effect"], event["damage"]
-            # If source is empty, then rename source to ability
-            if source == "":
-                source = ability
-            # Count ability usage. Note that self-targeted Damage abilities are skipped
-            if source in player_list and "AbilityActivate" in effect and not (source == target and "Damage" in effect):
-                if ability not in abilities_dict:
-                    abilities_dict[ability] = 0
-                abilities_dict[ability] += 1
-            # Process enemy ID
-            for id in [source, target]:
-                if id in player_list or id in enemies:
-                    continue
-                enemies.append(id)
-            # Process damage
-            if "Damage" in effect:
-                # Self damage
-                if source == target:
-                    dmg_s += amount
-                # Damage dealt
-                elif source in player_list:
-                    dmg_d += amount
-                    # Process hit
-                    hitcount += 1
-                    critcount += event["crit"]
-                    # Process enemy
-                    if target not in enemy_dmg_t:
-                        enemy_dmg_t[target] = 0
-                    enemy_dmg_t[target] += amount
-                    # Also add to the other dictionary
-                    if target not in enemy_dmg_d:
-                        enemy_dmg_d[source] = 0
-                # Damage taken
-                else:
-                    dmg_t += amount
-                    # Process enemy
-                    if source not in enemy_dmg_d:
-                        enemy_dmg_d[source] = 0
-                    enemy_dmg_d[source] += amount
-                    # Also add to the other dicionary
-                    if source not in enemy_dmg_t:
-                        enemy_dmg_t[source] = 0
-            # Process healing
-            elif "Healing" in effect:  # Damage and Healing are not in the same effect
-                # Healing given is not supported currently, see #25
-                if target not in player_list:
-                    continue
-                healing += amount
-            # Other types of events are not currently supported
-            continue
-        # Determine the ship used
-        ships_list = abilities.ships.copy()
-        # This list keeps track of the secondary weapons. If there are two, it might
-        # be possible to eliminate more ships after results all abilities
-        primaries, secondaries = [], []
-        # Check all abilities
-        for ability in abilities_dict.keys():
-            # Some abilities are excluded from the ship results
-            if ability in abilities.excluded_abilities:
-                continue
-            # If this is a secondary, then add the ability to the secondaries list
-            if ability in abilities.secondaries:
-                secondaries.append(ability)
-            if ability in abilities.primaries:
-                primaries.append(ability)
-            # Parse for each ship
-            ships_list_copy = ships_list.copy()
-            # Loop over the ships
-            for ship in ships_list_copy:
-                # Check if this ship can use the ability
-                if ability not in abilities.ships_abilities[ship]:
-                    ships_list.remove(ship)
-                # If no ships are left, then something must have gone wrong with the excluded abilities,
-                # or the abilities for each ship are not up-to-date with the current version of GSF
-                if len(ships_list) == 0:
-                    raise ValueError("No ships possible for this spawn. Last ability was:", ability)
-        # Remove duplicates from secondaries list
-        primaries, secondaries = set(primaries), set(secondaries)
-        # Remove all ships that do not fit primaries and secondaries requirements
-        for category in ["primaries", "secondaries"]:
-            if len(ships_list) == 1:
-                break
-            if len(locals()[category]) != 2:
-                continue
-            # Dual primaries or secondaries
-            ships_list_copy = ships_list.copy()
-            for ship in ships_list_copy:
-                if ship not in getattr(abilities, "ships_dual_{}".format(category)):
-                    ships_list.remove(ship)
-                if len(ships_list) == 0:
-                    raise ValueError("No ships possible for this spawn because of {}".format(category))
-        # Calculate critical luck
-        crit_luck = critcount / hitcount if hitcount != 0 else 0  # ZeroDivisionError
-        # Return the expected variables
-        return (abilities_dict, dmg_t, dmg_d, healing, dmg_s, enemies, critcount,
-                crit_luck, hitcount, ships_list, enemy_dmg_d, enemy_dmg_t)
+        spawn = (event if isinstance(event, (dict, Event)) else Parser.line_to_dictionary(event) for event in spawn)
+        return SpawnStats.from_events(spawn, player_list)
 
     @staticmethod
+    @instruments.timed("parser.parse_match")
     def parse_match(match: list, player_list: list):
         """
-        Parse a match list of spawn event lists by using the
-        Parser.parse_spawn function.
+        Parse a match list of spawn event lists by merging the results
+        of Parser.parse_spawn.
         """
-        abilities_dict = {}
-        dmg_d, dmg_t, dmg_s, healing = 0, 0, 0, 0
-        enemies = []
-        enemy_dmg_d, enemy_dmg_t = {}, {}
-        critcount, hitcount = 0, 0
-        ships = {ship: 0 for ship in abilities.ships}
-        uncounted = 0
+        if isinstance(match, EventTable):
+            return match.parse_match()
+        stats = SpawnStats()
         for spawn in match:
-            results = Parser.parse_spawn(spawn, player_list)
-            # Damage and healing
-            dmg_d += results[2]
-            dmg_t += results[1]
-            dmg_s += results[4]
-            healing += results[3]
-            hitcount += results[8]
-            critcount += results[6]
-            # Abilities
-            for ability, amount in results[0].items():
-                if ability not in abilities_dict:
-                    abilities_dict[ability] = 0
-                abilities_dict[ability] += amount
-            # Enemies
-            enemies.extend(results[5])
-            enemy_dmg_d.update(results[10])
-            enemy_dmg_t.update(results[11])
-            # Ships
-            if len(results[9]) > 1 or len(results[9]) == 0:
-                uncounted += 1
-            else:
-                ships[results[9][0]] += 1
-        # Crit luck
-        crit_luck = critcount / hitcount if hitcount != 0 else 0
-        # Return
-        return (abilities_dict, dmg_d, dmg_t, dmg_s, healing, hitcount, critcount,
-                crit_luck, enemies, enemy_dmg_d, enemy_dmg_t, ships, uncounted)
+            stats.merge(Parser.parse_spawn(spawn, player_list))
+        return stats
 
     @staticmethod
+    @instruments.timed("parser.parse_file")
     def parse_file(file_cube: list, player_list: list):
         """
         Parse a file providing sums instead of lists and matrices like
         parse.parse_file()
         """
-        abilities_dict = {}
-        dmg_d, dmg_t, dmg_s, healing = 0, 0, 0, 0
-        enemies = []
-        enemy_dmg_d, enemy_dmg_t = {}, {}
-        critcount, hitcount = 0, 0
-        ships = {ship: 0 for ship in abilities.ships}
-        uncounted = 0
+        if isinstance(file_cube, EventTable):
+            return file_cube.parse_file()
+        stats = SpawnStats()
         for match in file_cube:
-            results = Parser.parse_match(match, player_list)
-            # Damage and healing
-            dmg_d += results[1]
-            dmg_t += results[2]
-            dmg_s += results[3]
-            healing += results[4]
-            hitcount += results[5]
-            critcount += results[6]
-            # Abilities
-            for ability, amount in results[0].items():
-                if ability not in abilities_dict:
-                    abilities_dict[ability] = 0
-                abilities_dict[ability] += amount
-            # Enemies
-            enemies.extend(results[8])
-            enemy_dmg_d.update(results[9])
-            enemy_dmg_t.update(results[10])
-            # Ships
-            uncounted += results[12]
-            for ship, amount in results[11].items():
-                ships[ship] += amount
-        # Crit luck
-        crit_luck = critcount / hitcount if hitcount != 0 else 0
-        # Return
-        return (abilities_dict, dmg_d, dmg_t, dmg_s, healing, hitcount, critcount,
-                crit_luck, enemies, enemy_dmg_d, enemy_dmg_t, ships, uncounted)
+            stats.merge(Parser.parse_match(match, player_list))
+        return stats
 
     @staticmethod
-    def parse_folder():
+    @instruments.timed("parser.parse_folder")
+    def parse_folder(workers: int = None, callback: Callable[[int], None] = None):
         """
-        Return a nice tuple of parsed statistics with the parse_file
-        helper function.
+        Return the merged SpawnStats for all files in the
+        CombatLogs folder. The files are parsed in parallel by a
+        FolderEngine, use the FolderEngine directly for cancellation.
+        :param workers: Amount of worker processes, see FolderEngine
+        :param callback: Called with the amount of parsed files
         """
-        abilities_dict = {}
-        dmg_d, dmg_t, dmg_s, healing = 0, 0, 0, 0
-        enemies = []
-        enemy_dmg_d, enemy_dmg_t = {}, {}
-        critcount, hitcount = 0, 0
-        ships = {ship: 0 for ship in abilities.ships}
-        uncounted = 0
-        deaths = 0
-        time = 0
-        file_list = os.listdir(settings["parsing"]["path"])
-        for file in file_list:
-            if not Parser.get_gsf_in_file(file):
-                continue
-            lines = Parser.read_file(file)
-            player_ids = Parser.get_player_id_list(lines)
-            file_cube, match_timings, _ = Parser.split_combatlog(lines, player_ids)
-            results = Parser.parse_file(file_cube, player_ids)
-            # Damage and healing
-            dmg_d += results[1]
-            dmg_t += results[2]
-            dmg_s += results[3]
-            healing += results[4]
-            hitcount += results[5]
-            critcount += results[6]
-            deaths += sum([len(match) for match in file_cube])
-            # Abilities
-            for ability, amount in results[0].items():
-                if ability not in abilities_dict:
-                    abilities_dict[ability] = 0
-                abilities_dict[ability] += amount
-            # Enemies
-            enemies.extend(results[8])
-            enemy_dmg_d.update(results[9])
-            enemy_dmg_t.update(results[10])
-            # Ships
-            uncounted += results[12]
-            for ship, amount in results[11].items():
-                ships[ship] += amount
-
-            start = None
-            for timing in match_timings:
-                if start is not None:
-                    time += (timing - start).total_seconds()
-                    start = None
-                    continue
-                start = timing
-        # Crit luck
-        crit_luck = critcount / hitcount if hitcount != 0 else 0
-        # Return
-        return (abilities_dict, dmg_d, dmg_t, dmg_s, healing, hitcount,
-                critcount, crit_luck, enemies, enemy_dmg_d, enemy_dmg_t,
-                ships, uncounted, deaths, time)
+        from parsing.folderengine import FolderEngine
+        files = [file for file in os.listdir(settings["parsing"]["path"]) if Parser.get_gsf_in_file(file)]
+        return FolderEngine(files, workers).run(callback)
 
     @staticmethod
     def build_spawn_from_match(match: list)->list:
@@ -920,15 +960,25 @@ class Parser(object):
         except KeyError:
             return False
 
+    @staticmethod
+    def has_name(event: dict, names: Iterable[str]) -> bool:
+        """
+        Determine whether any of the names occurs in the source, target,
+        ability or effect of an event. The fields are tested instead of
+        the line text, which an Event reconstructs on every request.
+        """
+        fields = [event[field] for field in Parser.NAME_FIELDS if field in event]
+        return any(name in field for name in names for field in fields)
+
     @staticmethod
     def is_ignorable(event: dict):
         """Determine whether the event given should be ignored"""
-        return any(a in event["line"] for a in Parser.IGNORABLE)
+        return Parser.has_name(event, Parser.IGNORABLE)
 
     @staticmethod
     def is_tutorial_event(line: dict):
         """Determine whether this event belongs to a Tutorial match"""
-        return any(a in line["line"] for a in ("Tutorial", "Invulnerable"))
+        return Parser.has_name(line, ("Tutorial", "Invulnerable"))
 
     @staticmethod
     def parse_player_reaction_time(spawn: list, name: str)->list:
@@ -941,59 +991,12 @@ class Parser(object):
         can be displayed in a TimeView.
 
         Supports matches transformed into spawn event lists as given by
-        Parser.build_spawn_from_match.
-        """
-        player = Parser.get_player_id_list(spawn)
-        # Build list of all damage taken type events
-        dmgt_events = list()
-        for event in [e for e in spawn if "Damage Overcharge" not in e["line"]]:
-            event_type = Parser.get_event_category(event, player)
-            if "dmgt" not in event_type:
-                continue
-            dmgt_events.append(event)
-        # Build list of individual attacks
-        attacks = dict()
-        for attack in dmgt_events.copy():
-            if attack not in dmgt_events:
-                continue
-            player_id, attack_start = attack["target"], attack["time"]
-            attacks[attack_start] = [attack]
-            for event in dmgt_events[dmgt_events.copy().index(attack):]:
-                if event["target"] != player_id:  # Death in between
-                    break
-                elif (event["time"] - attack_start).total_seconds() > 5:
-                    break
-                attacks[attack["time"]].append(event)
-                attack_start = event["time"]
-                dmgt_events.remove(event)
-            if attack in dmgt_events:
-                dmgt_events.remove(attack)
-        for time, events in attacks.copy().items():
-            if len(events) < 2:
-                del attacks[time]
-        enemies = {time: [event["source"] for event in events] for time, events in attacks.items()}
-        # Find responses of player for each attack
-        responses = list()
-        for i, (time, attack) in enumerate(sorted(attacks.items(), key=lambda t: t[0])):
-            attack_start, attack_end = attack[0], attack[-1]
-            events = spawn[spawn.index(attack_start):]
-            applied = False
-            for event in events:
-                if event["target"] not in enemies[time] and event["self"] is False:
-                    continue
-                elif "AbilityActivate" not in event["line"] or event["ability"] in abilities.systems:
-                    continue
-                elif event["ability"] in ("Railgun Charge", "Wingman", "Lingering Effect", "Scope Mode"):
-                    continue
-                if (event["time"] - attack_start["time"]).total_seconds() > 10:
-                    break
-                responses.append(Parser.create_response_event(attack_start, attack_end, event, name, attack, i))
-                applied = True
-                break
-            if applied is False:
-                event = events[-1]
-                responses.append(Parser.create_response_event(attack_start, attack_end, event, name, attack, i))
-        spawn.extend(responses)
+        Parser.build_spawn_from_match. The response events are appended
+        to the spawn list given, use ReactionTimes for the reaction
+        times themselves.
+        """
+        from parsing.reactiontime import ReactionTimes
+        spawn.extend(ReactionTimes(spawn, name).responses)
         return spawn
 
     @staticmethod
@@ -5,6 +5,7 @@ License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
 # Standard library
+from bisect import bisect_left, bisect_right
 from datetime import timedelta, datetime
 # Project modules
 from data.components import PLURAL_TO_SINGULAR
@@ -13,6 +14,7 @@ from data import abilities
 from parsing.ships import Ship, Component, get_ship_category
 from parsing.shipstats import ShipStats
 from parsing.parser import Parser
+from parsing.timebase import timeline_value
 
 
 class InvalidDescriptor(ValueError):
@@ -28,6 +30,16 @@ class PatternParser(object):
     synthesize more useful information for the user.
     """
 
+    # Component categories of the ability index in data/abilities.py
+    COMPONENT_CATEGORIES = {
+        "primaries": "PrimaryWeapon",
+        "secondaries": "SecondaryWeapon",
+        "engines": "Engine",
+        "systems": "Systems",
+        "shields": "ShieldProjector",
+        "copilots": "CoPilot",
+    }
+
     @staticmethod
     def parse_patterns(lines: list, screen: dict, patterns: list, active_ids: list):
         """
@@ -43,11 +55,14 @@ class PatternParser(object):
         """
         print("[PatternParser] Parsing Patterns.")
         markers = list()
+        # Subsections can only be found by bisection if the lines are in order
+        times = [line["time"] for line in lines]
+        times = times if all(a <= b for a, b in zip(times, times[1:])) else None
         for pattern in patterns:
             print("[PatternParser] Parsing pattern:", pattern["name"])
             for line in lines:
                 line["enemy"] = line["source"] not in active_ids
-                result = PatternParser.parse_pattern(pattern, line, lines, screen)
+                result = PatternParser.parse_pattern(pattern, line, lines, screen, times)
                 if result is True:
                     start = PatternParser.datetime_to_float(line["time"])
                     end = PatternParser.datetime_to_float(line["time"] + timedelta(seconds=1))
@@ -57,7 +72,7 @@ class PatternParser(object):
         return markers
 
     @staticmethod
-    def parse_pattern(pattern: dict, line: dict, lines: list, screen: dict):
+    def parse_pattern(pattern: dict, line: dict, lines: list, screen: dict, times: list = None):
         """
         Parse a single pattern for a given CombatLog event. The format
         of a pattern dictionary is given in data/patterns.py/Patterns.
@@ -69,6 +84,7 @@ class PatternParser(object):
         :param line: Event dictionary to check pattern for
         :param lines: List of event dictionaries of the full CombatLog
         :param screen: Screen data dictionary with the data of spawn
+        :param times: Sorted times of lines, see get_lines_subsection
         :return: True if pattern is detected for this event, else False
         """
         triggered = False
@@ -93,14 +109,14 @@ class PatternParser(object):
             if eid in results:
                 continue
             # Check requirement against given data
-            if PatternParser.parse_event(line, lines, screen, event, span) is True:
+            if PatternParser.parse_event(line, lines, screen, event, span, times) is True:
                 print("[PatternParser] Requirement {} satisfied.".format(eid))
                 results.append(eid)
         print("[PatternParser] Requirements: {}, Results: {}".format(requirements, results))
         return PatternParser.compare_requirements(set(results), set(requirements))
 
     @staticmethod
-    def parse_event(line: dict, lines: list, screen: dict, event: tuple, span: tuple):
+    def parse_event(line: dict, lines: list, screen: dict, event: tuple, span: tuple, times: list = None):
         """
         Parse an event_descriptor over a given set of data.
 
@@ -109,6 +125,7 @@ class PatternParser(object):
         :param screen: Screen data dictionary for this spawn
         :param event: Event descriptor (Patterns docstring)
         :param span: (lower, higher) spawn tuple (Patterns docstring)
+        :param times: Sorted times of lines, see get_lines_subsection
 
         :return: bool, whether the event was detected in this set
 
@@ -119,7 +136,7 @@ class PatternParser(object):
         if event_type == Patterns.FILE:
             _, reference = event
             occurred = reference.pop("occurred", True)
-            line_sub = PatternParser.get_lines_subsection(lines, line, span)
+            line_sub = PatternParser.get_lines_subsection(lines, line, span, times)
             print("[PatternParser] Comparing a file event: {}".format(reference))
             for line in line_sub:
                 if PatternParser.compare_events(line, reference) is not occurred:
@@ -202,16 +219,24 @@ class PatternParser(object):
         return True
 
     @staticmethod
-    def get_lines_subsection(lines: list, origin: dict, span: tuple):
-        """Get a subsection of a list of lines based on time span"""
-        result = list()
+    def get_lines_subsection(lines: list, origin: dict, span: tuple, times: list = None):
+        """
+        Get a subsection of a list of lines based on time span
+        :param times: Sorted list of the times of lines, if given the
+            subsection is found by bisection instead of a linear search
+        """
         limit_l = origin["time"] + timedelta(seconds=span[0])
         limit_h = origin["time"] + timedelta(seconds=span[1])
-        for event in lines:
-            if limit_l <= event["time"] <= limit_h:
-                result.append(event)
-            if event["time"] > limit_h:
-                break
+        if times is not None:
+            start = bisect_left(times, limit_l)
+            result = lines[start:bisect_right(times, limit_h, start)]
+        else:
+            result = list()
+            for event in lines:
+                if limit_l <= event["time"] <= limit_h:
+                    result.append(event)
+                if event["time"] > limit_h:
+                    break
         print("[LinesSubSection] Created sub-list of {} items between limits {}, {}".format(len(result), limit_l.time(), limit_h.time()))
         return result
 
@@ -282,19 +307,9 @@ class PatternParser(object):
     @staticmethod
     def get_component_category(component: str)->str:
         """Return the category of a given component"""
-        if component in abilities.primaries:
-            return "PrimaryWeapon"
-        if component in abilities.secondaries:
-            return "SecondaryWeapon"
-        if component in abilities.engines:
-            return "Engine"
-        if component in abilities.systems:
-            return "Systems"
-        if component in abilities.shields:
-            return "ShieldProjector"
-        if component in abilities.copilots:
-            return "CoPilot"
-        raise ValueError("Invalid component type given:", component)
+        if component not in abilities.ABILITIES:
+            raise ValueError("Invalid component type given:", component)
+        return PatternParser.COMPONENT_CATEGORIES[abilities.ABILITIES[component][0]]
 
     @staticmethod
     def compare_requirements(results: (list, set), requirements: (list, set)):
@@ -360,5 +375,4 @@ class PatternParser(object):
         """Convert a datetime object to a float value"""
         if not isinstance(date_time_obj, datetime):
             raise TypeError("date_time_obj not of datetime type but {}".format(repr(date_time_obj)))
-        return float(
-            "{}.{}{}".format(date_time_obj.minute, (int((date_time_obj.second / 60) * 100)), date_time_obj.microsecond))
+        return timeline_value(date_time_obj.minute, date_time_obj.second, date_time_obj.microsecond)
@@ -0,0 +1,131 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from typing import Dict, List
+# Packages
+import numpy as np
+# Project Modules
+from data import abilities
+from parsing.parser import Parser
+from parsing.timebase import elapsed, get_milliseconds
+
+
+class ReactionTimes(object):
+    """
+    Determines how fast the player responds to attacks in a spawn
+
+    An attack is a series of damage taken events on the same player ID
+    with no more than ATTACK_GAP seconds in between. The response to an
+    attack is the first ability the player activates on one of the
+    attackers, or on themselves, within RESPONSE_WINDOW seconds after
+    the start of the attack. The reaction time is the time between the
+    start of the attack and the response.
+
+    The attacks are found in a single sweep over the events and the
+    responses with a sweep from the start of each attack that ends at
+    the response window, so the work is linear in the length of the
+    spawn instead of quadratic.
+
+    Attributes:
+    - attacks: List of attacks, each a list of damage taken events
+    - responses: Response events as by Parser.create_response_event
+    - latencies: Reaction times in seconds of answered attacks
+    """
+
+    ATTACK_GAP = 5
+    RESPONSE_WINDOW = 10
+    PERCENTILES = (50, 90, 99)
+    IGNORED = ("Railgun Charge", "Wingman", "Lingering Effect", "Scope Mode")
+
+    def __init__(self, events: list, name: str, player_list: list = None):
+        """
+        :param events: Events of a spawn, or of a match as given by
+            Parser.build_spawn_from_match
+        :param name: Player name for the response events
+        :param player_list: Player ID list, determined from the events
+            if not given
+        """
+        self.player_list = Parser.get_player_id_list(events) if player_list is None else player_list
+        self.attacks: List[list] = self.get_attacks(events, self.player_list)
+        self.responses: List[dict] = list()
+        self.latencies: List[float] = list()
+        self.find_responses(events, name)
+
+    @classmethod
+    def get_attacks(cls, events: list, player_list: list) -> List[list]:
+        """Group the damage taken events into attacks"""
+        attacks, attack = dict(), None
+        for event in events:
+            if Parser.has_name(event, ("Damage Overcharge",)):
+                continue
+            if "dmgt" not in Parser.determine_event_category(event, player_list):
+                continue
+            if attack is not None and event["target"] == attack[-1]["target"] and \
+                    elapsed(get_milliseconds(attack[-1]), get_milliseconds(event)) <= cls.ATTACK_GAP * 1000:
+                attack.append(event)
+                continue
+            # The first hit is included twice, as it always has been
+            # for the amount of damage shown for an attack
+            attack = [event, event]
+            attacks[event["time"]] = attack
+        return [attacks[time] for time in sorted(attacks.keys())]
+
+    def find_responses(self, events: list, name: str):
+        """Find the responses to the attacks"""
+        index = {id(event): i for i, event in enumerate(events)}
+        for i, attack in enumerate(self.attacks):
+            attack_start, attack_end = attack[0], attack[-1]
+            start = get_milliseconds(attack_start)
+            enemies = {event["source"] for event in attack}
+            response = None
+            for position in range(index[id(attack_start)], len(events)):
+                event = events[position]
+                if event["target"] not in enemies and event["self"] is False:
+                    continue
+                elif "AbilityActivate" not in event["effect"] or event["ability"] in abilities.SYSTEMS:
+                    continue
+                elif event["ability"] in self.IGNORED:
+                    continue
+                if elapsed(start, get_milliseconds(event)) > self.RESPONSE_WINDOW * 1000:
+                    break
+                response = event
+                break
+            if response is not None:
+                self.latencies.append(elapsed(start, get_milliseconds(response)) / 1000)
+            event = response if response is not None else events[-1]
+            self.responses.append(Parser.create_response_event(attack_start, attack_end, event, name, attack, i))
+
+    def percentiles(self) -> Dict[int, float]:
+        """Return the PERCENTILES of the reaction times"""
+        return ReactionTimes.get_percentiles(self.latencies)
+
+    @staticmethod
+    def get_percentiles(latencies: List[float]) -> Dict[int, float]:
+        """Return the PERCENTILES of reaction times, empty if none"""
+        if len(latencies) == 0:
+            return dict()
+        values = np.percentile(latencies, ReactionTimes.PERCENTILES)
+        return {percentile: float(value) for percentile, value in zip(ReactionTimes.PERCENTILES, values)}
+
+    @staticmethod
+    def for_match(match: list, name: str) -> (List["ReactionTimes"], Dict[int, float]):
+        """
+        Determine the reaction times for all spawns of a match
+        :param match: List of spawns of events
+        :param name: Player name for the response events
+        :return: ReactionTimes of each spawn, percentiles of the match
+        """
+        spawns = [ReactionTimes(spawn, name) for spawn in match]
+        latencies = [latency for spawn in spawns for latency in spawn.latencies]
+        return spawns, ReactionTimes.get_percentiles(latencies)
+
+    @staticmethod
+    def format_percentiles(percentiles: Dict[int, float]) -> str:
+        """Format percentiles for the statistics string"""
+        if len(percentiles) == 0:
+            return "-"
+        return "{} s".format(" / ".join("{:.1f}".format(percentiles[p]) for p in ReactionTimes.PERCENTILES))
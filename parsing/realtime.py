@@ -12,7 +12,7 @@ import six
 import sys
 from queue import Queue
 from threading import Thread, Lock
-from time import sleep
+from time import perf_counter, sleep
 import traceback
 from typing import Any, Tuple, Dict, List
 # UI Libraries
@@ -34,6 +34,7 @@ from data.servers import SERVERS
 from network.minimap.client import MiniMapClient
 from network.discord import DiscordClient
 # Parsing Modules
+from parsing.accumulator import SpawnStats
 from parsing.logstalker import LogStalker
 from parsing.gsf import GSFInterface
 from parsing.gui import get_player_guiname
@@ -44,15 +45,18 @@ from parsing.realtimedb import RealTimeDB
 from parsing.rgb import RGBController
 from parsing.scoreboards import ScoreboardParser
 from parsing.screen import ScreenParser
+from parsing.shipdetect import ShipDetector
 from parsing.shipstats import ShipStats
 from parsing.speed import SpeedParser
 from parsing import tesseract
 from parsing.delay import DelayParser
+from parsing.effectsresolver import EffectsResolver
 from parsing import vision
 # Utility Modules
 from utils.directories import get_assets_directory
 from utils.utilities import get_screen_resolution, get_cursor_position
 from utils.window import Window
+from utils import instruments
 import variables
 
 
@@ -61,27 +65,27 @@ def pair_wise(iterable: (list, tuple)):
     return list(zip(*tuple(iterable[i::2] for i in range(2))))
 
 
-screen_perf: Dict[str, Tuple[int, float]] = dict()
 screen_slow: Dict[str, float] = dict()
 
 
 def screen_func(feature: str) -> callable:
-    """Function decorator that records the performance of function"""
+    """
+    Function decorator that records the performance of function in the
+    screen.<feature> Timer of the instrumentation registry
+    """
 
     def outer(func: callable) -> callable:
         """Enable function performance measurement if enabled"""
         if not variables.settings["screen"]["perf"] is True:
             return func
+        name = "screen.{}".format(feature)
 
         def benchmark(*args) -> Tuple[Any, float]:
             """Call the function and record its performance"""
-            start = datetime.now()
+            start = perf_counter()
             r = func(*args)
-            elapsed = (datetime.now() - start).total_seconds()
-            if feature not in screen_perf:
-                screen_perf[feature] = [0, 0]
-            screen_perf[feature][0] += 1
-            screen_perf[feature][1] += elapsed
+            elapsed = perf_counter() - start
+            instruments.REGISTRY.timer(name).record(elapsed)
             return r, elapsed
 
         # Record slow features if disabling them is enabled
@@ -122,6 +126,9 @@ class RealTimeParser(Thread):
 
     TIMER_MARGIN = 20
 
+    # Keys pressed on the RGB keyboard for ability categories
+    RGB_KEYS = {"systems": "1", "shields": "2", "engines": "3", "copilots": "4"}
+
     SCREEN_DATA_DEF = {
         "tracking": "", "health": (None, None, None), "map": None}
 
@@ -190,6 +197,9 @@ class RealTimeParser(Thread):
         self._stalker: LogStalker = LogStalker(watching_callback=self._file_callback)
         # Data attributes
         self.dmg_d, self.dmg_t, self.dmg_s, self._healing, self.abilities = 0, 0, 0, 0, {}
+        self._ships = ShipDetector(components_only=True)
+        self.spawn_stats: SpawnStats = None
+        self.match_stats = SpawnStats()
         self.active_id, self.active_ids = "", []
         self.hold, self.hold_list = 0, []
         self.player_name = "Player Name"
@@ -198,6 +208,7 @@ class RealTimeParser(Thread):
         self.end_match = None
         self.start_spawn = None
         self.lines = []
+        self._effects = EffectsResolver()
         self.primary_weapon = False
         self.secondary_weapon = False
         self.scope_mode = False
@@ -241,9 +252,7 @@ class RealTimeParser(Thread):
         self._speed_parser = None
         if "Engine Speed" in self._features:
             self._speed_parser = SpeedParser()
-        global screen_perf
-        screen_perf.clear()
-        screen_perf = {feature: [0, 0.0] for feature in self._features}
+        instruments.REGISTRY.reset("screen.")
         self._ready_button_img: Image.Image = None
         self.power_mode = "F4"
 
@@ -442,11 +451,14 @@ class RealTimeParser(Thread):
         self.is_match = False
         self.tutorial = False
         self.lines.clear()
+        self._effects.clear()
         # Spawn timer
         self._spawn_time = None
         # Reset match statistics
+        self.close_spawn_stats()
         self.dmg_d, self.dmg_t, self.dmg_s, self._healing = 0, 0, 0, 0
         self.abilities.clear()
+        self._ships.reset()
         self.active_id = ""
         self.primary_weapon, self.secondary_weapon = False, False
         if self._pointer_parser is not None:
@@ -466,6 +478,7 @@ class RealTimeParser(Thread):
         print("[RealTimeParser] Match start.")
         self.start_match = datetime.combine(datetime.now().date(), line["time"].time())
         self.is_match = True
+        self.match_stats = SpawnStats()
         self.update_presence()
         # Call the new match callback
         self._match_callback(True)
@@ -478,7 +491,9 @@ class RealTimeParser(Thread):
         """Check for a new spawn and handle it if required"""
         if line["source"] == self.active_id or line["target"] == self.active_id:
             return
+        self.close_spawn_stats()
         self.abilities.clear()
+        self._ships.reset()
         self.active_id = ""
         # Call the spawn callback
         self.start_spawn = line["time"]
@@ -494,6 +509,18 @@ class RealTimeParser(Thread):
             self._speed_parser.reset()
         self.power_mode = "F4"
 
+    def close_spawn_stats(self):
+        """Merge the statistics of the spawn into those of the match"""
+        if self.spawn_stats is None:
+            return
+        stats, self.spawn_stats = self.spawn_stats, None
+        try:
+            stats.close()
+        except ValueError:  # No ships possible for the spawn
+            return
+        self.match_stats.merge(stats)
+        self._realtime_db.set_for_spawn("statistics", stats.to_dict())
+
     def update_player_id(self, line: dict):
         """Update the Player ID if this line allows it"""
         if self.active_id == "" and line["source"] == line["target"]:
@@ -538,6 +565,9 @@ class RealTimeParser(Thread):
             line["amount"] = "0"
         if not isinstance(line["amount"], int):
             line["amount"] = int(line["amount"].replace("*", ""))
+        if self.spawn_stats is None:
+            self.spawn_stats = SpawnStats()
+        self.spawn_stats.add_event(line, self.active_ids)
         if "Heal" in line["effect"]:
             self._healing += line["amount"]
             self.rgb_queue_put(("press", "hr"))
@@ -554,11 +584,12 @@ class RealTimeParser(Thread):
         if line["source"] in self.active_ids:
             if line["ability"] not in self.abilities:
                 self.abilities[line["ability"]] = 0
+                self._ships.add(line["ability"])
             self.abilities[line["ability"]] += 1
         
         self.lines.append(line)
         if callable(self.event_callback):
-            line_effect = Parser.line_to_event_dictionary(line, self.active_id, self.lines)
+            line_effect = self._effects.append(line, self.active_id)
             if self.event_callback_filter(line_effect):
                 self.event_callback(line_effect, self.player_name, self.active_ids, self.start_match)
         self.process_weapon_swap(line)
@@ -594,25 +625,20 @@ class RealTimeParser(Thread):
             print("[RealTimeParser] Invalid RGB line: {}".format(line))
             return
         if "AbilityActivate" in line["effect"] and line["source"] in self.active_ids:
-            ability = line["ability"]
-            if ability in abilities.systems:
-                self.rgb_queue_put(("press", "1"))
-            elif ability in abilities.shields:
-                self.rgb_queue_put(("press", "2"))
-            elif ability in abilities.engines:
-                self.rgb_queue_put(("press", "3"))
-            elif ability in abilities.copilots:
-                self.rgb_queue_put(("press", "4"))
+            category = abilities.ABILITIES.get(line["ability"], (None,))[0]
+            if category in self.RGB_KEYS:
+                self.rgb_queue_put(("press", self.RGB_KEYS[category]))
 
     def update_ship(self):
         """Update the Ship and ShipStats attributes"""
         if self.ship is not None:
             return
-        ship = Parser.get_ship_for_dict(self.abilities)
+        ship = self._ships.candidates
         if len(ship) > 1:
             return
         elif len(ship) == 0:
             self.abilities.clear()
+            self._ships.reset()
             return
         ship = ship[0]
         if self._char_db[self._char_i]["Faction"].lower() == "republic":
@@ -1080,6 +1106,7 @@ class RealTimeParser(Thread):
     def cleanup(self):
         """Clean up all the object references"""
         self.lines.clear()
+        self._effects.clear()
         self.rgb_stop()
         if self._timer_parser is not None:
             self._timer_parser.stop()
@@ -1184,16 +1211,18 @@ class RealTimeParser(Thread):
         if len(self._features) == 0:
             return "No screen results features enabled"
         string = str()
-        global screen_perf
-        for feature, (count, time) in screen_perf.items():
-            if count == 0 or time / count < 0.25:
+        for name in instruments.REGISTRY.names:
+            if not name.startswith("screen."):
+                continue
+            feature, timer = name[len("screen."):], instruments.REGISTRY.timer(name)
+            if timer.count == 0 or timer.mean < 0.25:
                 continue
-            avg = time / count
+            avg, p95 = timer.mean, timer.percentile(95)
             if feature not in self._features:
                 # Feature has been disabled by perf profiler
-                string += "{}: {:.3f}s, disabled\n".format(feature, avg)
+                string += "{}: {:.3f}s (p95 {:.3f}s), disabled\n".format(feature, avg, p95)
             else:
-                string += "{}: {:.3f}s\n".format(feature, avg)
+                string += "{}: {:.3f}s (p95 {:.3f}s)\n".format(feature, avg, p95)
         return string
 
     @property
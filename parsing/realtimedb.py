@@ -5,7 +5,7 @@ License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
 # Standard Library
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import pickle
 from threading import Lock
@@ -13,7 +13,9 @@ from typing import Dict, Tuple, Any
 # UI Libraries
 from tkinter import messagebox
 # Project Modules
+from parsing.timebase import ROLLOVER, milliseconds
 from utils.directories import get_temp_directory
+from utils import instruments
 
 DATA_DICT = Dict[str, Any]
 SPAWN_DICT = Dict[datetime, DATA_DICT]
@@ -44,6 +46,7 @@ class RealTimeDB(object):
     >>> "score": float,
     >>> "shots": Dict[datetime, Tuple[bool, int, int]],
     >>> "ship": Ship,
+    >>> "statistics": Dict[str, Any] as in SpawnStats.to_dict,
     >>> "tracking": Dict[datetime, float],
     >>> }
     """
@@ -58,6 +61,7 @@ class RealTimeDB(object):
         "score": None,
         "ship": None,
         "shots": dict(),
+        "statistics": None,
         "tracking": dict(),
     }
 
@@ -84,6 +88,7 @@ class RealTimeDB(object):
         self.save_data(data)
 
     @property
+    @instruments.timed("realtimedb.load")
     def data(self) -> (DATABASE, None):
         """Return a full copy of the data in the file"""
         if not os.path.exists(self._path):
@@ -100,10 +105,12 @@ class RealTimeDB(object):
             self.save_data(dict())
             return dict()
 
+    @instruments.timed("realtimedb.save")
     def save_data(self, data: DATABASE):
         """Save data to the file in the right format"""
         with self._lock and open(self._path, "wb") as fo:
             pickle.dump(data, fo)
+        instruments.gauge("realtimedb.size", os.path.getsize(self._path))
 
     @staticmethod
     def get_data() -> DATABASE:
@@ -112,7 +119,8 @@ class RealTimeDB(object):
 
     def set_spawn(self, file: str, match: datetime, spawn: datetime):
         """Set a spawn as being active and cache the data for it"""
-        match, spawn = map(self.replace_date, (match, spawn))
+        match = self.replace_date(match)
+        spawn = self.replace_date(spawn, match)
         if self._spawn_data is not None:
             self.write_spawn_data()
         with self._lock:
@@ -158,8 +166,19 @@ class RealTimeDB(object):
             return self._spawn_data[key]
 
     @staticmethod
-    def replace_date(moment: datetime) -> datetime:
-        """Replace the date of a datetime if it is not set"""
+    def replace_date(moment: datetime, reference: datetime = None) -> datetime:
+        """
+        Replace the date of a datetime if it is not set
+        :param moment: datetime to replace the date of
+        :param reference: datetime with a date at or before moment,
+            so that a moment after midnight is placed on the next day.
+            Default is the current date.
+        """
         if moment.year != 1970:
             return moment
-        return datetime.combine(datetime.now().date(), moment.time())
+        if reference is None:
+            return datetime.combine(datetime.now().date(), moment.time())
+        day = reference.date()
+        if milliseconds(moment) - milliseconds(reference) < -ROLLOVER:
+            day += timedelta(days=1)
+        return datetime.combine(day, moment.time())
@@ -5,12 +5,14 @@ License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
 # Standard Library
+from bisect import bisect_left
 from datetime import datetime
 from functools import partial
 # Project Modules
 from parsing.filehandler import FileHandler
 from parsing.parser import Parser
 from parsing.shipstats import ShipStats
+from parsing.timebase import get_milliseconds, milliseconds, seconds_between
 
 POWER_MODES = {
     "F1": "Power to Weapons",
@@ -100,6 +102,8 @@ class ScreenParser(object):
         """Determine tracking penalty for each primary weapon event"""
         active_ids = Parser.get_player_id_list(events)
         distance = screen_data["distance"]
+        keys = sorted(distance.keys(), key=milliseconds)
+        times = [milliseconds(key) for key in keys]
         primary = "PrimaryWeapon"
         for i, event in enumerate(events):
             if "custom" in event and event["custom"] is True:
@@ -110,9 +114,12 @@ class ScreenParser(object):
             ctg = Parser.get_event_category(event, active_ids)
             if ctg != "dmgd_pri":
                 continue
-            key = min(distance.keys(), key=lambda k: abs((k - event["time"]).total_seconds()))
-            if abs((key - event["time"]).total_seconds()) > 0.5:
+            time = get_milliseconds(event)
+            index = bisect_left(times, time)
+            nearest = min(range(max(index - 1, 0), min(index + 1, len(times))), key=lambda j: abs(times[j] - time))
+            if abs(times[nearest] - time) > 500:
                 continue
+            key = keys[nearest]
             if primary not in ship:
                 continue
             tracking = ship[primary]["trackingAccuracyLoss"] * (distance[key] / 10) * 100
@@ -154,7 +161,7 @@ class ScreenParser(object):
     @staticmethod
     def create_boost_event(name: str, start: datetime, end: datetime, ship: ShipStats):
         """Create a boost event"""
-        duration = (end - start).total_seconds()
+        duration = seconds_between(start, end)
         if duration < 0.2:
             return None
         return {
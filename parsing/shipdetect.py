@@ -0,0 +1,126 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from typing import Iterable
+# Project Modules
+from data import abilities
+from parsing.symbols import symbols
+
+# Symbol codes of the ability data, so abilities can be compared as integers
+EXCLUDED = symbols.code_set(abilities.excluded_abilities)
+PRIMARIES = symbols.code_set(abilities.primaries)
+SECONDARIES = symbols.code_set(abilities.secondaries)
+COMPONENTS = symbols.code_set(abilities.components)
+SHIPS_ABILITIES = {ship: symbols.code_set(names) for ship, names in abilities.ships_abilities.items()}
+
+# Ship x ability matrix: every ship is a bit and every ability has the
+# mask of the ships that can use it, so the ships possible for a set of
+# abilities are the bitwise AND of their masks
+SHIP_BITS = {ship: 1 << i for i, ship in enumerate(abilities.ships)}
+ALL_SHIPS = (1 << len(abilities.ships)) - 1
+ABILITY_MASKS = {
+    code: sum(SHIP_BITS[ship] for ship, codes in SHIPS_ABILITIES.items() if code in codes)
+    for code in frozenset().union(*SHIPS_ABILITIES.values())
+}
+DUAL_MASKS = {
+    category: sum(SHIP_BITS[ship] for ship in getattr(abilities, "ships_dual_{}".format(category)))
+    for category in ("primaries", "secondaries")
+}
+
+
+def get_ships_for_mask(mask: int) -> list:
+    """Return the list of ship names for a ship mask"""
+    return [ship for ship in abilities.ships if mask & SHIP_BITS[ship]]
+
+
+class ShipDetector(object):
+    """
+    Narrows down the ships possible for a spawn one ability at a time
+
+    Each ability that is used removes the ships that cannot use it from
+    the candidates by a single AND with its mask, so the detector can be
+    updated for every event, as the RealTimeParser does. The remaining
+    candidates are available as the ambiguity set.
+    """
+
+    def __init__(self, components_only: bool = False):
+        """
+        :param components_only: Only consider abilities of components,
+            as Parser.get_ship_for_dict does, instead of all abilities
+            that are not excluded
+        """
+        self.components_only = components_only
+        self.mask = ALL_SHIPS
+        self.primaries, self.secondaries = set(), set()
+
+    def add(self, ability) -> int:
+        """
+        Update the candidates for a newly used ability
+        :param ability: Ability name or symbol code
+        :return: mask of the remaining candidate ships
+        """
+        code = symbols.intern(ability) if isinstance(ability, str) else ability
+        if code in EXCLUDED or (self.components_only and code not in COMPONENTS):
+            return self.mask
+        if code in PRIMARIES:
+            self.primaries.add(code)
+        if code in SECONDARIES:
+            self.secondaries.add(code)
+        self.mask &= ABILITY_MASKS.get(code, 0)
+        return self.mask
+
+    def update(self, abilities_used: Iterable) -> int:
+        """Update the candidates for multiple abilities"""
+        for ability in abilities_used:
+            self.add(ability)
+        return self.mask
+
+    def reset(self):
+        """Reset the candidates to all ships, for example for a new spawn"""
+        self.mask = ALL_SHIPS
+        self.primaries.clear()
+        self.secondaries.clear()
+
+    @property
+    def candidates(self) -> list:
+        """The ambiguity set: list of the ships that remain possible"""
+        return get_ships_for_mask(self.mask)
+
+    @property
+    def ambiguous(self) -> bool:
+        """Whether more than one ship remains possible"""
+        return self.mask & (self.mask - 1) != 0
+
+
+def get_ships_for_abilities(abilities_used: Iterable) -> list:
+    """
+    Determine the ships that may have been used in a spawn based on the
+    abilities used during that spawn
+    :param abilities_used: Iterable of ability names or symbol codes,
+        for example an abilities dictionary
+    :return: List of possible ship names
+    :raises ValueError: If no ship is possible for the abilities
+    """
+    detector = ShipDetector()
+    for ability in abilities_used:
+        # If no ships are left, then something must have gone wrong with the excluded abilities,
+        # or the abilities for each ship are not up-to-date with the current version of GSF
+        if detector.add(ability) == 0:
+            code = symbols.intern(ability) if isinstance(ability, str) else ability
+            raise ValueError("No ships possible for this spawn. Last ability was:", symbols.lookup(code))
+    weapons = {"primaries": detector.primaries, "secondaries": detector.secondaries}
+    # Remove all ships that do not fit primaries and secondaries requirements
+    for category in ["primaries", "secondaries"]:
+        if not detector.ambiguous:
+            break
+        if len(weapons[category]) != 2:
+            continue
+        # Dual primaries or secondaries
+        detector.mask &= DUAL_MASKS[category]
+        if detector.mask == 0:
+            raise ValueError("No ships possible for this spawn because of {}".format(category))
+    return detector.candidates
@@ -4,47 +4,52 @@ Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
 License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
+from parsing.fileanalyzer import FileAnalyzer
 from parsing.parser import Parser
+from parsing.reactiontime import ReactionTimes
+from parsing.timebase import seconds_between
 from data import abilities
 
 
-def spawn_statistics(file_name, spawn, spawn_timing, sharing_db=None):
+def spawn_statistics(file_name, spawn, spawn_timing):
     """Build strings to show in the StatsFrame"""
     # Retrieve required data
-    lines = Parser.read_file(file_name, sharing_db)
-    player_numbers = Parser.get_player_id_list(lines)
-    (abilities_dict, dmg_t, dmg_d, healing, dmg_s, enemies, critcount,
-     crit_luck, hitcount, ships_list, enemy_dmg_d, enemy_dmg_t) = \
-        Parser.parse_spawn(spawn, player_numbers)
-    name = Parser.get_player_name(lines)
+    analyzer = FileAnalyzer.open(file_name)
+    player_numbers, name = analyzer.player_list, analyzer.player_name
+    index = analyzer.find_spawn(spawn_timing)
+    if index is not None and analyzer.file_cube[index[0]][index[1]] is spawn:
+        stats = analyzer.parse_spawn(*index)
+    else:
+        stats = Parser.parse_spawn(spawn, player_numbers)
+    abilities_dict, dmg_d, dmg_t = stats.abilities, stats.dmg_d, stats.dmg_t
     # Build the statistics string
     stat_string = "{name}\n{enemies} enemies\n{dmg_d}\n{dmg_t}\n{dmg_r:.1f} : 1.0\n" \
                   "{dmg_s}\n{healing}\n{hitcount}\n{critcount}\n{crit_luck:.2f}\n" \
-                  "{deaths}\n{minutes}:{seconds:.0f}\n{dps:.1f}"
+                  "{deaths}\n{minutes}:{seconds:.0f}\n{dps:.1f}\n{reaction}"
     start = spawn_timing
     finish = Parser.line_to_dictionary(spawn[-1])["time"]
-    delta = finish - start
-    minutes, seconds = divmod(delta.total_seconds(), 60)
-    killsassists = sum(True if enemy_dmg_t[enemy] > 0 else False for enemy in enemies if enemy in enemy_dmg_t)
+    duration = seconds_between(start, finish)
+    minutes, seconds = divmod(duration, 60)
     stat_string = stat_string.format(
         name=name,
-        enemies=killsassists,
+        enemies=stats.killsassists,
         dmg_d=dmg_d,
         dmg_t=dmg_t,
         dmg_r=dmg_d / dmg_t if dmg_t != 0 else 0,
-        dmg_s=dmg_s,
-        healing=healing,
-        hitcount=hitcount,
-        critcount=critcount,
-        crit_luck=critcount / hitcount if hitcount != 0 else 0,
+        dmg_s=stats.dmg_s,
+        healing=stats.healing,
+        hitcount=stats.hitcount,
+        critcount=stats.critcount,
+        crit_luck=stats.crit_luck,
         deaths="-",
         minutes=minutes,
         seconds=seconds,
-        dps=dmg_d / delta.total_seconds() if delta.total_seconds() != 0 else 0
+        dps=dmg_d / duration if duration != 0 else 0,
+        reaction=ReactionTimes.format_percentiles(ReactionTimes(spawn, name).percentiles()),
     )
     # Build the components list
     components = {key: "" for key in abilities.component_types}
-    for component in [ability for ability in abilities_dict.keys() if ability in abilities.components]:
+    for component in [ability for ability in abilities_dict.keys() if ability in abilities.COMPONENTS]:
         for type in components.keys():
             if component not in getattr(abilities, type):
                 continue
@@ -56,4 +61,5 @@ def spawn_statistics(file_name, spawn, spawn_timing, sharing_db=None):
             break
     components = [components[category] for category in abilities.component_types]
     # Return
-    return name, spawn, abilities_dict, stat_string, ships_list, components, enemies, enemy_dmg_d, enemy_dmg_t
+    return (name, spawn, abilities_dict, stat_string, stats.candidates, components,
+            stats.enemies, stats.enemy_dmg_d, stats.enemy_dmg_t)
@@ -0,0 +1,151 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+
+
+Intra-file parallel splitting of CombatLogs
+
+A CombatLog of a tournament day can contain dozens of matches, which
+a folder engine that parses each file in a single process leaves on a
+single processor. Such a file is divided into chunks of bytes at match
+boundaries, which are found with a scan over the bytes of the file, so
+that the chunks can be parsed in separate processes.
+
+A chunk ends directly after a line that ends a match, a line with an
+'@' in its source or target. After such a line no match is active, so
+the state of the splitting in Parser.split_combatlog is the same as at
+the start of a file. No match or spawn crosses the edge of a chunk and
+the results of the chunks may simply be concatenated.
+"""
+# Standard Library
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import mmap
+import os
+from typing import List, Optional, Set, Tuple
+# Project Modules
+from parsing.archive import is_compressed
+from parsing.parser import Parser
+from utils import instruments
+
+CHUNK = Tuple[int, Optional[int]]
+
+
+def is_match_end(line: bytes) -> bool:
+    """Return whether a raw line ends a match in every splitter"""
+    try:
+        line = line.decode().strip()
+    except UnicodeDecodeError:  # Lines that are not decoded are skipped
+        return False
+    if "Invulnerable" in line or any(ignorable in line for ignorable in Parser.IGNORABLE):
+        return False
+    try:
+        event = Parser.line_to_dictionary(line)
+    except (ValueError, IndexError, KeyError):
+        return False
+    return not Parser.is_gsf_event(event)
+
+
+def find_match_end(data: mmap.mmap, start: int) -> int:
+    """
+    Return the offset directly after the first line at or after start
+    that ends a match, or the size of the data if there is none
+    """
+    size = len(data)
+    while start < size:
+        at = data.find(b"@", start)
+        if at == -1:
+            return size
+        first = data.rfind(b"\n", 0, at) + 1
+        stop = data.find(b"\n", at)
+        stop = size if stop == -1 else stop + 1
+        # Lines that start before start belong to the previous chunk
+        if first >= start and is_match_end(data[first:stop]):
+            return stop
+        start = stop
+    return size
+
+
+def get_chunks(path: str, chunks: int) -> List[CHUNK]:
+    """
+    Divide a CombatLog into at most chunks byte ranges of about equal
+    size that each end at a match boundary. A compressed CombatLog is
+    not divided, as it cannot be scanned without decompressing it.
+    :return: list of (start, end) byte ranges that cover the file
+    """
+    if is_compressed(path):
+        return [(0, None)]
+    size = os.path.getsize(path)
+    if chunks <= 1 or size == 0:
+        return [(0, size)]
+    edges = [0]
+    with open(path, "rb") as fi, mmap.mmap(fi.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for i in range(1, chunks):
+            edge = find_match_end(data, max(size * i // chunks, edges[-1]))
+            if edge >= size:
+                break
+            if edge > edges[-1]:
+                edges.append(edge)
+    edges.append(size)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+@instruments.worker
+def split_chunk(path: str, start: int, end: int, player_list: List[str] = None) -> tuple:
+    """
+    Split a chunk of a CombatLog with Parser.split_combatlog. This
+    function is executed in the worker processes.
+    :param player_list: Player ID list of the whole file, determined
+        from the lines of the chunk if not given
+    :return: file_cube, match_timings, spawn_timings, player_list and
+        the set of IDs that occur in the chunk
+    """
+    lines = list(Parser.stream_events(path, start=start, end=end))
+    if player_list is None:
+        player_list = Parser.get_player_id_list(lines) if len(lines) != 0 else list()
+    ids: Set[str] = set()
+    for line in lines:
+        ids.add(line["source"])
+        ids.add(line["target"])
+    return Parser.split_combatlog(lines, player_list) + (player_list, ids)
+
+
+def split_combatlog_parallel(file_name: str, workers: int = None, chunks: int = None) -> tuple:
+    """
+    Split a CombatLog into a file cube in parallel. The results are
+    identical to those of Parser.split_combatlog_file.
+
+    Every chunk is split with the player IDs found in that chunk. The
+    player ID list of the file is the union of those of the chunks, so
+    a chunk is split again with the list of the file only if it
+    contains a player ID of another chunk.
+
+    :param workers: Amount of worker processes, see get_workers
+    :param chunks: Amount of chunks, defaults to the amount of workers
+    :return: file_cube, match_timings, spawn_timings
+    """
+    from parsing.folderengine import get_workers
+    path = Parser.get_file_path(file_name)
+    workers = get_workers(workers)
+    ranges = get_chunks(path, chunks if chunks is not None else workers)
+    results = None
+    if workers > 1 and len(ranges) > 1:
+        try:
+            with ProcessPoolExecutor(min(workers, len(ranges))) as executor:
+                results = list(executor.map(split_chunk, *zip(*((path,) + chunk for chunk in ranges))))
+        except (BrokenProcessPool, OSError) as e:
+            print("[Splitter] Process pool failed, splitting in serial: {}".format(e))
+    if results is None:
+        results = [split_chunk(path, start, end) for start, end in ranges]
+    # Player ID list in order of first occurrence, as in the whole file
+    player_list = list(dict.fromkeys(player for result in results for player in result[3]))
+    file_cube, match_timings, spawn_timings = list(), list(), list()
+    for (start, end), result in zip(ranges, results):
+        if not (set(player_list) - set(result[3])).isdisjoint(result[4]):
+            result = split_chunk(path, start, end, player_list)
+        file_cube.extend(result[0])
+        match_timings.extend(result[1])
+        spawn_timings.extend(result[2])
+    return file_cube, match_timings, spawn_timings
@@ -0,0 +1,61 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from threading import Lock
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class SymbolTable(object):
+    """
+    Process-wide table that assigns integer codes to strings
+
+    Ability names, effect strings and player and NPC IDs repeat many
+    times in a CombatLog. By replacing them with integer codes, columns
+    of events can be stored in NumPy arrays and compared with integer
+    comparisons instead of string comparisons.
+
+    Codes are assigned in order of first occurrence and never change
+    within a process. The table is not saved, as player and NPC IDs
+    are unique per session and would make a saved table grow without
+    bound, so codes must not be stored or shared with other processes.
+    The empty string always has code 0.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = [""]
+        self.codes: Dict[str, int] = {"": 0}
+        self._lock = Lock()
+
+    def intern(self, string: str) -> int:
+        """Return the code for a string, assigning one if required"""
+        code = self.codes.get(string)
+        if code is not None:
+            return code
+        with self._lock:
+            code = self.codes.get(string)
+            if code is None:
+                code = len(self.strings)
+                self.strings.append(string)
+                self.codes[string] = code
+        return code
+
+    def lookup(self, code: int) -> str:
+        """Return the string for a code"""
+        return self.strings[code]
+
+    def code_set(self, strings: Iterable[str]) -> FrozenSet[int]:
+        """Return a frozenset with the codes for the given strings"""
+        return frozenset(self.intern(string) for string in strings)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def __contains__(self, string: str) -> bool:
+        return string in self.codes
+
+
+symbols = SymbolTable()
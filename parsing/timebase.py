@@ -0,0 +1,117 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+
+
+Integer millisecond time base
+
+CombatLog timestamps only include the time of day, with millisecond
+precision. Within the parsing layer, times are represented as the
+integer amount of milliseconds since midnight, so that durations are
+integer subtractions instead of datetime arithmetic. Conversion to
+datetime is only required for display purposes.
+
+As the CombatLog does not include the date, the time of day wraps
+around at midnight. A backwards jump in time of more than ROLLOVER
+milliseconds is considered to be a midnight rollover, while smaller
+backwards jumps are lines that were written out of order.
+"""
+# Standard Library
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List
+
+DAY = 24 * 60 * 60 * 1000
+ROLLOVER = DAY // 2
+START = datetime(1900, 1, 1)  # Date of datetime.strptime without date
+
+
+def milliseconds(moment: datetime) -> int:
+    """Return the amount of milliseconds since midnight for a datetime"""
+    return ((moment.hour * 60 + moment.minute) * 60 + moment.second) * 1000 + moment.microsecond // 1000
+
+
+def decode(string: str) -> int:
+    """Return the milliseconds since midnight of a HH:MM:SS.mmm string"""
+    return ((int(string[0:2]) * 60 + int(string[3:5])) * 60 + int(string[6:8])) * 1000 + int(string[9:12])
+
+
+def get_milliseconds(event: dict) -> int:
+    """Return the time of an Event or line dictionary in milliseconds"""
+    if isinstance(event, dict):
+        return milliseconds(event["time"])
+    return event.ms  # Events cache their time
+
+
+def elapsed(start: int, end: int) -> int:
+    """
+    Return the milliseconds elapsed between two times of day
+    :param start: Milliseconds since midnight of the start
+    :param end: Milliseconds since midnight of the end, which is
+        considered to be on the next day if it is more than ROLLOVER
+        before start
+    """
+    delta = end - start
+    if delta < -ROLLOVER:
+        delta += DAY
+    return delta
+
+
+def seconds_between(start: datetime, end: datetime) -> float:
+    """Return the seconds between two datetimes, rollover aware"""
+    return elapsed(milliseconds(start), milliseconds(end)) / 1000
+
+
+def unroll(times: Iterable[int]) -> List[int]:
+    """
+    Return a list of times in which every midnight rollover adds DAY
+    to all times that follow, so that the times are monotonic apart
+    from out of order lines
+    """
+    result, offset, previous = list(), 0, None
+    for value in times:
+        if previous is not None and value - previous < -ROLLOVER:
+            offset += DAY
+        previous = value
+        result.append(value + offset)
+    return result
+
+
+def to_datetime(ms: int, day: date = None) -> datetime:
+    """
+    Convert milliseconds to a datetime for display purposes
+    :param ms: Milliseconds since midnight, values larger than DAY
+        are on the days that follow
+    :param day: Date of the midnight, default is the date used by
+        datetime.strptime for times without a date
+    """
+    base = START if day is None else datetime.combine(day, time())
+    return base + timedelta(milliseconds=ms)
+
+
+def to_float(ms: int) -> float:
+    """Return the value of a time on a TimeLine"""
+    return timeline_value(ms // 60000 % 60, ms // 1000 % 60, ms % 1000 * 1000)
+
+
+def timeline_value(minute: int, second: int, microsecond: int) -> float:
+    """
+    Return the value of a time on a TimeLine
+
+    Produces the same value as the string formatting of minute,
+    percentage of the minute and microseconds that TimeLine markers
+    have always been created with, but by integer arithmetic.
+    """
+    percentage = int((second / 60) * 100)
+    scale = 10 ** (digits(percentage) + digits(microsecond))
+    return (minute * scale + percentage * 10 ** digits(microsecond) + microsecond) / scale
+
+
+def digits(value: int) -> int:
+    """Return the amount of decimal digits of a non-negative integer"""
+    count = 1
+    while value >= 10:
+        value //= 10
+        count += 1
+    return count
@@ -0,0 +1,97 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from datetime import datetime
+import re
+from typing import Any, Dict
+# Project Modules
+from data import abilities
+
+"""
+Valid GSF CombatLog event:
+[time] [source] [target] [ability] [effect] (amount)
+
+The pattern only matches lines that the legacy tokenizer handles in a
+straightforward manner: all elements are present and none of them
+contain additional brackets or parentheses. Any other line is left to
+Parser.line_to_dictionary_legacy, so results are always identical.
+"""
+LINE_PATTERN = re.compile(
+    r"^\[(\d\d:\d\d:\d\d\.\d\d\d)\]\s*"
+    r"\[([^\[\]()]*)\]\s*"
+    r"\[([^\[\]()]*)\]\s*"
+    r"\[([^\[\]()]*)\]\s*"
+    r"\[([^\[\]():]*:[^\[\]()]*)\]\s*"
+    r"\(([^\[\]()]*)\)([^\[\]()]*)$"
+)
+
+TIME_MEMO_SIZE = 2 ** 16
+
+_time_memo: Dict[str, datetime] = dict()
+
+
+def decode_time(string: str) -> datetime:
+    """
+    Decode a HH:MM:SS.mmm CombatLog timestamp
+
+    Produces the same result as datetime.strptime with
+    Parser.TIME_FORMAT, but without the format parsing overhead.
+    Results are memoized as many events share the same timestamp.
+    """
+    moment = _time_memo.get(string)
+    if moment is not None:
+        return moment
+    moment = datetime(
+        1900, 1, 1, int(string[0:2]), int(string[3:5]), int(string[6:8]), int(string[9:12]) * 1000)
+    if len(_time_memo) >= TIME_MEMO_SIZE:
+        _time_memo.clear()
+    _time_memo[string] = moment
+    return moment
+
+
+def tokenize_line(line: str, enemies: dict = None) -> (Dict[str, Any], None):
+    """
+    Turn a line into a dictionary with the same interface as
+    Parser.line_to_dictionary_legacy, using a precompiled pattern
+    :param line: A GSF CombatLog line
+    :param enemies: Dictionary with enemies, optional
+    :return: dictionary for line, or None if the line is not
+        supported by the fast path
+    """
+    match = LINE_PATTERN.match(line)
+    if match is None:
+        return None
+    time, source, target, ability, effect, amount, threat = match.groups()
+    source, target, amount = source.strip(), target.strip(), (amount + threat).strip()
+    effect_type, effect_name = effect.strip().split(":", 2)[:2]
+    name, brace, effect_id = effect_name.partition("{")
+    log = {
+        "line": line,
+        "time": decode_time(time),
+        "source": source,
+        "target": target,
+        "ability": ability.split("{", 1)[0].strip(),
+        "effect": "{}: {}".format(effect_type.split("{")[0].strip(), name.strip()),
+        "amount": amount,
+        "effect_id": effect_id.split("{")[0].strip("}") if brace else None,
+    }
+    if target == source and log["ability"] in abilities.SECONDARIES:
+        log["target"] = "Launch Projectile"
+    if log["ability"] == "":
+        log["ability"] = "Railgun Charge"
+    if amount != "":
+        log["amount"] = amount = amount.split(" ")[0]
+    if enemies is not None:
+        if log["source"] in enemies:
+            log["source"] = enemies[log["source"]]
+        if log["target"] in enemies:
+            log["target"] = enemies[log["target"]]
+    log["self"] = log["source"] == log["target"]
+    damage = amount.replace("*", "")
+    log["damage"] = int(damage) if damage.isdigit() else 0
+    log["crit"] = "*" in amount
+    return log
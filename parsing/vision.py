@@ -15,6 +15,7 @@ import cv2 as opencv
 # Project Modules
 from data.maps import map_dictionary
 from utils.directories import get_assets_directory, get_temp_directory
+from utils import instruments
 from parsing.imageops import \
     get_similarity, get_similarity_pixels, \
     get_brightest_pixel, get_brightest_pixel_loc
@@ -81,6 +82,7 @@ def get_tracking_penalty(degrees, tracking_penalty, upgrade_c, firing_arc):
     return max(min(degrees, firing_arc) * tracking_penalty - upgrade_c, 0) * 100
 
 
+@instruments.timed("vision.get_timer_status")
 def get_timer_status(source, treshold=15.0):
     """
     Determines the state of the spawn countdown timer by performing
@@ -102,6 +104,7 @@ def get_timer_status(source, treshold=15.0):
     return int(min(image_similarity.items(), key=operator.itemgetter(1))[0])
 
 
+@instruments.timed("vision.get_ship_health_hull")
 def get_ship_health_hull(image):
     """
     Uses the PIL library to determine the color of the ship icon in the
@@ -122,6 +125,7 @@ def get_ship_health_hull(image):
     return None
 
 
+@instruments.timed("vision.get_ship_health_shields")
 def get_ship_health_shields(image, coordinates):
     """
     Uses the PIL library to determine the color of the ship icon in the
@@ -154,6 +158,7 @@ def get_ship_health_shields(image, coordinates):
             health[results["r1"]] + health[results["r2"]])
 
 
+@instruments.timed("vision.get_minimap_location")
 def get_minimap_location(minimap: Image.Image):
     """
     Determine the location of a ship on the given (cropped-screenshot)
@@ -173,6 +178,7 @@ def image_to_opencv(image: Image.Image):
     return numpy.array(image)[:, :, ::-1].copy()
 
 
+@instruments.timed("vision.get_map")
 def get_map(image: Image.Image):
     """Use feature matching to determine match and map type"""
     path = os.path.join(get_temp_directory(), "temp.png")
@@ -202,6 +208,7 @@ def get_map(image: Image.Image):
     return map
 
 
+@instruments.timed("vision.get_score")
 def get_score(image: Image.Image):
     """
     Implementation:
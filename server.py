@@ -5,6 +5,7 @@ License: GNU GPLv3 as in LICENSE.md
 Copyright (C) 2016-2018 RedFantom
 """
 from network.minimap.server import MiniMapServer
+from utils import instruments
 import argparse
 import time
 
@@ -14,6 +15,7 @@ Setup a SharingServer with command-line arguments. Available arguments:
 -p: port to accept connections on
 -c: maximum amount of clients
 -t: amount of time in minutes to run the network for
+-i: record instrumentation and dump it to the temporary directory on exit
 """
 
 DESCRIPTION = "GSF Parser Sharing Server"
@@ -42,6 +44,9 @@ if __name__ == '__main__':
     # Type
     parser.add_argument(
         "-t", type=str, nargs=1, help="Server type (minimap)", default="minimap")
+    # Instrumentation
+    parser.add_argument(
+        "-i", action="store_true", help="Record instrumentation and dump it to the temporary directory on exit")
 
     args = parser.parse_args()
 
@@ -53,6 +58,8 @@ if __name__ == '__main__':
     port = int(args.p[0] if args.p != DEFAULT_PORT else DEFAULT_PORT)
     clients = int(args.c[0] if isinstance(args.c, list) else args.c)
     type = args.t[0] if isinstance(args.t, list) else args.t
+    if args.i is True:
+        instruments.REGISTRY.enable()
 
     """
     Start the network
@@ -7,7 +7,6 @@ Copyright (C) 2016-2018 RedFantom
 import configparser
 import collections
 import os
-from tkinter import messagebox
 # Project Modules
 from utils import directories
 from data.colors import default_colors, pastel_colors
@@ -37,6 +36,7 @@ class ColorScheme(object):
         try:
             return list(self.current_scheme[key])
         except (TypeError, KeyError, ValueError):
+            from tkinter import messagebox
             messagebox.showerror(
                 "Error", "The requested color for %s was could not be "
                          "type changed into a list. Did you alter the "
@@ -64,6 +64,7 @@ class ColorScheme(object):
                     self.current_scheme[key] = config_eval(value)
             except configparser.NoSectionError:
                 self.current_scheme = default_colors
+                from tkinter import messagebox
                 messagebox.showinfo(
                     "Info", "Failed to load custom colors, default colors have been loaded as "
                             "custom color scheme.")
@@ -17,7 +17,9 @@ defaults = {
         # assets/ships.db SWTOR patch level
         "patch_level": "5.9.2",
         # SWTOR Temporary directory, for use on Linux
-        "temp_dir": ""
+        "temp_dir": "",
+        # Whether instrumentation is recorded and dumped on exit
+        "instruments": False,
     },
     # UI settings
     "gui": {
@@ -38,6 +40,16 @@ defaults = {
     "parsing": {
         # CombatLogs path
         "path": get_combatlogs_folder(),
+        # CombatLog line tokenizer engine (fast, legacy)
+        "tokenizer": "fast",
+        # Whether analyzed CombatLogs are cached on disk
+        "cache": True,
+        # Maximum size of the CombatLog cache in megabytes
+        "cache_size": 256,
+        # Memory budget of the in-process CombatLog cache in megabytes
+        "memory_cache_size": 128,
+        # Amount of processes for folder statistics, 0 for all processors
+        "workers": 0,
     },
     # Real-time results settings
     "realtime": {
@@ -0,0 +1,80 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from datetime import datetime
+from unittest import TestCase
+# Project Modules
+from data import abilities
+from data.icons import ICONS
+from parsing.parser import Parser
+
+
+def get_event_category(line_dict: dict, active_id: str) -> str:
+    """Reference implementation categorising events with the tuples"""
+    ability = line_dict["ability"]
+    if ability == "":
+        return "other"
+    elif "Damage" in line_dict["effect"]:
+        if line_dict["target"] == active_id:
+            if line_dict["source"] == line_dict["target"]:
+                return "selfdmg"
+            return "dmgt_sec" if ability in abilities.secondaries else "dmgt_pri"
+        return "dmgd_sec" if ability in abilities.secondaries else "dmgd_pri"
+    elif "Heal" in line_dict["effect"]:
+        return "selfheal" if line_dict["source"] == active_id else "healing"
+    elif "AbilityActivate" in line_dict["effect"]:
+        if ability in abilities.engines:
+            return "engine"
+        elif ability in abilities.shields:
+            return "shield"
+        elif ability in abilities.systems:
+            return "system"
+        elif ability in ("Player Death", "Game End"):
+            return "death"
+    return "other"
+
+
+class TestAbilityIndex(TestCase):
+    NAMES = set(abilities.components) | set(abilities.copilots) | set(abilities.excluded_abilities) | \
+        set(ICONS.keys()) | {"", "Player Death", "Game End", "Railgun Charge", "Not an ability"}
+    EFFECTS = ("ApplyEffect {836045448945477}: Damage {836045448945501}",
+               "ApplyEffect {836045448945477}: Heal {836045448945500}",
+               "Event {836045448945472}: AbilityActivate {836045448945479}",
+               "RemoveEffect {836045448945478}: Lockdown {3389139914326016}")
+    PLAYER, ENEMY = "2963000048128", "2963000049645"
+
+    def test_frozensets(self):
+        for category, members in abilities.CATEGORIES.items():
+            self.assertEqual(members, frozenset(getattr(abilities, category)))
+        self.assertEqual(abilities.COMPONENTS, frozenset(abilities.components))
+        for name in self.NAMES:
+            for category, members in abilities.CATEGORIES.items():
+                self.assertEqual(name in members, name in getattr(abilities, category))
+
+    def test_index(self):
+        for name in self.NAMES:
+            categories = [c for c in abilities.CATEGORIES if name in getattr(abilities, c)]
+            if len(categories) == 0:
+                self.assertNotIn(name, abilities.ABILITIES)
+                continue
+            self.assertEqual(len(categories), 1)
+            category, ships, icon = abilities.ABILITIES[name]
+            self.assertEqual(category, categories[0])
+            self.assertEqual(
+                ships, {ship for ship in abilities.ships if name in abilities.ships_abilities[ship]})
+            self.assertEqual(icon, {k.lower(): v for k, v in ICONS.items()}.get(name.lower()))
+
+    def test_event_category(self):
+        for name in self.NAMES:
+            for effect in self.EFFECTS:
+                for source, target in ((self.PLAYER, self.ENEMY), (self.ENEMY, self.PLAYER),
+                                       (self.PLAYER, self.PLAYER), (self.ENEMY, self.ENEMY)):
+                    line = {"time": datetime.now(), "source": source, "target": target,
+                            "ability": name, "effect": effect, "amount": "0"}
+                    self.assertEqual(
+                        Parser.get_event_category(line.copy(), self.PLAYER),
+                        get_event_category(line, self.PLAYER), (name, effect, source, target))
@@ -0,0 +1,89 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import gzip
+import lzma
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+# Project Modules
+from parsing import archive
+from parsing.logindex import LogIndex
+from parsing.parser import Parser
+from parsing.splitter import split_combatlog_parallel
+from utils.directories import get_assets_directory
+
+
+class TestArchive(TestCase):
+    FILE = os.path.join(get_assets_directory(), "log.txt")
+    NAME = "combat_2017-12-26_11_27_00_541263.txt"
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        with open(self.FILE, "rb") as fi:
+            self.data = fi.read()
+        self.plain = os.path.join(self.directory.name, self.NAME)
+        with open(self.plain, "wb") as fo:
+            fo.write(self.data)
+        self.files = list()
+        compressors = [(".gz", gzip.compress), (".xz", lzma.compress)]
+        if archive.zstandard is not None:
+            compressors.append((".zst", archive.zstandard.ZstdCompressor().compress))
+        for extension, compress in compressors:
+            path = self.plain + extension
+            with open(path, "wb") as fo:
+                fo.write(compress(self.data))
+            self.files.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_names(self):
+        for path in self.files:
+            self.assertTrue(archive.is_compressed(path))
+            self.assertTrue(archive.is_supported(path))
+            self.assertEqual(archive.strip_extension(path), self.plain)
+            self.assertEqual(Parser.parse_filename(path), Parser.parse_filename(self.plain))
+        self.assertFalse(archive.is_compressed(self.plain))
+        self.assertFalse(archive.is_supported(self.plain + ".bz2"))
+        self.assertIsNone(Parser.parse_filename(self.plain + ".bz2"))
+
+    def test_open_log(self):
+        for path in self.files:
+            with archive.open_log(path) as fi:
+                self.assertEqual(fi.read(), self.data)
+            with archive.open_log(path, 1000) as fi:
+                self.assertEqual(fi.read(), self.data[1000:])
+
+    def test_read_file(self):
+        lines = Parser.read_file_raw(self.plain)
+        for path in self.files:
+            self.assertEqual(Parser.read_file_raw(path), lines)
+            self.assertEqual(list(Parser.stream_lines(path, 1000, 5000)),
+                             list(Parser.stream_lines(self.plain, 1000, 5000)))
+            self.assertEqual(Parser.read_gsf_in_file(path), Parser.read_gsf_in_file(self.plain))
+            self.assertEqual(Parser.get_player_name_raw(path), Parser.get_player_name_raw(self.plain))
+
+    def test_log_index(self):
+        plain = LogIndex.open(self.plain, self.directory.name)
+        for path in self.files:
+            index = LogIndex.open(path, self.directory.name)
+            self.assertEqual(len(index), len(plain))
+            self.assertEqual(index.spawns, plain.spawns)
+            self.assertEqual(index.match_timings, plain.match_timings)
+            self.assertEqual(
+                [event.to_dict() for event in index.read_spawn(len(index) - 1, 0)],
+                [event.to_dict() for event in plain.read_spawn(len(plain) - 1, 0)])
+
+    def test_split_parallel(self):
+        file_cube, match_timings, spawn_timings = Parser.split_combatlog_file(self.plain)
+        for path in self.files:
+            result = split_combatlog_parallel(path, workers=1, chunks=4)
+            self.assertEqual(result[1:], (match_timings, spawn_timings))
+            self.assertEqual(
+                [[[event.to_dict() for event in spawn] for spawn in match] for match in result[0]],
+                [[[event.to_dict() for event in spawn] for spawn in match] for match in file_cube])
@@ -0,0 +1,76 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+# Packages
+import numpy as np
+# Project Modules
+from parsing import export
+from parsing.fileanalyzer import FileAnalyzer
+from utils.directories import get_assets_directory
+
+
+class TestExport(TestCase):
+    FILE = os.path.join(get_assets_directory(), "log.txt")
+
+    def test_headless(self):
+        # The GUI dependencies may not be imported, they require a display
+        modules = ("tkinter", "PIL", "cv2", "pynput", "mss", "screeninfo")
+        code = "import sys; import parsing.export; print(','.join(m for m in {} if m in sys.modules))".format(modules)
+        environment = {key: value for key, value in os.environ.items() if key != "DISPLAY"}
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, "-c", code], env=environment, cwd=root)
+        self.assertEqual(output.decode().strip(), "")
+
+    def test_export_file(self):
+        # The shared FileCache is not used
+        with mock.patch.object(FileAnalyzer, "get_cache", side_effect=AssertionError):
+            rows, elapsed = export.export_file(self.FILE)
+        self.assertGreater(elapsed, 0.0)
+        analyzer = FileAnalyzer(self.FILE, cache=False)
+        levels = [row["level"] for row in rows]
+        self.assertEqual(levels.count("file"), 1)
+        self.assertEqual(levels.count("match"), len(analyzer.file_cube))
+        self.assertLessEqual(levels.count("spawn"), sum(len(match) for match in analyzer.file_cube))
+        for row in rows:
+            self.assertEqual(tuple(row.keys()), export.COLUMNS)
+        file_row = rows[0]
+        matches = [row for row in rows if row["level"] == "match"]
+        self.assertEqual(file_row["damage_dealt"], sum(row["damage_dealt"] for row in matches))
+        self.assertEqual(file_row["deaths"], len(analyzer.table.spawns))
+        rows, _ = export.export_file(self.FILE, ("match",))
+        self.assertEqual(rows, matches)
+
+    def test_batch(self):
+        with TemporaryDirectory() as directory:
+            files = list()
+            for name in ("combat_2017-12-26_11_27_00_541263.txt", "combat_2017-12-27_11_27_00_541263.txt"):
+                files.append(os.path.join(directory, name))
+                shutil.copy(self.FILE, files[-1])
+            exporter = export.BatchExporter(files, ("file",), workers=2)
+            rows = exporter.run()
+            self.assertEqual([row["date"] for row in rows], ["2017-12-26", "2017-12-27"])
+            self.assertEqual(exporter.statistics()["files"], 2)
+            self.assertRaises(ValueError, export.BatchExporter, files, ("event",))
+
+            export.write_rows(rows, os.path.join(directory, "out.csv"))
+            with open(os.path.join(directory, "out.csv")) as fi:
+                self.assertEqual([row["file_name"] for row in csv.DictReader(fi)], [row["file_name"] for row in rows])
+            export.write_rows(rows, os.path.join(directory, "out.jsonl"))
+            with open(os.path.join(directory, "out.jsonl")) as fi:
+                self.assertEqual([json.loads(line) for line in fi], rows)
+            export.write_rows(rows, os.path.join(directory, "out.npz"))
+            with np.load(os.path.join(directory, "out.npz")) as archive:
+                self.assertEqual(list(archive["healing"]), [row["healing"] for row in rows])
+            self.assertRaises(ValueError, export.write_rows, rows, os.path.join(directory, "out.xlsx"))
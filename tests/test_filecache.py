@@ -0,0 +1,49 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import os
+import shutil
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+# Project Modules
+from parsing.filecache import FileCache
+from parsing.fileanalyzer import FileAnalyzer
+from utils.directories import get_assets_directory
+
+
+class TestFileCache(TestCase):
+    FILE = os.path.join(get_assets_directory(), "log.txt")
+
+    def test_store_load(self):
+        with TemporaryDirectory() as directory:
+            cache = FileCache(os.path.join(directory, "cache"))
+            path = os.path.join(directory, "combat_2017-12-26_11_27_00_541263.txt")
+            shutil.copy(self.FILE, path)
+            analyzer = FileAnalyzer(path, cache=False)
+            analyzer.build_statistics()
+            cache.store(path, analyzer.player_list, analyzer.player_name, analyzer.file_cube,
+                        analyzer.match_timings, analyzer.spawn_timings, analyzer.statistics)
+            data = cache.load(path)
+            self.assertIsNotNone(data)
+            for key in ("player_list", "player_name", "match_timings", "spawn_timings", "statistics"):
+                self.assertEqual(data[key], getattr(analyzer, key))
+            self.assertEqual(
+                [[[event.to_dict() for event in spawn] for spawn in match] for match in data["file_cube"]],
+                [[[event.to_dict() for event in spawn] for spawn in match] for match in analyzer.file_cube])
+            # Growing the file invalidates the entry
+            with open(path, "a") as fo:
+                fo.write("\n")
+            self.assertIsNone(cache.load(path))
+            self.assertFalse(os.path.exists(cache.get_cache_path(path)))
+
+    def test_evict(self):
+        with TemporaryDirectory() as directory:
+            cache = FileCache(directory, max_size=0)
+            analyzer = FileAnalyzer(self.FILE, cache=False)
+            cache.store(self.FILE, analyzer.player_list, analyzer.player_name, analyzer.file_cube,
+                        analyzer.match_timings, analyzer.spawn_timings, dict())
+            self.assertFalse(os.path.exists(cache.get_cache_path(self.FILE)))
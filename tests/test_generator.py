@@ -0,0 +1,93 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+# Project Modules
+from parsing.folderengine import FolderEngine
+from parsing.folderindex import FolderIndex
+from parsing.parser import Parser
+from parsing.splitter import get_chunks, split_combatlog_parallel
+from parsing.timebase import milliseconds
+from tools.benchmark import BenchmarkSuite, compare
+from tools.generator import CombatLogGenerator, generate_folder
+
+
+class TestGenerator(TestCase):
+    def test_deterministic(self):
+        first, second = CombatLogGenerator(seed=1), CombatLogGenerator(seed=1)
+        self.assertEqual(list(first.generate()), list(second.generate()))
+        self.assertNotEqual(list(first.generate()), list(CombatLogGenerator(seed=2).generate()))
+
+    def test_structure(self):
+        generator = CombatLogGenerator(seed=3, matches=3, spawns=2, ships={"Sting": 1, "Quell": 1})
+        with TemporaryDirectory() as directory:
+            path = generate_folder(directory, 1, seed=3, matches=3, spawns=2, ships={"Sting": 1, "Quell": 1})[0]
+            self.assertIsNotNone(Parser.parse_filename(path))
+            lines = Parser.read_file(path)
+        self.assertEqual(Parser.get_player_name(lines), "Generator")
+        player_list = Parser.get_player_id_list(lines)
+        file_cube, match_timings, _ = Parser.split_combatlog(lines, player_list)
+        self.assertEqual([len(match) for match in file_cube], [2, 2, 2])
+        self.assertEqual(len(match_timings), 6)
+        list(generator.generate())
+        for match, ships in zip(file_cube, generator.loadouts):
+            for spawn, ship in zip(match, ships):
+                self.assertIn(ship, Parser.parse_spawn(spawn, player_list).candidates)
+        self.assertGreater(Parser.parse_file(file_cube, player_list).dmg_d, 0)
+
+    def test_pathological(self):
+        generator = CombatLogGenerator(seed=4, matches=2, rollover=True, undecodable=0.05)
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "combat_2018-01-01_00_00_00_000000.txt")
+            generator.write(path)
+            lines = Parser.read_file(path)
+            self.assertLess(len(lines), len(list(generator.generate())))
+        times = [milliseconds(line["time"]) for line in lines]
+        self.assertTrue(any(b < a for a, b in zip(times, times[1:])))  # Crosses midnight
+        file_cube, _, _ = Parser.split_combatlog(lines, Parser.get_player_id_list(lines))
+        self.assertEqual(len(file_cube), 2)
+        self.assertRaises(ValueError, CombatLogGenerator, ships={"X-Wing": 1})
+
+    def test_split_parallel(self):
+        generator = CombatLogGenerator(seed=5, matches=6, spawns=3, rollover=True, undecodable=0.02)
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "combat_2018-01-01_00_00_00_000000.txt")
+            generator.write(path)
+            chunks = get_chunks(path, 4)
+            self.assertEqual(len(chunks), 4)
+            self.assertEqual((chunks[0][0], chunks[-1][1]), (0, os.path.getsize(path)))
+            file_cube, match_timings, spawn_timings = Parser.split_combatlog_file(path)
+            for workers, amount in ((1, 4), (2, 4), (2, 100)):
+                result = split_combatlog_parallel(path, workers, amount)
+                self.assertEqual(result[1:], (match_timings, spawn_timings))
+                self.assertEqual(
+                    [[[event.to_dict() for event in spawn] for spawn in match] for match in result[0]],
+                    [[[event.to_dict() for event in spawn] for spawn in match] for match in file_cube])
+            serial = FolderEngine([path], 1, FolderIndex(os.path.join(directory, "a.db"))).run()
+            engine = FolderEngine([path], 2, FolderIndex(os.path.join(directory, "b.db")))
+            engine.CHUNK_SIZE = 1024
+            self.assertEqual(len(engine.get_tasks([path])), 2)
+            self.assertEqual(engine.run(), serial)
+            # Streamed with the player ID list read beforehand
+            engine = FolderEngine([path], 1, FolderIndex(os.path.join(directory, "c.db")))
+            engine.CHUNK_SIZE = 1024
+            self.assertIsNotNone(engine.get_player_list(path))
+            self.assertEqual(engine.run(), serial)
+
+    def test_benchmarks(self):
+        with TemporaryDirectory() as directory:
+            suite = BenchmarkSuite(directory, scale=0.05, repeat=1)
+            results = suite.run()
+        self.assertEqual(set(results["results"].keys()), set(BenchmarkSuite.NAMES))
+        for result in results["results"].values():
+            self.assertGreater(result["items"], 0)
+        results = json.loads(json.dumps(results))
+        self.assertEqual(set(compare(results, results).values()), {1.0})
+        self.assertRaises(ValueError, suite.run, ["parse_screen"])
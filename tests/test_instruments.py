@@ -0,0 +1,117 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+# Project Modules
+from utils import instruments
+from utils.directories import get_temp_directory
+
+
+@instruments.worker
+def record_in_worker(amount: int) -> int:
+    instruments.count("test.worker", amount)
+    return os.getpid()
+
+
+def enable_in_worker():
+    """Enable the registry in a worker, independent of the start method"""
+    instruments.REGISTRY.enable()
+
+
+class TestInstruments(TestCase):
+    def setUp(self):
+        self.enabled = instruments.REGISTRY.enabled
+        instruments.REGISTRY.enabled = True
+
+    def tearDown(self):
+        instruments.REGISTRY.enabled = self.enabled
+        instruments.REGISTRY.reset("test.")
+
+    def test_histogram(self):
+        rng = random.Random(0)
+        values = sorted(int(rng.lognormvariate(8, 2)) for _ in range(10000))
+        histogram = instruments.Histogram()
+        for value in values:
+            histogram.record(value)
+        for percentile in (50, 95, 99):
+            expected = values[int(percentile / 100 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(percentile) / expected, 1.0, delta=0.01)
+        self.assertEqual((histogram.min, histogram.max, histogram.total), (values[0], values[-1], sum(values)))
+        for value in range(2 ** 12):
+            self.assertEqual(instruments.get_bucket(instruments.get_bucket_value(instruments.get_bucket(value))),
+                             instruments.get_bucket(value))
+        other = instruments.Histogram.from_dict(histogram.to_dict())
+        other.merge(histogram)
+        self.assertEqual(other.count, 2 * len(values))
+        self.assertEqual(other.percentile(50), histogram.percentile(50))
+
+    def test_functions(self):
+        @instruments.timed("test.timed")
+        def function(value):
+            return value
+
+        self.assertEqual(function(1), 1)
+        with instruments.timing("test.timing"):
+            instruments.count("test.counter", 2)
+            instruments.gauge("test.gauge", 5)
+            instruments.gauge("test.gauge", 3)
+        registry = instruments.REGISTRY
+        self.assertEqual(registry.timer("test.timed").count, 1)
+        self.assertEqual(registry.timer("test.timing").count, 1)
+        self.assertEqual(registry.counter("test.counter").value, 2)
+        self.assertEqual(registry.gauge("test.gauge").to_dict()["max"], 5)
+        self.assertRaises(TypeError, registry.counter, "test.gauge")
+
+        registry.enabled = False
+        function(1)
+        instruments.count("test.counter")
+        instruments.count("test.disabled")
+        self.assertEqual(registry.timer("test.timed").count, 1)
+        self.assertEqual(registry.counter("test.counter").value, 2)
+        self.assertNotIn("test.disabled", registry)
+
+    def test_threads(self):
+        def record():
+            for _ in range(10000):
+                instruments.count("test.threads")
+                instruments.REGISTRY.timer("test.threads.timer").record(0.001)
+
+        threads = [Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(instruments.REGISTRY.counter("test.threads").value, 40000)
+        self.assertEqual(instruments.REGISTRY.timer("test.threads.timer").count, 40000)
+
+    def test_dump(self):
+        instruments.count("test.dump", 3)
+        instruments.REGISTRY.timer("test.dump.timer").record(0.5)
+        with TemporaryDirectory() as directory:
+            path = instruments.REGISTRY.dump(os.path.join(directory, "instruments.json"))
+            registry = instruments.Registry.load([path, path])
+        self.assertEqual(registry.counter("test.dump").value, 6)
+        self.assertEqual(registry.timer("test.dump.timer").count, 2)
+        self.assertAlmostEqual(registry.timer("test.dump.timer").percentile(99), 0.5, delta=0.005)
+
+    def test_worker(self):
+        with ProcessPoolExecutor(1, initializer=enable_in_worker) as executor:
+            pids = set(executor.map(record_in_worker, (1, 2)))
+        self.assertEqual(record_in_worker(1), os.getpid())
+        paths = [os.path.join(get_temp_directory(), "instruments_{}.json".format(pid)) for pid in pids]
+        try:
+            registry = instruments.Registry.load(paths)
+        finally:
+            for path in paths:
+                os.remove(path)
+        self.assertEqual(registry.counter("test.worker").value, 3)
+        self.assertFalse(os.path.exists(os.path.join(get_temp_directory(), "instruments_{}.json".format(os.getpid()))))
@@ -0,0 +1,62 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import os
+import shutil
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+# Project Modules
+from parsing.logindex import LogIndex
+from parsing.parser import Parser
+from utils.directories import get_assets_directory
+
+
+class TestLogIndex(TestCase):
+    FILE = os.path.join(get_assets_directory(), "log.txt")
+
+    def test_read_spawn(self):
+        lines = Parser.read_file(self.FILE)
+        player = Parser.get_player_id_list(lines)
+        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player)
+        with TemporaryDirectory() as directory:
+            index = LogIndex.open(self.FILE, directory)
+            self.assertEqual(len(index), len(file_cube))
+            self.assertEqual(index.player_list, player)
+            self.assertEqual(index.spawn_timings, spawn_timings)
+            self.assertEqual(index.match_timings, match_timings)
+            for i, match in enumerate(file_cube):
+                for j, spawn in enumerate(match):
+                    self.assertEqual(
+                        [event.to_dict() for event in index.read_spawn(i, j)],
+                        [event.to_dict() for event in spawn])
+
+    def test_persistence(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "combat_2017-12-26_11_27_00_541263.txt")
+            shutil.copy(self.FILE, path)
+            index = LogIndex.open(path, directory)
+            loaded = LogIndex.open(path, directory)
+            self.assertEqual(loaded.spawns, index.spawns)
+            self.assertEqual(loaded.match_timings, index.match_timings)
+            with open(path, "a") as fo:
+                fo.write("[21:42:09.316] [@Redfantom] [@Redfantom] [Safe Login {973870949466112}] "
+                         "[ApplyEffect {836045448945477}: Safe Login Immunity {973870949466372}] ()\n")
+            self.assertEqual(LogIndex.open(path, directory).key, LogIndex.get_key(path))
+
+    def test_prune(self):
+        with TemporaryDirectory() as directory:
+            paths = list()
+            for name in ("combat_2017-12-26_11_27_00_541263.txt", "combat_2018-01-02_18_01_00_541263.txt"):
+                paths.append(os.path.join(directory, name))
+                shutil.copy(self.FILE, paths[-1])
+                LogIndex.open(paths[-1], directory)
+            os.remove(paths[0])
+            LogIndex.prune(directory)
+            indices = [name for name in os.listdir(directory) if name.endswith(LogIndex.EXTENSION)]
+            self.assertEqual(len(indices), 1)
+            self.assertIsNotNone(LogIndex.load(os.path.join(directory, indices[0]), paths[1]))
+            self.assertEqual(len(LogIndex.open(paths[1], directory)), Parser.read_match_count(paths[1]))
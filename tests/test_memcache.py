@@ -0,0 +1,77 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+# Project Modules
+from parsing.fileanalyzer import FileAnalyzer
+from parsing.filecache import FileCache
+from parsing.memcache import MemoryCache, memory_cache
+from parsing.parser import Parser
+from utils.directories import get_assets_directory
+
+
+class TestMemoryCache(TestCase):
+    def setUp(self):
+        # Shared FileAnalyzers are cached in a temporary directory
+        self.directory = TemporaryDirectory()
+        self.cache, FileAnalyzer._cache = FileAnalyzer._cache, FileCache(self.directory.name)
+
+    def tearDown(self):
+        FileAnalyzer._cache = self.cache
+        self.directory.cleanup()
+
+    def test_budget(self):
+        cache = MemoryCache(budget=100)
+        cache.put("a", 1, 40)
+        cache.put("b", 2, 40)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now least recently used
+        cache.put("c", 3, 40)
+        self.assertTrue("a" in cache)
+        self.assertFalse("b" in cache)
+        self.assertEqual(cache.size, 80)
+        self.assertEqual(cache.evictions, 1)
+        cache.put("d", 4, 101)
+        self.assertFalse("d" in cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_statistics(self):
+        cache = MemoryCache(budget=100)
+        loads = list()
+        for _ in range(3):
+            value = cache.get_or_load("key", lambda: loads.append(None) or "value", lambda _: 10)
+            self.assertEqual(value, "value")
+        self.assertEqual(len(loads), 1)
+        statistics = cache.statistics()
+        self.assertEqual((statistics["hits"], statistics["misses"]), (2, 1))
+        self.assertAlmostEqual(statistics["hit_ratio"], 2 / 3)
+        cache.clear()
+        self.assertEqual(cache.statistics()["entries"], 0)
+
+    def test_file_analyzer(self):
+        path = os.path.join(get_assets_directory(), "log.txt")
+        analyzer = FileAnalyzer.open(path)
+        hits = memory_cache.hits
+        self.assertIs(FileAnalyzer.open(path), analyzer)
+        self.assertEqual(memory_cache.hits, hits + 1)
+        self.assertGreater(analyzer.nbytes, 0)
+
+    def test_shared_events(self):
+        path = os.path.join(get_assets_directory(), "log.txt")
+        analyzer = FileAnalyzer.open(path)
+        spawn = analyzer.file_cube[0][0]
+        original = [event.to_dict() for event in spawn]
+        events = Parser.parse_player_reaction_time(analyzer.get_spawn(0, 0), analyzer.player_name)
+        for event in events:
+            Parser.get_event_category(event, analyzer.player_list)
+            event["effects"] = tuple()
+        del events[0]
+        Parser.build_spawn_from_match(analyzer.get_match(0))[0]["color"] = "#ffffff"
+        Parser.parse_player_reaction_time(Parser.build_spawn_from_match(analyzer.file_cube[0]), analyzer.player_name)
+        self.assertIs(analyzer.file_cube[0][0], spawn)
+        self.assertEqual([event.to_dict() for event in spawn], original)
@@ -5,12 +5,90 @@ License: GNU GPLv3 as in LICENSE.md
 Copyright (C) 2016-2018 RedFantom
 """
 # Standard Library
+import json
 import os
+import pickle
+import shutil
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from datetime import datetime
 # Project Modules
+from data import abilities
+from parsing.accumulator import SpawnStats
+from parsing.effectsresolver import EffectsResolver
+from parsing.event import Event
+from parsing.eventtable import EventTable
+from parsing.fileanalyzer import FileAnalyzer
+from parsing.filecache import FileCache
+from parsing.filescanner import FileScanner
+from parsing.folderengine import FolderEngine
+from parsing.folderindex import FolderIndex
+from parsing.gsfindex import GSFIndex
+from parsing.logindex import LogIndex
 from parsing.parser import Parser
+from parsing.reactiontime import ReactionTimes
+from parsing.timebase import seconds_between
+from parsing import tokenizer
 from utils.directories import get_assets_directory
+from variables import colors
+
+
+def legacy_reaction_time(spawn: list, name: str) -> list:
+    """
+    Reference of the response events, the implementation of
+    Parser.parse_player_reaction_time before ReactionTimes
+    """
+    player = Parser.get_player_id_list(spawn)
+    # Build list of all damage taken type events
+    dmgt_events = list()
+    for event in [e for e in spawn if "Damage Overcharge" not in e["line"]]:
+        event_type = Parser.get_event_category(event, player)
+        if "dmgt" not in event_type:
+            continue
+        dmgt_events.append(event)
+    # Build list of individual attacks
+    attacks = dict()
+    for attack in dmgt_events.copy():
+        if attack not in dmgt_events:
+            continue
+        player_id, attack_start = attack["target"], attack["time"]
+        attacks[attack_start] = [attack]
+        for event in dmgt_events[dmgt_events.copy().index(attack):]:
+            if event["target"] != player_id:  # Death in between
+                break
+            elif (event["time"] - attack_start).total_seconds() > 5:
+                break
+            attacks[attack["time"]].append(event)
+            attack_start = event["time"]
+            dmgt_events.remove(event)
+        if attack in dmgt_events:
+            dmgt_events.remove(attack)
+    for time, events in attacks.copy().items():
+        if len(events) < 2:
+            del attacks[time]
+    enemies = {time: [event["source"] for event in events] for time, events in attacks.items()}
+    # Find responses of player for each attack
+    responses = list()
+    for i, (time, attack) in enumerate(sorted(attacks.items(), key=lambda t: t[0])):
+        attack_start, attack_end = attack[0], attack[-1]
+        events = spawn[spawn.index(attack_start):]
+        applied = False
+        for event in events:
+            if event["target"] not in enemies[time] and event["self"] is False:
+                continue
+            elif "AbilityActivate" not in event["line"] or event["ability"] in abilities.systems:
+                continue
+            elif event["ability"] in ("Railgun Charge", "Wingman", "Lingering Effect", "Scope Mode"):
+                continue
+            if (event["time"] - attack_start["time"]).total_seconds() > 10:
+                break
+            responses.append(Parser.create_response_event(attack_start, attack_end, event, name, attack, i))
+            applied = True
+            break
+        if applied is False:
+            event = events[-1]
+            responses.append(Parser.create_response_event(attack_start, attack_end, event, name, attack, i))
+    return responses
 
 
 class TestParser(TestCase):
@@ -28,10 +106,37 @@ class TestParser(TestCase):
              "[Event {836045448945472}: AbilityActivate {836045448945479}] " \
              "()\n"
 
+    def setUp(self):
+        # The event colors are required by Parser.line_to_event_dictionary
+        colors.set_scheme("bright")
+        # Shared FileAnalyzers are cached in a temporary directory
+        self.directory = TemporaryDirectory()
+        self.cache, FileAnalyzer._cache = FileAnalyzer._cache, FileCache(self.directory.name)
+
+    def tearDown(self):
+        FileAnalyzer._cache = self.cache
+        self.directory.cleanup()
+
     def test_read_file(self):
         lines = Parser.read_file(self.FILE)
         self.assertIsInstance(lines, list)
-        self.assertIsInstance(lines[0], dict)
+        self.assertIsInstance(lines[0], Event)
+
+    def test_event(self):
+        line_dict = Parser.line_to_dictionary(self.LINE)
+        event = Event(line_dict)
+        self.assertEqual(event.to_dict(), dict(line_dict, line=event.line))
+        for key in ("Quad Laser Cannon", "ApplyEffect", "Damage", "2963000048128"):
+            self.assertTrue(key in event["line"])
+        event["color"] = "#ffffff"
+        self.assertTrue("color" in event)
+        self.assertFalse("icon" in event)
+        self.assertEqual(event.get("icon", "default"), "default")
+        self.assertEqual(Parser.line_to_dictionary(event), event)
+        self.assertFalse(Parser.is_ignorable(event))
+        line_dict = Parser.line_to_dictionary(self.EFFECT.replace("Wingman", "SetLevel"))
+        self.assertTrue(Parser.is_ignorable(line_dict))
+        self.assertTrue(Parser.is_ignorable(Event(line_dict)))
 
     def test_line_to_dictionary(self):
         line_dict = Parser.line_to_dictionary(self.LINE)
@@ -49,6 +154,211 @@ class TestParser(TestCase):
         self.assertTrue("Damage" in line_dict["effect"])
         self.assertEqual(int(line_dict["amount"]), 296)
 
+    def test_line_to_dictionary_tokenizer(self):
+        with open(self.FILE, "rb") as fi:
+            lines = [line.decode() for line in fi.readlines()]
+        lines += Parser.read_file_raw(self.FILE) + [self.LINE, self.EFFECT]
+        for line in lines:
+            self.assertEqual(tokenizer.tokenize_line(line), Parser.line_to_dictionary_legacy(line))
+        self.assertEqual(
+            tokenizer.decode_time("22:00:04.473"), datetime.strptime("22:00:04.473", Parser.TIME_FORMAT))
+
+    def test_event_table(self):
+        lines = Parser.read_file(self.FILE)
+        player = Parser.get_player_id_list(lines)
+        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player)
+        table = Parser.read_event_table(self.FILE)
+        self.assertIsInstance(table, EventTable)
+        self.assertEqual(len(table.matches), len(file_cube))
+        self.assertEqual(len(table), sum(len(spawn) for match in file_cube for spawn in match))
+        self.assertEqual(table.match_timings, match_timings)
+        self.assertEqual(table.spawn_timings, spawn_timings)
+        self.assertEqual(Parser.parse_file(table, player), Parser.parse_file(file_cube, player))
+        for i, match in enumerate(file_cube):
+            self.assertEqual(Parser.parse_match(table.match(i), player), Parser.parse_match(match, player))
+            for j, spawn in enumerate(match):
+                self.assertEqual(Parser.parse_spawn(table.spawn(i, j), player), Parser.parse_spawn(spawn, player))
+
+    def test_stream_matches(self):
+        lines = Parser.read_file(self.FILE)
+        player = Parser.get_player_id_list(lines)
+        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player)
+        matches = list(Parser.stream_matches(self.FILE))
+        self.assertEqual(len(matches), len(file_cube))
+        for (match, player_list, timing, spawns), expected, start, end, expected_spawns in zip(
+                matches, file_cube, match_timings[::2], match_timings[1::2], spawn_timings):
+            self.assertEqual(
+                [[event.to_dict() for event in spawn] for spawn in match],
+                [[event.to_dict() for event in spawn] for spawn in expected])
+            self.assertEqual(player_list, player)
+            self.assertEqual(timing, (start, end))
+            self.assertEqual(spawns, expected_spawns)
+        for streamed, read in zip(matches, Parser.read_matches(self.FILE)):
+            self.assertEqual(streamed[1:], read[1:])
+            self.assertEqual(
+                [[event.to_dict() for event in spawn] for spawn in streamed[0]],
+                [[event.to_dict() for event in spawn] for spawn in read[0]])
+
+    def test_split_player_list(self):
+        # The self-targeted event of 111 is only in the first match
+        lines = [
+            "[22:00:00.000] [111] [111] [Quad Laser Cannon {1}] [Event {2}: AbilityActivate {3}] ()",
+            "[22:00:01.000] [111] [222] [Quad Laser Cannon {1}] [ApplyEffect {4}: Damage {5}] (100 energy {6})",
+            "[22:00:30.000] [@Player] [@Player] [Safe Login {7}] [ApplyEffect {8}: Safe Login Immunity {9}] ()",
+            "[22:01:00.000] [444] [111] [Quad Laser Cannon {1}] [ApplyEffect {4}: Damage {5}] (100 energy {6})",
+            "[22:01:01.000] [333] [333] [Quad Laser Cannon {1}] [Event {2}: AbilityActivate {3}] ()",
+            "[22:01:30.000] [@Player] [@Player] [Safe Login {7}] [ApplyEffect {8}: Safe Login Immunity {9}] ()",
+        ]
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "combat_2017-12-26_11_27_00_541263.txt")
+            with open(path, "w") as fo:
+                fo.write("\n".join(lines) + "\n")
+            self.assertEqual(Parser.read_player_id_list(path), ["111", "333"])
+            file_cube, _, _ = Parser.split_combatlog_file(path)
+            self.assertEqual([len(match) for match in file_cube], [1, 2])
+            self.assertEqual([len(match) for match, _, _, _ in Parser.stream_matches(path)], [1, 2])
+            self.assertEqual([len(match) for match, _, _, _ in Parser.read_matches(path)], [1, 2])
+            self.assertEqual([len(match) for match in FileAnalyzer(path, cache=False).file_cube], [1, 2])
+            self.assertEqual([len(spawns) for spawns in LogIndex.open(path, directory).spawns], [1, 2])
+
+    def test_folder_engine(self):
+        with TemporaryDirectory() as directory:
+            serial = FolderEngine([self.FILE, self.FILE], 1, FolderIndex(os.path.join(directory, "a.db"))).run()
+            index = FolderIndex(os.path.join(directory, "b.db"))
+            self.assertEqual(FolderEngine([self.FILE, self.FILE], 2, index).run(), serial)
+            engine = FolderEngine([self.FILE, self.FILE], 1, index=False)
+            self.assertIsNone(engine.index)
+            self.assertEqual(engine.run(), serial)
+            index = FolderIndex(index.path)
+            self.assertTrue(index.load())
+            self.assertTrue(self.FILE in index)
+            self.assertEqual(FolderEngine([self.FILE, self.FILE], 2, index).run(), serial)
+            # Modified files are parsed again
+            path = os.path.join(directory, "combat_2017-12-26_11_27_00_541263.txt")
+            shutil.copy(self.FILE, path)
+            index.put(path, serial)
+            with open(path, "a") as fo:
+                fo.write("\n")
+            self.assertFalse(path in index)
+        lines = Parser.read_file(self.FILE)
+        player = Parser.get_player_id_list(lines)
+        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player)
+        stats = Parser.parse_file(file_cube, player)
+        self.assertEqual(serial.abilities, {ability: 2 * amount for ability, amount in stats.abilities.items()})
+        self.assertEqual(serial.spawns, 2 * sum(len(match) for match in file_cube))
+        self.assertAlmostEqual(serial.duration, 2 * sum(
+            seconds_between(start, end) for start, end in zip(match_timings[::2], match_timings[1::2])))
+        stats.duration = serial.duration / 2
+        self.assertEqual(serial, stats + stats)
+        with TemporaryDirectory() as directory:
+            engine = FolderEngine([self.FILE, self.FILE], workers=1, index=FolderIndex(os.path.join(directory, "c.db")))
+            engine.cancel()
+            self.assertIsNone(engine.run())
+
+    def test_spawn_stats(self):
+        lines = Parser.read_file(self.FILE)
+        player = Parser.get_player_id_list(lines)
+        file_cube, _, _ = Parser.split_combatlog(lines, player)
+        spawns = [Parser.parse_spawn(spawn, player) for match in file_cube for spawn in match]
+        self.assertEqual([stats.spawns for stats in spawns], [1] * len(spawns))
+        for stats in spawns:
+            self.assertIsNotNone(stats.candidates)
+        # Incremental accumulation
+        stats = SpawnStats()
+        for event in file_cube[0][0]:
+            stats.add_event(event, player)
+        stats.close()
+        self.assertEqual(stats, spawns[0])
+        # Merging is associative and the empty SpawnStats is its identity
+        total = Parser.parse_file(file_cube, player)
+        self.assertEqual(sum(spawns, SpawnStats()), total)
+        self.assertEqual(spawns[0] + (spawns[1] + spawns[2]), (spawns[0] + spawns[1]) + spawns[2])
+        self.assertEqual(SpawnStats() + total, total + SpawnStats())
+        self.assertIsNone(total.candidates)
+        self.assertEqual(total.spawns, total.uncounted + sum(total.ships.values()))
+        # Serialization
+        self.assertEqual(SpawnStats.from_dict(json.loads(json.dumps(total.to_dict()))), total)
+        self.assertEqual(pickle.loads(pickle.dumps(total)), total)
+
+    def test_entity_registry(self):
+        analyzer = FileAnalyzer(self.FILE, cache=False)
+        for i, match in enumerate(analyzer.file_cube):
+            entities = analyzer.get_entities(i)
+            self.assertIs(analyzer.get_entities(i), entities)
+            stats = analyzer.parse_match(i)
+            totals = entities.get_statistics()
+            for key, value in totals.items():
+                self.assertEqual(value, getattr(stats, key))
+            events = [event for spawn in match for event in spawn]
+            self.assertEqual(entities.enemy_ids, list(dict.fromkeys(stats.enemies)))
+            self.assertTrue(all(entities.is_player[entities.index[id]] for id in analyzer.player_list if id in entities))
+            enemy_dmg_d, enemy_dmg_t = entities.get_enemy_damage()
+            for enemy in entities.enemy_ids:
+                self.assertEqual(enemy_dmg_t[enemy], sum(
+                    e["damage"] for e in events if e["target"] == enemy and "Damage" in e["effect"]
+                    and e["source"] in analyzer.player_list))
+                self.assertEqual(enemy_dmg_d[enemy], sum(
+                    e["damage"] for e in events if e["source"] == enemy and "Damage" in e["effect"]
+                    and e["target"] in analyzer.player_list))
+            self.assertEqual(entities.killsassists, sum(damage > 0 for damage in enemy_dmg_t.values()))
+
+    def test_file_scanner(self):
+        with TemporaryDirectory() as directory:
+            files = list()
+            for name in ("combat_2017-12-26_11_27_00_541263.txt", "combat_2018-01-02_18_01_00_541263.txt"):
+                files.append(os.path.join(directory, name))
+                shutil.copy(self.FILE, files[-1])
+            files.append(os.path.join(directory, "combat_2018-01-03_18_01_00_541263.txt"))
+            with open(files[-1], "w") as fo:
+                fo.write("[21:42:09.316] [@Redfantom] [@Redfantom] [Safe Login {973870949466112}] "
+                         "[ApplyEffect {836045448945477}: Safe Login Immunity {973870949466372}] ()\n")
+            self.assertEqual(FileScanner.sort_files(files), files[::-1])
+            index = GSFIndex(os.path.join(directory, "gsfindex.db"))
+            for workers in (1, 2, 2):
+                unused = GSFIndex(os.path.join(directory, "unused.db"))
+                scanner = FileScanner(files, workers, index if workers == 2 else unused)
+                scanner.start()
+                scanner.join()
+                results = {file: entry for file, entry in scanner.poll()}
+                self.assertTrue(scanner.done)
+                self.assertEqual([results[file]["matches"] for file in files], [4, 4, 0])
+                self.assertEqual([results[file]["gsf"] for file in files], [True, True, False])
+                self.assertEqual(results[files[0]]["player"], "Redfantom")
+            # A cancelled scan does not prune or store the index
+            cancelled, removed = GSFIndex(os.path.join(directory, "cancelled.db")), os.path.join(directory, "removed")
+            open(removed, "w").close()
+            cancelled.put(removed, results[files[2]])
+            os.remove(removed)
+            scanner = FileScanner(files, 1, cancelled)
+            scanner.cancel()
+            scanner.start()
+            scanner.join()
+            self.assertEqual(scanner.poll(), [])
+            self.assertEqual(len(cancelled), 1)
+            self.assertFalse(os.path.exists(cancelled.path))
+            # Entries of unchanged files are taken from the index
+            loaded = GSFIndex(index.path)
+            self.assertTrue(loaded.load())
+            self.assertEqual(loaded.get(files[0]), results[files[0]])
+            with open(files[0], "a") as fo:
+                fo.write(open(files[2]).read())
+            self.assertIsNone(loaded.get(files[0]))
+            self.assertEqual(loaded.get_entry(files[0])["matches"], 4)
+
+    def test_file_analyzer(self):
+        lines = Parser.read_file(self.FILE)
+        player = Parser.get_player_id_list(lines)
+        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player)
+        analyzer = FileAnalyzer.open(self.FILE)
+        self.assertIs(FileAnalyzer.open(self.FILE), analyzer)
+        self.assertEqual(analyzer.player_list, player)
+        self.assertEqual(analyzer.player_name, Parser.get_player_name(lines))
+        self.assertEqual(analyzer.match_timings, match_timings)
+        self.assertEqual(analyzer.spawn_timings, spawn_timings)
+        self.assertEqual(analyzer.parse_file(), Parser.parse_file(file_cube, player))
+        for i, match in enumerate(file_cube):
+            self.assertEqual(analyzer.parse_match(i), Parser.parse_match(match, player))
+
     def test_get_abilities_dict(self):
         lines = Parser.read_file(self.FILE)
         player = Parser.get_player_id_list(lines)
@@ -69,6 +379,52 @@ class TestParser(TestCase):
         # Tests get_effects_eligible
         self.assertFalse(Parser.get_effects_ability(lines[no_effect], lines, "2963000048240"))
 
+    def test_effects_resolver(self):
+        def normalize(event):
+            if event is None or not event.get("effects"):
+                return event if event is None else dict(event.items())
+            event = dict(event.items())
+            event["effects"] = {
+                name: dict(effect, start=effect["start"]["line"]) for name, effect in event["effects"].items()}
+            return event
+
+        cubes = list()
+        for _ in range(2):  # Event dictionaries are built in-place
+            lines = Parser.read_file(self.FILE)
+            player = Parser.get_player_id_list(lines)
+            cubes.append(Parser.split_combatlog(lines, player)[0])
+        for legacy, resolved in zip(*cubes):
+            for spawn, resolved_spawn in zip(legacy, resolved):
+                self.assertEqual(
+                    [normalize(Parser.line_to_event_dictionary(line, player, spawn)) for line in spawn],
+                    [normalize(event) for event in EffectsResolver.resolve(resolved_spawn, player)])
+
+    def test_reaction_times(self):
+        lines = Parser.read_file(self.FILE)
+        player = Parser.get_player_id_list(lines)
+        file_cube, _, _ = Parser.split_combatlog(lines, player)
+        attacks, latencies = list(), list()
+        for match in file_cube:
+            spawns, percentiles = ReactionTimes.for_match(match, "Player")
+            for spawn, reactions in zip(match, spawns):
+                self.assertEqual(len(reactions.responses), len(reactions.attacks))
+                self.assertEqual(reactions.responses, legacy_reaction_time(list(spawn), "Player"))
+                events = Parser.parse_player_reaction_time(list(spawn), "Player")
+                self.assertEqual(events[len(spawn):], reactions.responses)
+                latencies.extend(reactions.latencies)
+            attacks.append([len(reactions.attacks) for reactions in spawns])
+            if len(percentiles) != 0:
+                self.assertLessEqual(percentiles[50], percentiles[90])
+                self.assertLessEqual(percentiles[90], percentiles[99])
+        # Results of the legacy implementation for the file
+        self.assertEqual(attacks, [[1, 1], [3, 1], [2, 1, 2, 1, 3, 2], [3]])
+        expected = [1.112, 0.72, 0.73, 0.689, 1.61, 1.002, 5.6, 0.0, 0.392, 1.018, 1.222, 1.707]
+        self.assertEqual(len(latencies), len(expected))
+        for latency, reference in zip(latencies, expected):
+            self.assertAlmostEqual(latency, reference, places=3)
+        self.assertEqual(ReactionTimes.get_percentiles([1.0, 2.0, 3.0])[50], 2.0)
+        self.assertEqual(ReactionTimes.format_percentiles({}), "-")
+
     def test_get_event_category(self):
         line = Parser.line_to_dictionary(self.LINE)
         self.assertEqual(Parser.get_event_category(line, "2963000048240"), "dmgt_pri")
@@ -0,0 +1,64 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import random
+from unittest import TestCase
+# Project Modules
+from data import abilities
+from parsing.parser import Parser
+from parsing.shipdetect import ShipDetector, get_ships_for_abilities
+
+
+def get_ship_for_dict(abilities_dict: dict) -> list:
+    """Reference implementation narrowing down lists of ships"""
+    ships_list = abilities.ships.copy()
+    for ability in abilities_dict.keys():
+        if ability not in abilities.components or ability in abilities.excluded_abilities:
+            continue
+        ships_list = [ship for ship in ships_list if ability in abilities.ships_abilities[ship]]
+    return ships_list
+
+
+class TestShipDetector(TestCase):
+    def test_single_abilities(self):
+        for ability in set(abilities.components):
+            expected = [ship for ship in abilities.ships if ability in abilities.ships_abilities[ship]]
+            if ability in abilities.excluded_abilities:
+                expected = abilities.ships
+            detector = ShipDetector(components_only=True)
+            detector.add(ability)
+            self.assertEqual(detector.candidates, expected)
+            self.assertEqual(Parser.get_ship_for_dict({ability: 1}), expected)
+
+    def test_random_sets(self):
+        generator = random.Random(2018)
+        names = list(set(abilities.components) | set(abilities.excluded_abilities))
+        for ship in abilities.ships:
+            for _ in range(25):
+                used = generator.sample(list(abilities.ships_abilities[ship]), 4) + generator.sample(names, 1)
+                self.assertEqual(Parser.get_ship_for_dict(dict.fromkeys(used)), get_ship_for_dict(dict.fromkeys(used)))
+                self.assertIn(ship, get_ship_for_dict(dict.fromkeys(used[:4])))
+
+    def test_ambiguity(self):
+        detector = ShipDetector()
+        self.assertTrue(detector.ambiguous)
+        self.assertEqual(detector.candidates, abilities.ships)
+        detector.add("Wingman")  # Excluded
+        self.assertEqual(detector.candidates, abilities.ships)
+        for ability in abilities.ships_abilities["Rycer"]:
+            detector.add(ability)
+        self.assertEqual(detector.candidates, ["Rycer"])
+        self.assertFalse(detector.ambiguous)
+        detector.reset()
+        self.assertEqual(len(detector.candidates), len(abilities.ships))
+
+    def test_dual_weapons(self):
+        secondaries = [a for a in abilities.ships_abilities["Mangler"] if a in abilities.secondaries][:2]
+        if len(secondaries) == 2:
+            self.assertTrue(set(get_ships_for_abilities(secondaries)).issubset(abilities.ships_dual_secondaries))
+        with self.assertRaises(ValueError):
+            get_ships_for_abilities(["Not an ability"])
@@ -0,0 +1,29 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from unittest import TestCase
+# Project Modules
+from parsing.shipdetect import get_ships_for_abilities
+from parsing.symbols import SymbolTable, symbols
+
+
+class TestSymbolTable(TestCase):
+    def test_intern(self):
+        table = SymbolTable()
+        self.assertEqual(table.intern(""), 0)
+        code = table.intern("Quad Laser Cannon")
+        self.assertEqual(table.intern("Quad Laser Cannon"), code)
+        self.assertNotEqual(table.intern("2963000048128"), code)
+        self.assertEqual(table.lookup(code), "Quad Laser Cannon")
+        self.assertTrue("Quad Laser Cannon" in table)
+        self.assertFalse("Rapid-fire Laser Cannon" in table)
+        self.assertEqual(table.code_set(("", "Quad Laser Cannon")), frozenset((0, code)))
+
+    def test_ships_for_abilities(self):
+        names = ["Quad Laser Cannon", "Wingman"]
+        codes = [symbols.intern(name) for name in names]
+        self.assertEqual(get_ships_for_abilities(names), get_ships_for_abilities(codes))
@@ -0,0 +1,45 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE.md
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from datetime import date, datetime, timedelta
+from unittest import TestCase
+# Project Modules
+from parsing import timebase
+from parsing.event import Event
+
+
+class TestTimeBase(TestCase):
+    def test_milliseconds(self):
+        moment = datetime.strptime("23:59:58.917", "%H:%M:%S.%f")
+        self.assertEqual(timebase.milliseconds(moment), timebase.decode("23:59:58.917"))
+        self.assertEqual(timebase.to_datetime(timebase.decode("23:59:58.917")), moment)
+        self.assertEqual(timebase.to_datetime(timebase.DAY + 1, date(2018, 1, 1)),
+                         datetime(2018, 1, 2, 0, 0, 0, 1000))
+
+    def test_rollover(self):
+        before, after = timebase.decode("23:59:58.917"), timebase.decode("00:00:01.417")
+        self.assertEqual(timebase.elapsed(before, after), 2500)
+        self.assertEqual(timebase.elapsed(after, before), timebase.DAY - 2500)
+        self.assertEqual(timebase.elapsed(after, after - 200), -200)
+        self.assertEqual(timebase.unroll([before, after, after - 200, before]),
+                         [before, after + timebase.DAY, after + timebase.DAY - 200, before + timebase.DAY])
+        start, end = datetime(1900, 1, 1, 23, 59, 30), datetime(1900, 1, 1, 0, 1, 0)
+        self.assertEqual(timebase.seconds_between(start, end), 90.0)
+
+    def test_timeline_value(self):
+        for ms in range(0, 2 * 60 * 1000, 7):
+            moment = timebase.to_datetime(ms)
+            expected = float("{}.{}{}".format(moment.minute, int((moment.second / 60) * 100), moment.microsecond))
+            self.assertEqual(timebase.to_float(ms), expected)
+
+    def test_event(self):
+        event = Event({"time": datetime(1900, 1, 1, 12, 0, 1), "source": "a", "target": "a"})
+        self.assertEqual(timebase.get_milliseconds(event), 12 * 3600 * 1000 + 1000)
+        event["time"] += timedelta(milliseconds=5)
+        self.assertEqual(event.ms, 12 * 3600 * 1000 + 1005)
+        self.assertEqual(timebase.get_milliseconds(event.to_dict()), event.ms)
+        self.assertNotIn("ms", event.to_dict())
@@ -0,0 +1,288 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+import argparse
+from datetime import datetime
+import gzip
+import json
+import lzma
+import os
+import platform
+import subprocess
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+# Project Modules
+from parsing import tokenizer
+from parsing.effectsresolver import EffectsResolver
+from parsing.event import Event
+from parsing.folderengine import FolderEngine
+from parsing.parser import Parser
+from parsing.splitter import split_combatlog_parallel
+from tools.generator import CombatLogGenerator, generate_folder, get_file_name
+from variables import colors
+
+"""
+Benchmark suite for the parsing functions on synthetic CombatLogs. Run
+from the repository root with:
+python -m tools.benchmark [-o results.json] [-c previous.json]
+-o: file to write the results to as JSON
+-c: results of an earlier run to compare against
+-s: scale of the generated CombatLogs
+-r: amount of repetitions of each benchmark
+-b: names of the benchmarks to run
+-w: amount of worker processes for parse_folder and split_parallel
+"""
+
+DESCRIPTION = "GSF Parser Benchmarks"
+
+VERSION = 1
+
+BENCHMARK = Tuple[Callable[[], Any], Callable[[Any], Any], int]  # setup, function, items
+
+
+class BenchmarkSuite(object):
+    """
+    Times the parsing functions on CombatLogs by the CombatLogGenerator
+
+    Each benchmark is set up before every repetition and its function
+    is timed separately, so that functions that modify their input can
+    be repeated. The minimum time is the most reliable, the other
+    values are included to judge the noise of a run.
+    """
+
+    NAMES = (
+        "line_to_dictionary", "read_file", "read_gzip", "read_xz", "split_combatlog", "split_parallel", "parse_file", "parse_folder",
+        "line_to_event_dictionary", "effects_resolver",
+    )
+
+    def __init__(self, directory: str, scale: float = 1.0, repeat: int = 3, seed: int = 0, workers: int = 1):
+        """
+        :param directory: Directory to generate the CombatLogs in
+        :param scale: Scale of the CombatLogs, 1.0 is a file of four
+            matches of four spawns of a minute each
+        :param repeat: Amount of repetitions of each benchmark
+        :param seed: Seed of the CombatLogGenerator
+        :param workers: Amount of worker processes for parse_folder
+            and split_parallel
+        """
+        self.directory = directory
+        self.scale = scale
+        self.repeat = repeat
+        self.seed = seed
+        self.workers = workers
+        self.file = os.path.join(directory, get_file_name(datetime(2017, 12, 31)))
+        self.folder = os.path.join(directory, "folder")
+        self._lines: List[str] = None
+        self._events: List[Event] = None
+        # Size in bytes of the file read by the read benchmarks
+        self.sizes: Dict[str, int] = dict()
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+        return {"scale": self.scale, "repeat": self.repeat, "seed": self.seed, "workers": self.workers}
+
+    def setup(self):
+        """Generate the CombatLogs of the benchmarks"""
+        # The event colors are required by Parser.line_to_event_dictionary
+        if len(colors.current_scheme) == 0:
+            colors.set_scheme("bright")
+        CombatLogGenerator(self.seed, matches=max(int(4 * self.scale), 1)).write(self.file)
+        os.makedirs(self.folder, exist_ok=True)
+        generate_folder(self.folder, max(int(4 * self.scale), 1), seed=self.seed)
+        with open(self.file, "rb") as fi:
+            data = fi.read()
+        for extension, compress in ((".gz", gzip.compress), (".xz", lzma.compress)):
+            with open(self.file + extension, "wb") as fo:
+                fo.write(compress(data))
+        self.sizes = {name: os.path.getsize(self.file + extension)
+                      for name, extension in (("read_file", ""), ("read_gzip", ".gz"), ("read_xz", ".xz"))}
+        self._lines = Parser.read_file_raw(self.file)
+        self._events = Parser.read_file(self.file)
+
+    def run(self, names: List[str] = None, callback: Callable[[str, dict], None] = None) -> Dict[str, Any]:
+        """
+        Run the benchmarks
+        :param names: Names of the benchmarks to run, default all
+        :param callback: Called with the name and results of each
+            benchmark when it is done
+        :return: JSON serializable dictionary with the results
+        """
+        names = names if names is not None else self.NAMES
+        if any(name not in self.NAMES for name in names):
+            raise ValueError("Invalid benchmarks: {}".format(names))
+        if self._lines is None:
+            self.setup()
+        results = dict()
+        for name in names:
+            setup, function, items = getattr(self, "benchmark_{}".format(name))()
+            results[name] = BenchmarkSuite.time(setup, function, items, self.repeat)
+            if name in self.sizes:
+                results[name]["bytes"] = self.sizes[name]
+            if callback is not None:
+                callback(name, results[name])
+        return {
+            "version": VERSION, "date": datetime.now().isoformat(), "commit": get_commit(),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "parameters": self.parameters, "results": results,
+        }
+
+    @staticmethod
+    def time(setup: Callable[[], Any], function: Callable[[Any], Any], items: int, repeat: int) -> Dict[str, float]:
+        """Time a function that is set up before every repetition"""
+        timings = list()
+        for _ in range(repeat):
+            args = setup()
+            start = perf_counter()
+            function(args)
+            timings.append(perf_counter() - start)
+        return {
+            "items": items, "min": min(timings), "mean": sum(timings) / len(timings), "max": max(timings),
+            "per_item_us": min(timings) / items * 1e6 if items != 0 else 0.0,
+        }
+
+    def benchmark_line_to_dictionary(self) -> BENCHMARK:
+        def function(lines):
+            for line in lines:
+                Parser.line_to_dictionary(line)
+        return tokenizer._time_memo.clear, lambda _: function(self._lines), len(self._lines)
+
+    def benchmark_read_file(self) -> BENCHMARK:
+        return tokenizer._time_memo.clear, lambda _: Parser.read_file(self.file), len(self._lines)
+
+    def benchmark_read_gzip(self) -> BENCHMARK:
+        """Read the file from a gzip archive, see get_break_even"""
+        return tokenizer._time_memo.clear, lambda _: Parser.read_file(self.file + ".gz"), len(self._lines)
+
+    def benchmark_read_xz(self) -> BENCHMARK:
+        """Read the file from an xz archive, see get_break_even"""
+        return tokenizer._time_memo.clear, lambda _: Parser.read_file(self.file + ".xz"), len(self._lines)
+
+    def benchmark_split_combatlog(self) -> BENCHMARK:
+        player_list = Parser.get_player_id_list(self._events)
+        return lambda: None, lambda _: Parser.split_combatlog(self._events, player_list), len(self._events)
+
+    def benchmark_split_parallel(self) -> BENCHMARK:
+        """Read and split the file in one chunk per worker"""
+        function = lambda _: split_combatlog_parallel(self.file, self.workers)
+        return tokenizer._time_memo.clear, function, len(self._lines)
+
+    def benchmark_parse_file(self) -> BENCHMARK:
+        player_list = Parser.get_player_id_list(self._events)
+        file_cube, _, _ = Parser.split_combatlog(self._events, player_list)
+        return lambda: None, lambda _: Parser.parse_file(file_cube, player_list), len(self._events)
+
+    def benchmark_parse_folder(self) -> BENCHMARK:
+        """Parse the folder without a FolderIndex, so every file is parsed"""
+        files = [os.path.join(self.folder, f) for f in os.listdir(self.folder)]
+        items = sum(len(Parser.read_file_raw(path)) for path in files)
+        return lambda: None, lambda _: FolderEngine(files, self.workers, index=False).run(), items
+
+    def benchmark_line_to_event_dictionary(self) -> BENCHMARK:
+        """Resolve the effects of the first spawn line by line"""
+        player_list = Parser.get_player_id_list(self._events)
+        spawn = Parser.split_combatlog(self._events, player_list)[0][0][0]
+
+        def function(lines):
+            for index, line in enumerate(lines):
+                Parser.line_to_event_dictionary(line, player_list, lines, index)
+        return lambda: [event.to_dict() for event in spawn], function, len(spawn)
+
+    def benchmark_effects_resolver(self) -> BENCHMARK:
+        """Resolve the effects of a single spawn of 100,000 events"""
+        items = int(100000 * self.scale)
+        generator = CombatLogGenerator(self.seed, matches=1, spawns=1, duration=items / 10.0)
+        lines = list()
+        for line in generator.generate():
+            event = Parser.line_to_dictionary(line.decode().strip())
+            if "@" in event["source"]:
+                continue
+            lines.append(Event(event))
+            if len(lines) == items:
+                break
+        player_list = Parser.get_player_id_list(lines)
+        return lambda: [Event(line.to_dict()) for line in lines], lambda e: EffectsResolver.resolve(e, player_list), items
+
+
+def get_commit() -> (str, None):
+    """Return the hash of the current git commit, if available"""
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode().strip()
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Compare the results of two runs
+    :return: ratio of the current minimum time to the previous minimum
+        time for each benchmark in both runs, per item
+    """
+    ratios = dict()
+    for name, result in current["results"].items():
+        other = previous["results"].get(name)
+        if other is None or other["per_item_us"] == 0:
+            continue
+        ratios[name] = result["per_item_us"] / other["per_item_us"]
+    return ratios
+
+
+def get_break_even(results: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Compare reading compressed files to reading the plain file
+
+    The files are read from the page cache, so the timings include the
+    decompression but not the transfer of the bytes from storage. On
+    storage with a bandwidth of B bytes per second, the transfer adds
+    bytes / B seconds to each read. A compressed file is read faster
+    than the plain file if B is below the break-even bandwidth
+    (plain bytes - compressed bytes) / (compressed time - plain time).
+    :return: break-even bandwidth in MB/s of each read benchmark in the
+        results, infinite if the compressed file is read faster anyway
+    """
+    results = results["results"]
+    if "read_file" not in results:
+        return dict()
+    plain = results["read_file"]
+    bandwidths = dict()
+    for name in ("read_gzip", "read_xz"):
+        if name not in results:
+            continue
+        saved, cost = plain["bytes"] - results[name]["bytes"], results[name]["min"] - plain["min"]
+        bandwidths[name] = saved / cost / 1024 ** 2 if cost > 0 else float("inf")
+    return bandwidths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("-o", type=str, help="File to write the results to as JSON")
+    parser.add_argument("-c", type=str, help="Results of an earlier run to compare against")
+    parser.add_argument("-s", type=float, help="Scale of the generated CombatLogs", default=1.0)
+    parser.add_argument("-r", type=int, help="Amount of repetitions", default=3)
+    parser.add_argument("-b", type=str, nargs="+", choices=BenchmarkSuite.NAMES, help="Benchmarks to run")
+    parser.add_argument(
+        "-w", type=int, help="Amount of worker processes for parse_folder and split_parallel", default=1)
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        suite = BenchmarkSuite(directory, args.s, args.r, workers=args.w)
+        suite.setup()
+        results = suite.run(args.b, lambda name, result: print(
+            "[Benchmark] {:<26} {:>9.4f}s {:>9.2f}us/item ({} items)".format(
+                name, result["min"], result["per_item_us"], result["items"])))
+    for name, bandwidth in get_break_even(results).items():
+        print("[Benchmark] {:<26} {:>9} bytes, faster below {:.1f} MB/s".format(
+            name, results["results"][name]["bytes"], bandwidth))
+    if args.o is not None:
+        with open(args.o, "w") as fo:
+            json.dump(results, fo, indent=2)
+    if args.c is not None:
+        with open(args.c) as fi:
+            for name, ratio in compare(json.load(fi), results).items():
+                print("[Benchmark] {:<26} {:>6.2f}x".format(name, ratio))
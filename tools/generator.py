@@ -0,0 +1,241 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+"""
+# Standard Library
+from datetime import datetime, timedelta
+import os
+import random
+from typing import Dict, Iterator, List
+from zlib import crc32
+# Project Modules
+from data import abilities
+from parsing.timebase import DAY, decode
+
+"""
+Valid GSF CombatLog event:
+[time] [source] [target] [ability] [effect] (amount)
+"""
+LINE = "[{}] [{}] [{}] [{} {{{}}}] [{} {{{}}}: {} {{{}}}] ({})"
+
+APPLY_EFFECT = ("ApplyEffect", 836045448945477)
+REMOVE_EFFECT = ("RemoveEffect", 836045448945478)
+EVENT = ("Event", 836045448945472)
+ABILITY_ACTIVATE = ("AbilityActivate", 836045448945479)
+DAMAGE = ("Damage", 836045448945501)
+HEAL = ("Heal", 836045448945500)
+KINETIC = 836045448940873
+
+# Relative frequency of the kinds of events in a spawn
+EVENTS = {
+    "fire": 45,  # Player hits an enemy with a primary weapon
+    "hit": 25,  # Enemy hits the player
+    "activate": 12,  # Player activates a component
+    "secondary": 6,  # Player hits an enemy with a secondary weapon
+    "heal": 4,  # Player is healed
+    "selfdamage": 2,  # Player collides with something
+    "remove": 6,  # An effect without source is removed from the player
+}
+
+UNDECODABLE = b"\xff\xfe\xfa\xff undecodable\r\n"
+
+
+def get_ability_id(ability: str) -> int:
+    """Return a stable ID number for an ability name"""
+    return 3290000000000000 + crc32(ability.encode())
+
+
+def format_time(ms: int) -> str:
+    """Format milliseconds since midnight as a CombatLog timestamp"""
+    ms %= DAY
+    return "{:02d}:{:02d}:{:02d}.{:03d}".format(ms // 3600000, ms // 60000 % 60, ms // 1000 % 60, ms % 1000)
+
+
+class CombatLogGenerator(object):
+    """
+    Generates synthetic CombatLogs with GSF matches
+
+    The CombatLogs are fully determined by the seed and the parameters,
+    so that the same file is generated on every platform and for every
+    version of the GSF Parser. This allows the generated files to be
+    used for benchmarks and tests of files with any amount of matches,
+    spawns and events.
+
+    Every spawn uses the components of a single ship, which is drawn
+    from the ship mix, so that ship detection succeeds. Lines that may
+    not be decoded can be mixed in, and the start time may be chosen
+    so that the CombatLog crosses midnight.
+    """
+
+    def __init__(self, seed: int = 0, matches: int = 4, spawns: int = 4, duration: float = 60.0,
+                 rate: float = 10.0, ships: Dict[str, float] = None, enemies: int = 8,
+                 player: str = "Generator", start: str = "20:00:00.000", rollover: bool = False,
+                 undecodable: float = 0.0):
+        """
+        :param seed: Seed of the random number generator
+        :param matches: Amount of matches in the CombatLog
+        :param spawns: Amount of spawns in each match
+        :param duration: Duration of each spawn in seconds
+        :param rate: Average amount of events per second in a spawn
+        :param ships: Relative frequency of each ship, by default all
+            ships in abilities.ships are equally likely
+        :param enemies: Amount of enemies in each match
+        :param player: Name of the character
+        :param start: Time of the first line, HH:MM:SS.mmm
+        :param rollover: Start the CombatLog before midnight so that
+            midnight is crossed halfway through the CombatLog, instead
+            of starting at the start time
+        :param undecodable: Fraction of lines that cannot be decoded
+        """
+        if matches < 0 or spawns < 1 or duration <= 0 or rate <= 0 or enemies < 1:
+            raise ValueError("Invalid CombatLogGenerator parameters")
+        ships = ships if ships is not None else {ship: 1.0 for ship in abilities.ships}
+        if any(ship not in abilities.ships_abilities for ship in ships):
+            raise ValueError("Invalid ships: {}".format(list(ships.keys())))
+        self.seed = seed
+        self.matches = matches
+        self.spawns = spawns
+        self.duration = int(duration * 1000)
+        self.rate = rate
+        self.ships = ships
+        self.enemies = enemies
+        self.player = player
+        self.undecodable = undecodable
+        self.start = decode(start)
+        if rollover is True:
+            self.start = (DAY - self.get_duration() // 2) % DAY
+        self.loadouts: List[List[str]] = list()  # Ship used in each spawn, for verification
+
+    def get_duration(self) -> int:
+        """Return the approximate duration of the CombatLog in ms"""
+        return self.matches * (self.spawns * (self.duration + 10000) + 60000) + 2000
+
+    def generate(self) -> Iterator[bytes]:
+        """Generate the encoded lines of the CombatLog"""
+        rng = random.Random(self.seed)
+        self.loadouts.clear()
+        ms, player_id, player = self.start, 2963000040000, "@{}".format(self.player)
+        for line in self.get_login_lines(ms, player):
+            yield line
+        for m in range(self.matches):
+            ms += rng.randint(30000, 60000)
+            enemies = [str(player_id + 1000 + rng.randint(1, 99999)) for _ in range(self.enemies)]
+            match = list()
+            for s in range(self.spawns):
+                player_id += 1
+                ship = rng.choices(list(self.ships.keys()), list(self.ships.values()))[0]
+                match.append(ship)
+                for ms, line in self.get_spawn_lines(rng, ms, str(player_id), ship, enemies):
+                    if self.undecodable != 0.0 and rng.random() < self.undecodable:
+                        yield UNDECODABLE
+                    yield line
+                ms += rng.randint(5000, 10000)  # Respawn timer
+            self.loadouts.append(match)
+            for line in self.get_login_lines(ms, player):
+                yield line
+
+    def get_login_lines(self, ms: int, player: str) -> List[bytes]:
+        """Return the lines of entering a non-GSF area"""
+        line = LINE.format(
+            format_time(ms), player, player, "Safe Login", 973870949466112,
+            *APPLY_EFFECT, "Safe Login Immunity", 973870949466372, "")
+        return [(line + "\r\n").encode()]
+
+    def get_spawn_lines(self, rng: random.Random, ms: int, player: str, ship: str, enemies: List[str]):
+        """
+        Generate the lines of a single spawn
+        :return: generator of (ms, encoded line)
+        """
+        loadout = CombatLogGenerator.get_loadout(rng, ship)
+        primaries = [ability for ability in loadout if ability in abilities.PRIMARIES]
+        secondaries = [ability for ability in loadout if ability in abilities.SECONDARIES]
+        kinds, weights = list(EVENTS.keys()), list(EVENTS.values())
+        end = ms + self.duration
+        # The spawn starts with the player using a component, so that the player ID is known
+        kind = "activate"
+        while ms < end:
+            for line in self.get_event_lines(rng, kind, ms, player, loadout, primaries, secondaries, enemies):
+                yield ms, (line + "\r\n").encode()
+            ms += int(rng.expovariate(self.rate) * 1000)
+            kind = rng.choices(kinds, weights)[0]
+
+    @staticmethod
+    def get_loadout(rng: random.Random, ship: str) -> List[str]:
+        """Return a random component of each category for a ship"""
+        loadout = list()
+        for category in (abilities.PRIMARIES, abilities.SECONDARIES, abilities.ENGINES,
+                         abilities.SYSTEMS, abilities.SHIELDS):
+            options = [ability for ability in abilities.ships_abilities[ship] if ability in category]
+            if len(options) != 0:
+                loadout.append(rng.choice(options))
+        return loadout
+
+    @staticmethod
+    def get_event_lines(rng: random.Random, kind: str, ms: int, player: str, loadout: List[str],
+                        primaries: List[str], secondaries: List[str], enemies: List[str]) -> List[str]:
+        """Return the lines of a single event"""
+        time = format_time(ms)
+        if kind == "fire" or (kind == "secondary" and len(secondaries) == 0):
+            ability, target = rng.choice(primaries), rng.choice(enemies)
+            return [CombatLogGenerator.get_damage_line(rng, time, player, target, ability, 0.15)]
+        if kind == "secondary":
+            ability, target = rng.choice(secondaries), rng.choice(enemies)
+            return [
+                LINE.format(time, player, player, ability, get_ability_id(ability), *EVENT, *ABILITY_ACTIVATE, ""),
+                CombatLogGenerator.get_damage_line(rng, time, player, target, ability, 0.05)]
+        if kind == "hit":
+            ability = rng.choice(abilities.primaries)
+            return [CombatLogGenerator.get_damage_line(rng, time, rng.choice(enemies), player, ability, 0.1)]
+        if kind == "activate":
+            ability = rng.choice(loadout)
+            return [
+                LINE.format(time, player, player, ability, get_ability_id(ability), *EVENT, *ABILITY_ACTIVATE, ""),
+                LINE.format(time, player, player, ability, get_ability_id(ability), *APPLY_EFFECT,
+                            ability, get_ability_id(ability), "")]
+        if kind == "heal":
+            ability = "Repair Probes"
+            return [LINE.format(time, rng.choice(enemies), player, ability, get_ability_id(ability), *APPLY_EFFECT,
+                                *HEAL, "{}".format(rng.randint(0, 800)))]
+        if kind == "selfdamage":
+            ability = "Selfdamage"
+            return [LINE.format(time, player, player, ability, get_ability_id(ability), *APPLY_EFFECT,
+                                *DAMAGE, "{} ".format(rng.randint(10, 1500)))]
+        ability = "Hyperspace Slingshot"
+        return [LINE.format(time, "", player, ability, get_ability_id(ability), *REMOVE_EFFECT,
+                            ability, get_ability_id(ability), "")]
+
+    @staticmethod
+    def get_damage_line(rng: random.Random, time: str, source: str, target: str, ability: str, crit: float) -> str:
+        """Return a line of damage dealt by source to target"""
+        amount = "{}{} kinetic {{{}}}".format(rng.randint(10, 2000), "*" if rng.random() < crit else "", KINETIC)
+        return LINE.format(time, source, target, ability, get_ability_id(ability), *APPLY_EFFECT, *DAMAGE, amount)
+
+    def write(self, path: str):
+        """Write the CombatLog to a file"""
+        with open(path, "wb") as fo:
+            for line in self.generate():
+                fo.write(line)
+
+
+def get_file_name(moment: datetime) -> str:
+    """Return a CombatLog file name for a date and time"""
+    return moment.strftime("combat_%Y-%m-%d_%H_%M_%S_%f.txt")
+
+
+def generate_folder(directory: str, files: int, date: datetime = datetime(2018, 1, 1), **kwargs) -> List[str]:
+    """
+    Generate a folder of CombatLogs, one on each day starting at date
+    :param directory: Directory to write the CombatLogs to
+    :param files: Amount of CombatLogs to generate
+    :param kwargs: Parameters for the CombatLogGenerator, the seed is
+        incremented for each file
+    :return: list of paths to the generated CombatLogs
+    """
+    seed = kwargs.pop("seed", 0)
+    paths = list()
+    for i in range(files):
+        paths.append(os.path.join(directory, get_file_name(date + timedelta(days=i))))
+        CombatLogGenerator(seed + i, **kwargs).write(paths[-1])
+    return paths
@@ -13,6 +13,8 @@ import tkinter.messagebox
 from ttkwidgets import Calendar, ScaleEntry
 # Project Modules
 import variables
+from parsing.archive import is_supported
+from parsing.gsfindex import GSFIndex
 from parsing.parser import Parser
 from widgets import ToggledFrame, VerticalScrollFrame
 from toplevels.splash import SplashScreen
@@ -165,22 +167,40 @@ class Filters(tk.Toplevel):
         self.window.file_select_frame.clear_data_widgets()
         self.window.file_select_frame.file_tree.delete(*self.window.file_select_frame.file_tree.get_children())
         # Start looping over the files in the CombatLogs folder
+        entries = dict()
         for file_name in files:
             # Set passed to True. Will be set to False in some filter code
             passed = True
             # Update the SplashScreen progress bar
             files_done += 1
             splash.update_max(files_done)
-            # If the file does not end with .txt, it's not a CombatLog
-            if not file_name.endswith(".txt") or not Parser.get_gsf_in_file(file_name):
+            # If the file is not a (compressed) text file, it's not a CombatLog
+            if not is_supported(file_name):
                 continue
+            entries[file_name] = entry = GSFIndex.get_file_entry(file_name)
+            if entry["gsf"] is False:
+                continue
+            # The Date filters only require the index, so are checked before parsing
+            if self.filter_type_vars["Date"].get() is True:
+                print("Date filters are enabled")
+                date = entry["date"]
+                if not date:
+                    print("Continuing in file {0} because the filename could not be parsed".format(file_name))
+                    continue
+                if self.start_date_widget.selection > date:
+                    print("Continuing in file {0} because of the start date".format(file_name))
+                    continue
+                if self.end_date_widget.selection < date:
+                    print("Continuing in file {0} because of the end date".format(file_name))
+                    continue
             # Open the CombatLog
             lines = Parser.read_file(file_name)
             # Parse the CombatLog to get the data to filter against
             player_list = Parser.get_player_id_list(lines)
             file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player_list)
-            (abilities, damagedealt, damagetaken, selfdamage, healing, _, _, _, _,
-             enemy_dmg_d, enemy_dmg_t, _, _) = Parser.parse_file(file_cube, player_list)
+            stats = Parser.parse_file(file_cube, player_list)
+            abilities, enemy_dmg_d, enemy_dmg_t = stats.abilities, stats.enemy_dmg_d, stats.enemy_dmg_t
+            damagedealt, damagetaken, selfdamage, healing = stats.dmg_d, stats.dmg_t, stats.dmg_s, stats.healing
             matches = len(file_cube)
             damagedealt, damagetaken, selfdamage, healing = (
                 damagedealt / matches,
@@ -207,19 +227,6 @@ class Filters(tk.Toplevel):
                     print("Continuing in file {0} because of Components".format(file_name))
                     continue
 
-            if self.filter_type_vars["Date"].get() is True:
-                print("Date filters are enabled")
-                date = Parser.parse_filename(file_name)
-                if not date:
-                    print("Continuing in file {0} because the filename could not be parsed".format(file_name))
-                    continue
-                if self.start_date_widget.selection > date:
-                    print("Continuing in file {0} because of the start date".format(file_name))
-                    continue
-                if self.end_date_widget.selection < date:
-                    print("Continuing in file {0} because of the end date".format(file_name))
-                    continue
-
             enemies = sum(True if dmg > 0 else False for dmg in enemy_dmg_d.values())
             killassists = sum(True if dmg > 0 else False for dmg in enemy_dmg_t.values())
 
@@ -233,6 +240,9 @@ class Filters(tk.Toplevel):
                         continue
 
             results.append(file_name)
+        index = GSFIndex.get_shared()
+        if index is not None:
+            index.save()
         print("Amount of results: {0}".format(len(results)))
         print("Results: {0}".format(results))
         splash.destroy()
@@ -252,7 +262,7 @@ class Filters(tk.Toplevel):
             string = datetime_obj.strftime("%Y-%m-%d   %H:%M") if datetime_obj is not None else file_name
             print("Setting file string {0} to match file_name {1}".format(string, file_name))
             self.window.file_select_frame.file_string_dict[string] = file_name
-            self.window.file_select_frame.insert_file(string)
+            self.window.file_select_frame.insert_file(string, entry=entries[file_name])
         self.destroy()
 
     def grid_widgets(self):
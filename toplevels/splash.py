@@ -16,11 +16,12 @@ from utils import utilities
 
 class SplashScreen(tk.Toplevel):
     """Simple splash screen to show progress while loading files"""
-    def __init__(self, window, amount, title="GSF Parser", text="Working..."):
+    def __init__(self, window, amount, title="GSF Parser", text="Working...", cancel=None):
         """
         :param window: GSF Parser MainWindow (tk.Tk)
         :param amount: Amount of files that need results
         :param title: Window Manager Title
+        :param cancel: Callback for a Cancel button, no button if None
         """
         tk.Toplevel.__init__(self, window)
         self.update()
@@ -34,6 +35,9 @@ class SplashScreen(tk.Toplevel):
         self.progress_bar.pack()
         self.progress_bar["maximum"] = amount
         self.progress_bar["value"] = 0
+        if cancel is not None:
+            self.cancel_button = ttk.Button(self, text="Cancel", command=cancel)
+            self.cancel_button.pack(pady=(5, 0))
         self.update()
 
     def update_max(self, number):
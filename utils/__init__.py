@@ -3,10 +3,34 @@ Author: RedFantom
 Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
 License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
+
+The functions of the submodules are imported only when they are first
+requested, so that the modules that do not require a display, such as
+directories and instruments, can be used without one.
 """
-from utils.utilities import \
-    open_icon, open_icon_pil, \
-    get_cursor_position, get_screen_resolution
-from utils.admin import \
-    escalate_privileges, drop_privileges, check_privileges
-from utils.window import get_window_location, Window
+from importlib import import_module
+
+_MODULES = {
+    "open_icon": "utilities",
+    "open_icon_pil": "utilities",
+    "get_cursor_position": "utilities",
+    "get_screen_resolution": "utilities",
+    "escalate_privileges": "admin",
+    "drop_privileges": "admin",
+    "check_privileges": "admin",
+    "get_window_location": "window",
+    "Window": "window",
+}
+
+
+def __getattr__(name: str):
+    """Import the submodule of a function when requested"""
+    if name not in _MODULES:
+        raise AttributeError("module 'utils' has no attribute '{}'".format(name))
+    value = getattr(import_module("utils." + _MODULES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
@@ -0,0 +1,405 @@
+"""
+Author: RedFantom
+Contributors: Daethyra (Naiii) and Sprigellania (Zarainia)
+License: GNU GPLv3 as in LICENSE
+Copyright (C) 2016-2018 RedFantom
+
+
+Instrumentation registry
+
+Timers, counters and gauges are registered by name in the Registry, and
+may be dumped to a JSON file for offline analysis. Instruments are only
+updated through the module functions if the registry is enabled, so
+that instrumentation has negligible overhead otherwise.
+
+Timers record their durations in a Histogram with logarithmic buckets
+that are each divided into linear sub-buckets, like an HDR histogram.
+The memory use of a Timer does not depend on the amount of durations
+recorded, while percentiles are accurate to within one percent.
+
+All instruments are thread-safe. Each process has its own registry,
+which is cleared in forked child processes. Worker processes exit
+without running the atexit handlers, so the functions executed in
+them are decorated with worker, which dumps the registry of the worker
+after every call. The dumps of multiple processes are merged with
+Registry.load.
+"""
+# Standard Library
+import atexit
+import multiprocessing
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+import json
+import os
+from threading import Lock
+from time import perf_counter
+from typing import Any, Dict, List
+
+from utils.directories import get_temp_directory
+
+# Values are kept to SUB_BITS significant bits. The highest bit is
+# always set, so every power of two is divided into 2 ** (SUB_BITS - 1)
+# = 64 linear sub-buckets, and the value in the middle of a bucket is
+# within 1 / 128 of any value in it.
+SUB_BITS = 7
+SUB_BUCKETS = 1 << SUB_BITS
+PERCENTILES = (50, 95, 99)
+
+
+def get_bucket(value: int) -> int:
+    """Return the index of the Histogram bucket of a value"""
+    shift = value.bit_length() - SUB_BITS
+    if shift <= 0:
+        return value
+    return (shift << SUB_BITS) + (value >> shift)
+
+
+def get_bucket_value(bucket: int) -> int:
+    """Return the value in the middle of a Histogram bucket"""
+    shift = bucket >> SUB_BITS
+    if shift == 0:
+        return bucket
+    lower = (bucket & (SUB_BUCKETS - 1)) << shift
+    return lower + (1 << shift) // 2
+
+
+class Histogram(object):
+    """Histogram of non-negative integer values"""
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = dict()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value: int, count: int = 1):
+        """Record a value, count times"""
+        bucket = get_bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+
+    def percentile(self, percentile: float) -> int:
+        """Return the value at a percentile, zero if empty"""
+        if self.count == 0:
+            return 0
+        rank, seen = max(percentile / 100 * self.count, 1), 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(max(get_bucket_value(bucket), self.min), self.max)
+        return self.max
+
+    def merge(self, other: "Histogram"):
+        """Add the values of another Histogram"""
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is None:
+                continue
+            self.min = value if self.min is None or value < self.min else self.min
+            self.max = value if self.max is None or value > self.max else self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "total": self.total, "min": self.min, "max": self.max,
+                "buckets": {str(bucket): count for bucket, count in sorted(self.buckets.items())}}
+
+    @classmethod
+    def from_dict(cls, dictionary: Dict[str, Any]) -> "Histogram":
+        histogram = cls()
+        histogram.buckets = {int(bucket): count for bucket, count in dictionary["buckets"].items()}
+        histogram.count, histogram.total = dictionary["count"], dictionary["total"]
+        histogram.min, histogram.max = dictionary["min"], dictionary["max"]
+        return histogram
+
+
+class Timer(object):
+    """Records durations in a Histogram of microseconds"""
+
+    TYPE = "timer"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.histogram = Histogram()
+        self._lock = Lock()
+
+    def record(self, seconds: float):
+        """Record a duration in seconds"""
+        with self._lock:
+            self.histogram.record(max(int(seconds * 1e6), 0))
+
+    @contextmanager
+    def time(self):
+        """Context manager that records the duration of its body"""
+        start = perf_counter()
+        try:
+            yield self
+        finally:
+            self.record(perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        return self.histogram.count
+
+    @property
+    def total(self) -> float:
+        """Total recorded duration in seconds"""
+        return self.histogram.total / 1e6
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count != 0 else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Return the duration at a percentile in seconds"""
+        with self._lock:
+            return self.histogram.percentile(percentile) / 1e6
+
+    def merge(self, dictionary: Dict[str, Any]):
+        with self._lock:
+            self.histogram.merge(Histogram.from_dict(dictionary["histogram"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            dictionary = {"type": self.TYPE, "count": self.count, "total": self.total, "mean": self.mean}
+            dictionary.update({"p{}".format(p): self.histogram.percentile(p) / 1e6 for p in PERCENTILES})
+            dictionary["histogram"] = self.histogram.to_dict()
+        return dictionary
+
+
+class Counter(object):
+    """Counts the occurrences of something"""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+        self._lock = Lock()
+
+    def increment(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+    def merge(self, dictionary: Dict[str, Any]):
+        self.increment(dictionary["value"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.TYPE, "value": self.value}
+
+
+class Gauge(object):
+    """Keeps the last, lowest and highest value of something"""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value, self.min, self.max = None, None, None
+        self._lock = Lock()
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+            self.min = value if self.min is None or value < self.min else self.min
+            self.max = value if self.max is None or value > self.max else self.max
+
+    def merge(self, dictionary: Dict[str, Any]):
+        """Take the value of another Gauge, keeping the extremes of both"""
+        for value in (dictionary["min"], dictionary["max"], dictionary["value"]):
+            if value is not None:
+                self.set(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"type": self.TYPE, "value": self.value, "min": self.min, "max": self.max}
+
+
+INSTRUMENTS = {instrument.TYPE: instrument for instrument in (Timer, Counter, Gauge)}
+
+
+class Registry(object):
+    """Registry of instruments by name"""
+
+    def __init__(self, enabled: bool = False):
+        """
+        :param enabled: Whether the module functions update the
+            instruments. Instruments may always be used directly.
+        """
+        self.enabled = enabled
+        self.dumps = False
+        self._instruments: Dict[str, Any] = dict()
+        self._lock = Lock()
+        self._dump_registered = False
+
+    def enable(self, dump: bool = True):
+        """
+        Enable the registry
+        :param dump: Dump the registry to the temporary directory when
+            the process exits, and after every call of a worker function
+        """
+        self.enabled = True
+        self.dumps = self.dumps or dump
+        if dump is True and self._dump_registered is False:
+            atexit.register(self.dump)
+            self._dump_registered = True
+
+    def get(self, name: str, type: str):
+        """Return the instrument of a type with a name, created if new"""
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            with self._lock:
+                instrument = self._instruments.setdefault(name, INSTRUMENTS[type](name))
+        if instrument.TYPE != type:
+            raise TypeError("Instrument '{}' is a {}, not a {}".format(name, instrument.TYPE, type))
+        return instrument
+
+    def timer(self, name: str) -> Timer:
+        return self.get(name, Timer.TYPE)
+
+    def counter(self, name: str) -> Counter:
+        return self.get(name, Counter.TYPE)
+
+    def gauge(self, name: str) -> Gauge:
+        return self.get(name, Gauge.TYPE)
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._instruments.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._instruments
+
+    def reset(self, prefix: str = ""):
+        """Remove the instruments with names that start with prefix"""
+        with self._lock:
+            for name in [name for name in self._instruments if name.startswith(prefix)]:
+                del self._instruments[name]
+
+    def _after_fork(self):
+        """
+        Start with an empty registry in a forked child. The lock is
+        replaced instead of acquired, as it may have been held by
+        another thread of the parent at the time of the fork.
+        """
+        self._lock = Lock()
+        self._instruments = dict()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a JSON serializable copy of all instruments"""
+        with self._lock:
+            instruments = list(self._instruments.values())
+        return {instrument.name: instrument.to_dict() for instrument in instruments}
+
+    def merge(self, snapshot: Dict[str, Dict[str, Any]]):
+        """Merge the instruments of a snapshot into this registry"""
+        for name, dictionary in snapshot.items():
+            self.get(name, dictionary["type"]).merge(dictionary)
+
+    def dump(self, path: str = None) -> str:
+        """
+        Dump the instruments to a JSON file
+        :param path: Path to the file, by default a file for this
+            process in the temporary directory
+        :return: path to the file
+        """
+        if path is None:
+            path = os.path.join(get_temp_directory(), "instruments_{}.json".format(os.getpid()))
+        with open(path, "w") as fo:
+            json.dump({"pid": os.getpid(), "date": datetime.now().isoformat(), "instruments": self.snapshot()},
+                      fo, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, paths: List[str]) -> "Registry":
+        """Return a Registry with the merged instruments of dumps"""
+        registry = cls()
+        for path in paths:
+            with open(path) as fi:
+                registry.merge(json.load(fi)["instruments"])
+        return registry
+
+
+REGISTRY = Registry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=REGISTRY._after_fork)
+
+
+class _NullTiming(object):
+    """Context manager for when the registry is disabled"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return False
+
+
+NULL_TIMING = _NullTiming()
+
+
+def timed(name: str) -> callable:
+    """Function decorator that records the duration of every call"""
+
+    def outer(func: callable) -> callable:
+        @wraps(func)
+        def inner(*args, **kwargs):
+            if REGISTRY.enabled is False:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                REGISTRY.timer(name).record(perf_counter() - start)
+        return inner
+
+    return outer
+
+
+def worker(func: callable) -> callable:
+    """
+    Function decorator for functions executed in worker processes. The
+    registry is dumped after every call in a worker process, as worker
+    processes exit without running the atexit handlers.
+    """
+
+    @wraps(func)
+    def inner(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if REGISTRY.enabled is True and REGISTRY.dumps is True and \
+                    multiprocessing.current_process().name != "MainProcess":
+                try:
+                    REGISTRY.dump()
+                except OSError as e:
+                    print("[Instruments] Failed to dump worker instruments: {}".format(e))
+    return inner
+
+
+def timing(name: str):
+    """Context manager that records the duration of its body"""
+    if REGISTRY.enabled is False:
+        return NULL_TIMING
+    return REGISTRY.timer(name).time()
+
+
+def count(name: str, amount: int = 1):
+    """Increment a counter"""
+    if REGISTRY.enabled is False:
+        return
+    REGISTRY.counter(name).increment(amount)
+
+
+def gauge(name: str, value: float):
+    """Set the value of a gauge"""
+    if REGISTRY.enabled is False:
+        return
+    REGISTRY.gauge(name).set(value)
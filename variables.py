@@ -5,8 +5,11 @@ License: GNU GPLv3 as in LICENSE
 Copyright (C) 2016-2018 RedFantom
 """
 from settings import Settings, ColorScheme
+from utils import instruments
 
 settings = Settings()
+if settings["misc"]["instruments"] is True:
+    instruments.REGISTRY.enable()
 colors = ColorScheme()
 files_done = 0
 main_window = None
@@ -10,6 +10,7 @@ import tkinter.ttk as ttk
 import tkinter.messagebox
 import tkinter.filedialog
 # Standard Library
+import bisect
 import operator
 import os
 from collections import OrderedDict
@@ -18,6 +19,11 @@ import variables
 from parsing import folderstats, filestats, matchstats, spawnstats
 from data import abilities
 from parsing.parser import Parser
+from parsing.archive import is_supported
+from parsing.fileanalyzer import FileAnalyzer
+from parsing.filescanner import FileScanner
+from parsing.folderengine import FolderEngine
+from parsing.logindex import LogIndex
 from toplevels.splash import SplashScreen
 from toplevels.filters import Filters
 from parsing.filehandler import FileHandler
@@ -35,12 +41,15 @@ class FileFrame(ttk.Frame):
     filtering options.
     """
 
+    SCAN_INTERVAL = 100  # Milliseconds between FileScanner polls
+
     def __init__(self, root_frame, main_window):
         """Create all widgets and make the links between them"""
         ttk.Frame.__init__(self, root_frame, width=200, height=420)
         self.main_window = main_window
         self.file_tree = ttk.Treeview(self, height=13)
         self.file_tree.bind("<Double-1>", self.update_parse)
+        self.file_tree.bind("<<TreeviewOpen>>", self.open_file)
         self.file_tree["show"] = ("tree", "headings")
         self.file_tree.heading("#0", text="Files", command=self.flip_sorting)
         self.ascending = False
@@ -53,6 +62,8 @@ class FileFrame(ttk.Frame):
 
         self.match_timing_strings = None
         self.splash = None
+        self.scanner: FileScanner = None
+        self._inserted = list()
 
         self.refresh_button = ttk.Button(self, text="Refresh", command=self.update_files)
         self.filters_button = ttk.Button(self, text="Filters", command=Filters)
@@ -91,54 +102,80 @@ class FileFrame(ttk.Frame):
             variables.settings.read_settings()
         combatlogs_folder = variables.settings["parsing"]["path"]
         file_list = os.listdir(combatlogs_folder)
-        if not silent:
-            splash_screen = SplashScreen(self.main_window, len(file_list), title="Loading files")
-        else:
-            splash_screen = None
-        if len(file_list) > 100:
+        if len(file_list) > 100 and not silent:
             tkinter.messagebox.showinfo("Suggestion", "Your CombatLogs folder contains a lot of CombatLogs, {0} to be "
                                                       "precise. How about moving them to a nice archive folder? This "
                                                       "will speed up some processes "
                                                       "significantly.".format(len(file_list)))
         self.file_tree.insert("", tk.END, iid="all", text="All CombatLogs")
-        file_list = list(reversed(sorted(file_list)) if not self.ascending else sorted(file_list))
-        if self.main_window.splash is not None and self.main_window.splash.winfo_exists():
-            self.main_window.splash.update_max(len(file_list))
-        for number, file in enumerate(file_list):
-            if not Parser.get_gsf_in_file(file):
-                continue
-            file_string = Parser.parse_filename(file)
-            if file_string is None:
+        if self.scanner is not None:
+            self.scanner.cancel()
+        self._inserted.clear()
+        self.scanner = FileScanner([file for file in file_list if Parser.parse_filename(file) is not None])
+        self.scanner.start()
+        self._poll_scanner(self.scanner)
+
+    def _poll_scanner(self, scanner: FileScanner):
+        """Insert the files found by the FileScanner in sorted order"""
+        if scanner is not self.scanner:  # Replaced by a newer scan
+            return
+        for file, entry in scanner.poll():
+            if entry is None or entry["gsf"] is False:
                 continue
+            file_string = entry["date"]
             self.file_string_dict[file_string] = file
-            number += 1
-            if splash_screen is not None:
-                splash_screen.increment()
-                splash_screen.update()
-            self.insert_file(file_string)
-            if self.main_window.splash is not None and self.main_window.splash.winfo_exists():
-                self.main_window.splash.increment()
-        if splash_screen is not None:
-            splash_screen.destroy()
-        return
+            # Files are sorted by name, the "all" item is always first
+            index = bisect.bisect(self._inserted, file)
+            self._inserted.insert(index, file)
+            index = index if self.ascending else len(self._inserted) - 1 - index
+            self.insert_file(file_string, index + 1, entry)
+        if scanner.done:
+            self.refresh_button.configure(text="Refresh")
+            self.scanner = None
+            return
+        self.refresh_button.configure(text="Refresh ({}/{})".format(scanner.scanned, len(scanner.files)))
+        self.after(self.SCAN_INTERVAL, self._poll_scanner, scanner)
 
-    def insert_file(self, file_string):
+    def insert_file(self, file_string, index=tk.END, entry=None):
         """
         Insert a file into the Treeview list of files and links it to
         an entry in self.file_string_dict
         :param file_string: string representing the file in the list
+        :param index: position of the file in the Treeview
+        :param entry: GSFIndex entry of the file. The matches and
+            spawns are inserted when the file is opened in the Treeview.
         """
         if file_string in self.file_string_dict:
             file_name = self.file_string_dict[file_string]
-        elif file_string.endswith(".txt"):
+        elif is_supported(file_string):
             file_name = file_string
         else:
             raise ValueError("Unsupported file_string received: {0}".format(file_string))
-        self.file_tree.insert("", tk.END, iid=file_name, text=file_string)
-        file_cube, match_timings, spawn_timings = Parser.split_combatlog_file(file_name)
-        if len(match_timings) / 2 != len(file_cube):
-            print("[FileFrame] Uneven results for file {}".format(file_name))
+        self.file_tree.insert("", index, iid=file_name, text=file_string)
+        if entry is not None and entry["matches"] == 0:
+            return
+        # Placeholder so that the file can be opened to insert the matches
+        self.file_tree.insert(file_name, tk.END, text="Loading...", tags=("placeholder",))
+
+    def open_file(self, *args):
+        """
+        Callback for the Treeview widget that inserts the matches and
+        spawns of a file when it is opened for the first time
+        :param args: Tkinter event
+        """
+        file_name = self.file_tree.focus()
+        if self.file_tree.parent(file_name) != "":
+            return
+        children = self.file_tree.get_children(file_name)
+        if len(children) == 0 or not self.file_tree.tag_has("placeholder", children[0]):
             return
+        self.file_tree.delete(*children)
+        self.insert_matches(file_name)
+
+    def insert_matches(self, file_name):
+        """Insert the matches and spawns of a file from its LogIndex"""
+        index = LogIndex.open(file_name)
+        match_timings, spawn_timings = index.match_timings, index.spawn_timings
         for match_index, match in enumerate(match_timings[::2]):
             self.file_tree.insert(file_name, tk.END, iid=(file_name, match_index), text=match.strftime("%H:%M"))
             for spawn_index, spawn in enumerate(spawn_timings[match_index]):
@@ -234,6 +271,8 @@ class FileFrame(ttk.Frame):
             selection = self.file_tree.selection()[0]
         except IndexError:
             return
+        if self.file_tree.tag_has("placeholder", selection):
+            return
         elements = selection.split(" ")
         if selection == "all":
             # Whole folder
@@ -259,9 +298,6 @@ class FileFrame(ttk.Frame):
         self.clear_data_widgets()
         self.main_window.middle_frame.statistics_numbers_var.set("")
         self.main_window.ship_frame.ship_label_var.set("No match or spawn selected yet.")
-        lines = Parser.read_file(file_name)
-        player_list = Parser.get_player_id_list(lines)
-        file_cube, _, _ = Parser.split_combatlog(lines, player_list)
         results = filestats.file_statistics(file_name)
         self.update_widgets(*results)
 
@@ -272,7 +308,15 @@ class FileFrame(ttk.Frame):
         calling the self.update_widgets function accordingly.
         """
         self.clear_data_widgets()
-        results = folderstats.folder_statistics()
+        files = list(Parser.gsf_combatlogs())
+        engine = FolderEngine(files)
+        splash = SplashScreen(self.main_window, len(files), title="Parsing files", cancel=engine.cancel)
+        try:
+            results = folderstats.folder_statistics(engine, splash.update_max)
+        finally:
+            splash.destroy()
+        if results is None:
+            return
         self.update_widgets(*results)
 
     def parse_match(self, elements: list):
@@ -287,14 +331,12 @@ class FileFrame(ttk.Frame):
         self.main_window.middle_frame.statistics_numbers_var.set("")
         self.main_window.ship_frame.ship_label_var.set("No match or spawn selected yet.")
         file_name, match_index = elements[0], int(elements[1])
-        lines = Parser.read_file(file_name)
-        player_list = Parser.get_player_id_list(lines)
-        file_cube, match_timings, _ = Parser.split_combatlog(lines, player_list)
-        player_name = Parser.get_player_name(lines)
+        analyzer = FileAnalyzer.open(file_name)
+        file_cube, match_timings, player_name = analyzer.file_cube, analyzer.match_timings, analyzer.player_name
         match = file_cube[match_index]
         results = matchstats.match_statistics(file_name, match, match_timings[::2][match_index])
         self.update_widgets(*results)
-        match_list = Parser.build_spawn_from_match(match)
+        match_list = Parser.build_spawn_from_match(analyzer.get_match(match_index))
         self.main_window.middle_frame.time_view.insert_spawn(match_list, player_name)
 
     def parse_spawn(self, elements):
@@ -307,18 +349,18 @@ class FileFrame(ttk.Frame):
         self.main_window.middle_frame.statistics_numbers_var.set("")
         self.main_window.ship_frame.ship_label_var.set("No match or spawn selected yet.")
         file_name, match_index, spawn_index = elements[0], int(elements[1]), int(elements[2])
-        lines = Parser.read_file(file_name)
-        player_list = Parser.get_player_id_list(lines)
-        player_name = Parser.get_player_name(lines)
-        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player_list)
+        analyzer = FileAnalyzer.open(file_name)
+        player_name = analyzer.player_name
+        file_cube, match_timings, spawn_timings = analyzer.file_cube, analyzer.match_timings, analyzer.spawn_timings
         match = file_cube[match_index]
         spawn = match[spawn_index]
         results = list(spawnstats.spawn_statistics(
             file_name, spawn, spawn_timings[match_index][spawn_index]))
-        results[1] = Parser.parse_player_reaction_time(spawn, player_name)
-        orig = len(results[1])
+        # The reaction time and screen events are added to a copy of the spawn
+        events = Parser.parse_player_reaction_time(analyzer.get_spawn(match_index, spawn_index), player_name)
+        orig = len(events)
         results[1] = ScreenParser.build_spawn_events(
-            file_name, match_timings[::2][match_index], spawn_timings[match_index][spawn_index], spawn, player_name)
+            file_name, match_timings[::2][match_index], spawn_timings[match_index][spawn_index], events, player_name)
         print("[FileFrame] ScreenParser built {} events. Total: {}".format(len(results[1]) - orig, len(results[1])))
         self.update_widgets_spawn(*results)
         arguments = (file_name, match_timings[::2][match_index], spawn_timings[match_index][spawn_index])
@@ -363,9 +405,7 @@ class FileFrame(ttk.Frame):
         if len(elements) is not 3:
             tkinter.messagebox.showinfo("Requirement", "Please select a spawn to view the events of.")
             return
-        lines = Parser.read_file(elements[0])
-        player_list = Parser.get_player_id_list(lines)
-        file_cube, match_timings, spawn_timings = Parser.split_combatlog(lines, player_list)
+        index = LogIndex.open(elements[0])
         match_index, spawn_index = int(elements[1]), int(elements[2])
-        return (file_cube[match_index][spawn_index], player_list, spawn_timings[match_index][spawn_index],
-                match_timings[match_index])
+        return (index.read_spawn(match_index, spawn_index), index.player_list,
+                index.spawn_timings[match_index][spawn_index], index.match_timings[match_index])
@@ -16,6 +16,8 @@ from tkinter import ttk
 from PIL import Image
 from PIL.ImageTk import PhotoImage
 # Project Modules
+from parsing.effectsresolver import EffectsResolver
+from parsing.event import Event
 from parsing.parser import Parser
 from data.icons import ICONS
 from data.effects import all_effects
@@ -190,14 +192,10 @@ class TimeView(ttk.Treeview):
         self.delete_all()
         if len(spawn) == 0:
             raise ValueError("Invalid spawn passed.")
-        spawn = spawn if isinstance(spawn[0], dict) else [Parser.line_to_dictionary(line) for line in spawn]
+        spawn = spawn if isinstance(spawn[0], (dict, Event)) else [Parser.line_to_dictionary(line) for line in spawn]
         start_time = spawn[0]["time"]
         active_ids = Parser.get_player_id_list(spawn) if active_ids is None else active_ids
-        for line in spawn:
-            if "custom" not in line or line["custom"] is False:
-                line_event_dict = Parser.line_to_event_dictionary(line, active_ids, spawn)
-            else:
-                line_event_dict = line
+        for line_event_dict in EffectsResolver.resolve(spawn, active_ids):
             self.insert_event(line_event_dict, player_name, active_ids, start_time)
 
     @staticmethod